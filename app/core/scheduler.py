@@ -5,6 +5,7 @@ from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
 import pytz
 from app.dev_pipeline import run_pipeline
+from app.scraper import browser_service
 from app.utils.logger import logger
 from app.utils.config_loader import SETTINGS
 
@@ -15,6 +16,9 @@ class PipelineScheduler:
         
     def start(self):
         """Start the scheduler with configured jobs"""
+        # Keep a warm browser between runs when BROWSER_SERVICE_ADDR is configured
+        browser_service.ensure_running()
+
         # Daily full scan at 1 AM ET
         self.scheduler.add_job(
             run_pipeline,
@@ -81,6 +85,7 @@ class PipelineScheduler:
 scheduler = PipelineScheduler()
 
 def start_scheduler(every_hours: int = 6):
+    browser_service.ensure_running()
     sched = BackgroundScheduler()
     sched.add_job(
         lambda: _safe_run(),
@@ -7,6 +7,8 @@ from app.integrations.google_sheets_uploader import upload_dataframe
 from app.integrations.map_generator import create_map
 from app.integrations.alerts import send_alert
 from app.integrations.roi_calculator import enrich_with_roi
+from app.scraper import browser_pool, fetch_archive
+from app.scraper.run_report import REPORT
 from app.utils.helpers import safe_write_csv
 from app.utils.config_loader import SETTINGS
 from app.utils.logger import logger
@@ -15,13 +17,30 @@ from app.utils.logger import logger
 # File paths
 CLASSIFIED_CSV = "./data/classified_listings.csv"
 DEV_LEADS_CSV = "./data/development_leads.csv"
+RUN_REPORT_JSON = "./data/logs/run_report.json"
 
 
-def run_pipeline(mode="full"):
+def run_pipeline(mode="full", fetch_mode=None, archive_path=None):
     """
     Run the property pipeline
     :param mode: 'full' for complete run, 'price_update' for price-only check
+    :param fetch_mode: 'live', 'record' or 'replay' (defaults to FETCH_MODE)
+    :param archive_path: record/replay archive file (defaults to FETCH_ARCHIVE)
     """
+    fetch_mode = fetch_mode or SETTINGS.fetch_mode
+    REPORT.reset()
+    with fetch_archive.session(fetch_mode, archive_path or SETTINGS.fetch_archive):
+        if fetch_mode != "live":
+            logger.info("Fetch mode %s (archive=%s)", fetch_mode, archive_path or SETTINGS.fetch_archive)
+        try:
+            return _run_pipeline(mode)
+        finally:
+            # One Chromium per run: release it once every scraper is done
+            browser_pool.shutdown()
+            REPORT.write(RUN_REPORT_JSON)
+
+
+def _run_pipeline(mode):
     logger.info("Starting property pipeline for %s (mode=%s)", SETTINGS.target_city, mode)
 
     # --- STAGE 1: SCRAPE DATA ---
@@ -1,11 +1,26 @@
 import pandas as pd
 from app.utils.logger import logger
 from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
+from geopy.exc import GeocoderTimedOut, GeocoderRateLimited
+from app.scraper import fetch_archive
+from app.scraper.rate_limiter import limiter
 import time
 
+NOMINATIM_HOST = "nominatim.openstreetmap.org"
+
 def geocode_address(address: str, city: str, state: str) -> tuple:
-    """Geocode a single address using Nominatim."""
+    """Geocode a single address using Nominatim (or the active record/replay archive)."""
+    key = f"{address}|{city}|{state}"
+    if fetch_archive.replaying():
+        rec = fetch_archive.active().get("geocode", key) or {}
+        return rec.get("lat"), rec.get("lon")
+
+    lat, lon = _geocode_nominatim(address, city, state)
+    if fetch_archive.recording():
+        fetch_archive.active().put("geocode", key, {"lat": lat, "lon": lon})
+    return lat, lon
+
+def _geocode_nominatim(address: str, city: str, state: str) -> tuple:
     geolocator = Nominatim(user_agent="dev_pipeline")
     
     # Clean up the address
@@ -24,15 +39,22 @@ def geocode_address(address: str, city: str, state: str) -> tuple:
     
     for addr_format in address_formats:
         for timeout in timeouts:
+            # Paced by the shared per-host budget instead of fixed sleeps
+            limiter.acquire(NOMINATIM_HOST)
+            started = time.monotonic()
             try:
                 print(f"[GIS] Trying: {addr_format}")
                 location = geolocator.geocode(addr_format, timeout=timeout)
+                limiter.record(NOMINATIM_HOST, 200, time.monotonic() - started)
                 if location:
                     return location.latitude, location.longitude
-                time.sleep(2)
+            except GeocoderRateLimited as e:
+                limiter.record(NOMINATIM_HOST, 429, time.monotonic() - started, retry_after=e.retry_after)
+                print(f"[GIS] Rate limited for {addr_format}: {str(e)}")
+                continue
             except Exception as e:
+                limiter.record(NOMINATIM_HOST, 0, time.monotonic() - started)
                 print(f"[GIS] Geocoding error for {addr_format}: {str(e)}")
-                time.sleep(2)
                 continue
     
     print(f"[GIS] Could not geocode after all attempts: {address}, {city}, {state}")
@@ -44,8 +66,10 @@ def geocode_and_enrich(df: pd.DataFrame) -> pd.DataFrame:
         return df.assign(lat=[], lon=[])
 
     out = df.copy()
-    out['lat'] = None
-    out['lon'] = None
+    # Rows built from search cards already carry coordinates; only geocode the rest
+    for col in ('lat', 'lon'):
+        if col not in out.columns:
+            out[col] = None
     
     print("[GIS] Starting geocoding process...")
     for idx, row in out.iterrows():
@@ -58,7 +82,6 @@ def geocode_and_enrich(df: pd.DataFrame) -> pd.DataFrame:
             if lat and lon:
                 out.at[idx, 'lat'] = lat
                 out.at[idx, 'lon'] = lon
-            time.sleep(1)  # Be nice to the geocoding service
     
     # Fill any missing coordinates with Newton center
     out['lat'] = out['lat'].fillna(42.337)
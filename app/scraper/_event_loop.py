@@ -0,0 +1,53 @@
+# app/scraper/_event_loop.py
+"""
+One background asyncio loop shared by the (synchronous) scraper entry points.
+
+The pooled HTTP client lives on this loop so keep-alive connections survive
+across calls from fetch_properties / page_scanner / llm_browser / llm_search.
+"""
+import asyncio
+import atexit
+import threading
+from typing import Awaitable, Callable, List, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+_cleanups: List[Callable[[], Awaitable[None]]] = []
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared loop, starting its daemon thread on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="scraper-loop", daemon=True)
+            _thread.start()
+    return _loop
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None):
+    """Run a coroutine on the shared loop and block until it finishes."""
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_sync() called from the scraper loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+
+def register_cleanup(fn: Callable[[], Awaitable[None]]) -> None:
+    """Register an async callback that runs on the loop at interpreter exit."""
+    if fn not in _cleanups:
+        _cleanups.append(fn)
+
+
+@atexit.register
+def _shutdown() -> None:
+    if _loop is None or _loop.is_closed():
+        return
+    for fn in reversed(_cleanups):
+        try:
+            asyncio.run_coroutine_threadsafe(fn(), _loop).result(10)
+        except Exception:
+            pass
+    _loop.call_soon_threadsafe(_loop.stop)
@@ -1,65 +1,60 @@
 # app/scraper/browser_fetch.py
-from contextlib import contextmanager
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+import asyncio
 import time
 import json
 import re
 
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout, Response
+from playwright.async_api import TimeoutError as PWTimeout
 
+from app.scraper import browser_service, fetch_archive
+from app.scraper._event_loop import run_sync
+from app.scraper.browser_pool import get_pool
+from app.scraper.card_extractor import cards_from_payloads, result_pages
+from app.scraper.payload_capture import PayloadCapture, snapshot_writer
+from app.scraper.rate_limiter import host_of, limiter
 from app.scraper.url_filters import REDFIN_NEWTON, REALTOR_NEWTON, ZILLOW_NEWTON
+from app.utils.logger import logger
 
-DEFAULT_UA = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/123.0.0.0 Safari/537.36"
-)
+# Results pages harvested concurrently (each on its own pooled page)
+MAX_PARALLEL_PAGES = 3
+# Scroll-until-saturation: stop after this many scrolls with no new detail URLs,
+# or when the per-page time budget runs out.
+MAX_IDLE_SCROLLS = 3
+HARVEST_TIME_BUDGET_S = 60.0
+SCROLL_SETTLE_MS = 600
+
+# (detail URLs, detail URL -> row built from the search payload card)
+Harvest = Tuple[List[str], Dict[str, dict]]
+# Harvest of one results page plus its pagination: {"last_page": int|None, "next_url": str|None}
+PageHarvest = Tuple[List[str], Dict[str, dict], dict]
+
+# Links to the next results page, when the site renders one
+NEXT_PAGE_SELECTORS = [
+    'a[rel="next"]',
+    'link[rel="next"]',
+    'a[aria-label="Next page"]',
+    'a[title="Next page"]',
+    'a[data-testid="pagination-next-link"]',
+]
 
 SNAP_HTML_DIR = Path("data/logs/browser_html")
 SNAP_JSON_DIR = Path("data/logs/network_json")
 SNAP_HTML_DIR.mkdir(parents=True, exist_ok=True)
 SNAP_JSON_DIR.mkdir(parents=True, exist_ok=True)
 
-@contextmanager
-def _playwright_context(headless: bool = False):
-    pw = None
-    try:
-        pw = sync_playwright().start()
-        browser = pw.chromium.launch(
-            headless=headless,
-            args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-features=IsolateOrigins,site-per-process",
-                "--disable-web-security",
-            ],
-        )
-        context = browser.new_context(
-            user_agent=DEFAULT_UA,
-            java_script_enabled=True,
-            viewport={"width": 1440, "height": 900},
-            locale="en-US",
-        )
-        # light stealth
-        context.add_init_script("""Object.defineProperty(navigator,'webdriver',{get:()=>undefined});""")
-        yield context
-        context.close()
-        browser.close()
-    finally:
-        if pw:
-            pw.stop()
-
-def _try_click(page, selectors: List[str], timeout_ms: int = 1500) -> bool:
+async def _try_click(page, selectors: List[str], timeout_ms: int = 1500) -> bool:
     for sel in selectors:
         try:
-            page.locator(sel).first.click(timeout=timeout_ms)
-            page.wait_for_timeout(300)
+            await page.locator(sel).first.click(timeout=timeout_ms)
+            await page.wait_for_timeout(300)
             return True
         except Exception:
             pass
     return False
 
-def _accept_cookies(page, site: str):
+async def _accept_cookies(page, site: str):
     common = [
         'button:has-text("Accept")',
         'button:has-text("Accept All Cookies")',
@@ -80,9 +75,9 @@ def _accept_cookies(page, site: str):
         'button:has-text("Accept all")',
         'button:has-text("Accept Cookies")',
     ]
-    _try_click(page, common, 2500)
-    if site == "realtor": _try_click(page, extras_realtor, 2500)
-    if site == "zillow":  _try_click(page, extras_zillow, 2500)
+    await _try_click(page, common, 2500)
+    if site == "realtor": await _try_click(page, extras_realtor, 2500)
+    if site == "zillow":  await _try_click(page, extras_zillow, 2500)
 
 def _base_for(site: str) -> str:
     return {
@@ -121,30 +116,27 @@ def _validator_for(site: str):
         "zillow":  ZILLOW_NEWTON,
     }[site]
 
-def _wait_for_any_listing_selector(page, site: str, timeout_ms: int) -> bool:
+async def _wait_for_any_listing_selector(page, site: str, timeout_ms: int) -> bool:
     sels = _selectors_for(site)
     try:
-        for sel in sels:
-            page.locator(sel).first.wait_for(timeout=timeout_ms)
-            return True
+        await page.locator(", ".join(sels)).first.wait_for(timeout=timeout_ms)
+        return True
     except PWTimeout:
         return False
-    return False
 
-def _extract_urls_from_dom(page, site: str, base: str, pat) -> list[str]:
+async def _extract_urls_from_dom(page, site: str, base: str, pat) -> list[str]:
     """Fallback DOM extraction via anchors."""
-    sels = _selectors_for(site)
+    sels = ", ".join(_selectors_for(site))
     seen = set()
-    for sel in sels:
-        for a in page.locator(sel).all():
-            href = (a.get_attribute("href") or "").strip()
-            if not href:
-                continue
-            if href.startswith("//"): href = "https:" + href
-            if href.startswith("/"):  href = base + href
-            if not pat.match(href):
-                continue
-            seen.add(href)
+    for href in await page.locator(sels).evaluate_all("els => els.map(a => a.getAttribute('href'))"):
+        href = (href or "").strip()
+        if not href:
+            continue
+        if href.startswith("//"): href = "https:" + href
+        if href.startswith("/"):  href = base + href
+        if not pat.match(href):
+            continue
+        seen.add(href)
     return list(seen)
 
 def _extract_urls_from_network_payloads(site: str, texts: List[str], pat) -> list[str]:
@@ -185,82 +177,219 @@ def _extract_urls_from_network_payloads(site: str, texts: List[str], pat) -> lis
 def harvest_listing_links_playwright(
     url: str,
     site: str,
-    scroll_passes: int = 12,
+    max_idle_scrolls: int = MAX_IDLE_SCROLLS,
+    time_budget_s: float = HARVEST_TIME_BUDGET_S,
     wait_ms: int = 3000,
     headless: bool = False,
     snapshot_name: Optional[str] = None,
 ) -> List[str]:
     """
-    Navigate to results page, accept cookies, scroll, capture XHR/GraphQL JSON,
-    extract Newton detail URLs from network payloads; fallback to DOM anchors.
+    Navigate to results page, accept cookies, scroll until no new detail URLs
+    show up (in captured XHR/GraphQL JSON or DOM anchors) for `max_idle_scrolls`
+    scrolls or the time budget runs out. Prefer network payload URLs; fallback to DOM anchors.
     """
+    if fetch_archive.replaying():
+        return _replay_harvest(url, site)[0]
+    return run_sync(_harvest_async(url, site, max_idle_scrolls, time_budget_s, wait_ms, headless, snapshot_name))[0]
+
+
+def _replay_harvest(url: str, site: str) -> PageHarvest:
+    """Re-run extraction over the recorded payloads, no browser at all."""
+    rec = fetch_archive.active().get("harvest", f"{site}|{url}") or {"payloads": [], "dom_urls": []}
+    pat = _validator_for(site)
+    cards = cards_from_payloads(site, rec["payloads"])
+    urls = set(_extract_urls_from_network_payloads(site, rec["payloads"], pat)) | {u for u in cards if pat.match(u)}
+    pagination = {"last_page": result_pages(site, rec["payloads"]), "next_url": rec.get("next_url")}
+    return list(urls or rec["dom_urls"]), cards, pagination
+
+
+async def _next_page_url(page, base: str) -> Optional[str]:
+    hrefs = await page.locator(", ".join(NEXT_PAGE_SELECTORS)).evaluate_all(
+        "els => els.map(a => a.getAttribute('href'))")
+    href = next((h.strip() for h in hrefs if h and h.strip()), None)
+    if href and href.startswith("/"):
+        href = base + href
+    return href if href and href.startswith("http") else None
+
+
+async def _harvest_async(
+    url: str,
+    site: str,
+    max_idle_scrolls: int,
+    time_budget_s: float,
+    wait_ms: int,
+    headless: bool,
+    snapshot_name: Optional[str],
+) -> PageHarvest:
     base = _base_for(site)
     pat  = _validator_for(site)
+    deadline = time.monotonic() + time_budget_s
 
-    # Capture JSON responses
-    captured_texts: List[str] = []
+    # Capture search/GraphQL JSON responses (bodies read off the callback path)
+    capture = PayloadCapture(site, snapshot_dir=SNAP_JSON_DIR)
+    payload_urls: set = set()
+    parsed = 0
 
-    with _playwright_context(headless=headless) as ctx:
-        page = ctx.new_page()
-        page.set_default_timeout(45000)
+    def _new_payload_urls() -> None:
+        nonlocal parsed
+        fresh = capture.texts[parsed:]
+        parsed += len(fresh)
+        payload_urls.update(_extract_urls_from_network_payloads(site, fresh, pat))
 
-        def _on_response(resp: Response):
+    pool = await get_pool(headless=headless)
+    async with pool.page(site) as page:
+        page.on("response", capture.on_response)
+        try:
+            # Go + wait until the first listing card renders (at most wait_ms); the response feeds the host limiter
+            started = time.monotonic()
             try:
-                url_l = resp.url.lower()
-                ct = (resp.headers or {}).get("content-type", "")
-                # Be permissive: many endpoints use text/plain or text/html even for JSON payloads.
-                if any(k in url_l for k in [
-                    "graphql", "search", "list-results", "searchresults", "apollo",
-                    "getsearchpagestate", "searchResults", "api", "listings"
-                ]) or "json" in ct or "javascript" in ct or "plain" in ct:
-                    try:
-                        txt = resp.text()
-                    except Exception:
-                        txt = ""
-                    if txt and len(txt) > 400:  # lower threshold slightly
-                        captured_texts.append(txt)
-
-                        # Write a small sample
-                        filename = SNAP_JSON_DIR / f"{site}_{int(time.time()*1000)}.json"
-                        try:
-                            filename.write_text(txt[:200000], encoding="utf-8", errors="ignore")
-                        except Exception:
-                            pass
+                resp = await page.goto(url, wait_until="domcontentloaded")
             except Exception:
-                pass
+                limiter.record(host_of(url), 0, time.monotonic() - started)
+                raise
+            limiter.record(host_of(url), resp.status if resp else 200, time.monotonic() - started)
+            await _wait_for_any_listing_selector(page, site, wait_ms)
+
+            await _accept_cookies(page, site)
+
+            # Scroll until saturation: stop after K scrolls that surface nothing new
+            _new_payload_urls()
+            seen = payload_urls | set(await _extract_urls_from_dom(page, site, base, pat))
+            idle = scrolls = 0
+            while idle < max_idle_scrolls and time.monotonic() < deadline:
+                await page.mouse.wheel(0, 2200)
+                await page.wait_for_timeout(SCROLL_SETTLE_MS)
+                scrolls += 1
+                _new_payload_urls()
+                now = payload_urls | set(await _extract_urls_from_dom(page, site, base, pat))
+                idle = 0 if now - seen else idle + 1
+                seen |= now
+            logger.debug("[%s] %d scrolls, %d urls (%s)", site, scrolls, len(seen),
+                         "saturated" if idle >= max_idle_scrolls else "time budget")
+
+            # Optional snapshot of final DOM
+            if snapshot_name:
+                snapshot_writer().submit(SNAP_HTML_DIR.joinpath(snapshot_name), await page.content())
 
-        page.on("response", _on_response)
+            captured_texts = await capture.drain()
+            _new_payload_urls()
+            next_url = await _next_page_url(page, base)
 
-        # Go + wait a bit
-        page.goto(url, wait_until="domcontentloaded")
-        page.wait_for_timeout(wait_ms)
+            # 1) Prefer network JSON extraction (cards carry detail URLs too)
+            cards = cards_from_payloads(site, captured_texts)
+            urls = payload_urls | {u for u in cards if pat.match(u)}
 
-        _accept_cookies(page, site)
+            # 2) Fallback to DOM anchors if needed
+            dom_urls = []
+            if not urls:
+                dom_urls = await _extract_urls_from_dom(page, site, base, pat)
+                urls = set(dom_urls)
+        finally:
+            page.remove_listener("response", capture.on_response)
 
-        # Scroll to trigger XHRs
-        for _ in range(scroll_passes):
-            page.mouse.wheel(0, 2200)
-            page.wait_for_timeout(600)
+    if fetch_archive.recording():
+        fetch_archive.active().put("harvest", f"{site}|{url}",
+                                   {"payloads": captured_texts, "dom_urls": dom_urls, "next_url": next_url})
 
-        # Optional snapshot of final DOM
-        if snapshot_name:
-            SNAP_HTML_DIR.joinpath(snapshot_name).write_text(page.content(), encoding="utf-8", errors="ignore")
+    return list(urls), cards, {"last_page": result_pages(site, captured_texts), "next_url": next_url}
+
+
+def _merge_harvests(results: List[Harvest]) -> Harvest:
+    links, cards = set(), {}
+    for urls, page_cards in results:
+        links.update(urls)
+        for u, row in page_cards.items():
+            cards.setdefault(u, row)
+    return list(links), cards
+
+
+async def _harvest_many_async(urls: List[str], site: str, max_parallel: int, **kw) -> Harvest:
+    gate = asyncio.Semaphore(max_parallel)
+
+    async def _one(i: int, u: str) -> Harvest:
+        async with gate:
+            await limiter.acquire_async(host_of(u))
+            try:
+                urls, cards, _ = await _harvest_async(
+                    u, site,
+                    max_idle_scrolls=kw.get("max_idle_scrolls", MAX_IDLE_SCROLLS),
+                    time_budget_s=kw.get("time_budget_s", HARVEST_TIME_BUDGET_S),
+                    wait_ms=kw.get("wait_ms", 3000),
+                    headless=kw.get("headless", False),
+                    snapshot_name=f"{site}_page_{i}.html",
+                )
+                return urls, cards
+            except Exception as e:
+                print(f"[{site}] harvest failed {u}: {e}")
+                return [], {}
 
-        # 1) Prefer network JSON extraction
-        urls = set(_extract_urls_from_network_payloads(site, captured_texts, pat))
+    results = await asyncio.gather(*(_one(i, u) for i, u in enumerate(urls, 1)))
+    return _merge_harvests(results)
 
-        # 2) Fallback to DOM anchors if needed
-        if not urls:
-            urls = set(_extract_urls_from_dom(page, site, base, pat))
 
-        return list(urls)
+def harvest_listings(urls: List[str], site: str, max_parallel: int = MAX_PARALLEL_PAGES, **kw) -> Harvest:
+    """
+    Harvest several results pages in parallel on one shared Chromium.
+    Returns the detail URLs plus the listing rows built from the search payload cards.
+    """
+    if fetch_archive.replaying():
+        return _merge_harvests([_replay_harvest(u, site)[:2] for u in urls])
+
+    # Prefer the resident browser service when configured (recording needs the local browser)
+    if browser_service.enabled() and not fetch_archive.recording():
+        try:
+            job = {"op": "harvest", "urls": list(urls), "site": site, "kw": dict(kw, max_parallel=max_parallel)}
+            links, cards = browser_service.submit(job)
+            return links, cards
+        except Exception as e:
+            logger.warning("[browser-service] harvest fell back to a local browser: %s", e)
+
+    return run_sync(_harvest_many_async(urls, site, max_parallel, **kw))
+
+
+def harvest_page(
+    url: str,
+    site: str,
+    max_idle_scrolls: int = MAX_IDLE_SCROLLS,
+    time_budget_s: float = HARVEST_TIME_BUDGET_S,
+    wait_ms: int = 3000,
+    headless: bool = False,
+) -> PageHarvest:
+    """
+    Harvest one results page (see harvest_listings) and report its pagination:
+    the page count from the search payload and the rendered next-page link.
+    """
+    if fetch_archive.replaying():
+        return _replay_harvest(url, site)
+
+    if browser_service.enabled() and not fetch_archive.recording():
+        try:
+            job = {"op": "harvest_page", "url": url, "site": site,
+                   "kw": {"max_idle_scrolls": max_idle_scrolls, "time_budget_s": time_budget_s,
+                          "wait_ms": wait_ms, "headless": headless}}
+            return tuple(browser_service.submit(job))
+        except Exception as e:
+            logger.warning("[browser-service] page harvest fell back to a local browser: %s", e)
+
+    return run_sync(aharvest_page(url, site, max_idle_scrolls, time_budget_s, wait_ms, headless))
+
+
+async def aharvest_page(
+    url: str,
+    site: str,
+    max_idle_scrolls: int = MAX_IDLE_SCROLLS,
+    time_budget_s: float = HARVEST_TIME_BUDGET_S,
+    wait_ms: int = 3000,
+    headless: bool = False,
+) -> PageHarvest:
+    """harvest_page on the caller's loop, without the browser service: paced by the host limiter, replayable."""
+    if fetch_archive.replaying():
+        return _replay_harvest(url, site)
+    await limiter.acquire_async(host_of(url))
+    return await _harvest_async(url, site, max_idle_scrolls, time_budget_s, wait_ms, headless,
+                                snapshot_name=f"{site}_{re.sub(r'[^A-Za-z0-9]+', '_', url)[-60:]}.html")
+
 
-def harvest_many(urls: List[str], site: str, **kw) -> List[str]:
-    all_seen = set()
-    for i, u in enumerate(urls, 1):
-        snap = f"{site}_page_{i}.html"
-        links = harvest_listing_links_playwright(u, site=site, snapshot_name=snap, **kw)
-        for h in links:
-            all_seen.add(h)
-        time.sleep(0.8)
-    return list(all_seen)
+def harvest_many(urls: List[str], site: str, max_parallel: int = MAX_PARALLEL_PAGES, **kw) -> List[str]:
+    """Detail URLs only (see harvest_listings)."""
+    return harvest_listings(urls, site, max_parallel, **kw)[0]
@@ -0,0 +1,182 @@
+# app/scraper/browser_pool.py
+"""
+Reusable Playwright browser pool.
+
+Chromium is launched once per run on the shared scraper loop. Each site gets
+its own context (so cookies/consent state carry over between results pages)
+with that site's resource-blocking route policy installed. Pages are handed
+out from a small per-site pool and recycled after a number of main-frame
+navigations to keep renderer memory in check.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from app.scraper import resource_policy
+from app.scraper._event_loop import register_cleanup, run_sync
+from app.utils.logger import logger
+
+DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-web-security",
+]
+
+MAX_PAGES_PER_SITE = 3
+# Per-site caps on concurrently open tabs (fall back to MAX_PAGES_PER_SITE)
+SITE_MAX_PAGES: Dict[str, int] = {"zillow": 4}
+RECYCLE_PAGE_AFTER = 20   # main-frame navigations per page before it is closed and replaced
+DEFAULT_TIMEOUT_MS = 45000
+
+_BASE_CONTEXT = dict(
+    user_agent=DEFAULT_UA,
+    java_script_enabled=True,
+    viewport={"width": 1440, "height": 900},
+    locale="en-US",
+)
+
+SITE_CONTEXT_OPTIONS: Dict[str, Dict] = {
+    "redfin": _BASE_CONTEXT,
+    "realtor": _BASE_CONTEXT,
+    "zillow": dict(
+        _BASE_CONTEXT,
+        viewport={"width": 1920, "height": 1080},
+        ignore_https_errors=True,
+        timezone_id="America/New_York",
+        geolocation={"latitude": 42.3371, "longitude": -71.2092},  # Newton, MA coordinates
+        permissions=["geolocation"],
+        color_scheme="light",
+        device_scale_factor=1,
+    ),
+}
+
+# light stealth
+STEALTH_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    window.chrome = window.chrome || {runtime: {}};
+"""
+
+
+class _PooledPage:
+    __slots__ = ("page", "navigations")
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.navigations = 0
+        # Counted per navigation, not per checkout: one checkout may walk many results pages
+        page.on("framenavigated", self._navigated)
+
+    def _navigated(self, frame) -> None:
+        if frame.parent_frame is None:
+            self.navigations += 1
+
+
+class BrowserPool:
+    def __init__(self, headless: bool = False, max_pages_per_site: int = MAX_PAGES_PER_SITE,
+                 recycle_after: int = RECYCLE_PAGE_AFTER):
+        self.headless = headless
+        self.max_pages_per_site = max_pages_per_site
+        self.recycle_after = recycle_after
+        self._pw: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._contexts: Dict[str, BrowserContext] = {}
+        self._idle: Dict[str, List[_PooledPage]] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> "BrowserPool":
+        if self._browser is None:
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            logger.info("[browser] chromium started (headless=%s)", self.headless)
+        return self
+
+    async def context(self, site: str) -> BrowserContext:
+        """One long-lived context per site."""
+        async with self._lock:
+            ctx = self._contexts.get(site)
+            if ctx is None:
+                await self.start()
+                ctx = await self._browser.new_context(**SITE_CONTEXT_OPTIONS.get(site, _BASE_CONTEXT))
+                await ctx.add_init_script(STEALTH_JS)
+                await resource_policy.install(ctx, site)
+                self._contexts[site] = ctx
+            return ctx
+
+    def _slot(self, site: str) -> asyncio.Semaphore:
+        if site not in self._slots:
+            self._slots[site] = asyncio.Semaphore(SITE_MAX_PAGES.get(site, self.max_pages_per_site))
+        return self._slots[site]
+
+    @asynccontextmanager
+    async def page(self, site: str):
+        """Check out a page for `site`; at most the site's page cap are out at once."""
+        async with self._slot(site):
+            idle = self._idle.setdefault(site, [])
+            pooled = idle.pop() if idle else None
+            if pooled is None or pooled.page.is_closed():
+                ctx = await self.context(site)
+                pooled = _PooledPage(await ctx.new_page())
+                pooled.page.set_default_timeout(DEFAULT_TIMEOUT_MS)
+            try:
+                yield pooled.page
+            finally:
+                if pooled.navigations >= self.recycle_after or pooled.page.is_closed():
+                    try:
+                        await pooled.page.close()
+                    except Exception:
+                        pass
+                else:
+                    idle.append(pooled)
+
+    async def close(self) -> None:
+        resource_policy.log_summary()
+        for ctx in list(self._contexts.values()):
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        self._contexts.clear()
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+
+_pool: Optional[BrowserPool] = None
+
+
+async def get_pool(headless: bool = False) -> BrowserPool:
+    """Shared pool for this run; the first caller decides headless mode."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool(headless=headless)
+        register_cleanup(close_pool)
+    elif _pool.headless != headless:
+        logger.debug("[browser] pool already running headless=%s; reusing it", _pool.headless)
+    return await _pool.start()
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def shutdown() -> None:
+    """Close Chromium at the end of a run (no-op if no browser was started)."""
+    if _pool is not None:
+        run_sync(close_pool())
@@ -0,0 +1,147 @@
+# app/scraper/browser_service.py
+"""
+Optional resident browser service.
+
+Run `python -m app.scraper.browser_service` (or let the scheduler start it) to
+keep one warm Chromium with its per-site contexts alive between scheduled
+pipeline runs. When BROWSER_SERVICE_ADDR is set, browser_fetch.harvest_many,
+browser_fetch.harvest_page and zillow_scraper.fetch_zillow submit their work
+here over a local authenticated socket instead of launching a browser in the
+pipeline process.
+
+The socket unpickles every job it receives, so BROWSER_SERVICE_AUTHKEY is
+required: without it the service refuses to start and clients treat it as
+unavailable.
+"""
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+JOB_TIMEOUT = 900  # seconds a client waits for one job
+STARTUP_WAIT = 20
+
+_serving = False  # True inside the service process, so it never forwards to itself
+
+
+def _address() -> Optional[Tuple[str, int]]:
+    addr = (SETTINGS.browser_service_addr or "").strip()
+    if not addr or _serving:
+        return None
+    host, _, port = addr.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def _authkey() -> Optional[bytes]:
+    key = (SETTINGS.browser_service_authkey or "").strip()
+    return key.encode("utf-8") if key else None
+
+
+def enabled() -> bool:
+    return _address() is not None and _authkey() is not None
+
+
+def submit(job: Dict[str, Any], timeout: float = JOB_TIMEOUT) -> Any:
+    """Send one job to the service and wait for its result; raises if unreachable or the job failed."""
+    if not enabled():
+        raise RuntimeError("browser service is not configured (BROWSER_SERVICE_ADDR and BROWSER_SERVICE_AUTHKEY)")
+    with Client(_address(), authkey=_authkey()) as conn:
+        conn.send(job)
+        if not conn.poll(timeout):
+            raise TimeoutError(f"browser service did not answer {job.get('op')} within {timeout}s")
+        ok, payload = conn.recv()
+    if not ok:
+        raise RuntimeError(f"browser service job {job.get('op')} failed: {payload}")
+    return payload
+
+
+def available() -> bool:
+    if not enabled():
+        return False
+    try:
+        return submit({"op": "ping"}, timeout=5) == "pong"
+    except Exception:
+        return False
+
+
+def ensure_running() -> bool:
+    """Start the service in the background if it is configured but not answering."""
+    if not enabled():
+        if SETTINGS.browser_service_addr:
+            logger.warning("[browser-service] BROWSER_SERVICE_AUTHKEY is not set; runs will launch their own browser")
+        return False
+    if available():
+        return True
+    logger.info("[browser-service] starting resident browser at %s", SETTINGS.browser_service_addr)
+    subprocess.Popen([sys.executable, "-m", "app.scraper.browser_service"],
+                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + STARTUP_WAIT
+    while time.monotonic() < deadline:
+        if available():
+            return True
+        time.sleep(0.5)
+    logger.warning("[browser-service] did not come up; runs will launch their own browser")
+    return False
+
+
+# ---------------- server side ----------------
+
+def _run_job(job: Dict[str, Any]) -> Any:
+    op = job.get("op")
+    if op == "ping":
+        return "pong"
+    if op == "harvest":
+        from app.scraper.browser_fetch import harvest_listings
+        return harvest_listings(job["urls"], job["site"], **job.get("kw", {}))
+    if op == "harvest_page":
+        from app.scraper.browser_fetch import harvest_page
+        return harvest_page(job["url"], job["site"], **job.get("kw", {}))
+    if op == "zillow":
+        from app.scraper.zillow_scraper import fetch_zillow
+        return fetch_zillow(job["city"]).to_dict("records")
+    raise ValueError(f"unknown job op {op!r}")
+
+
+def _handle(conn) -> None:
+    with conn:
+        try:
+            job = conn.recv()
+            conn.send((True, _run_job(job)))
+        except Exception as e:
+            logger.exception("[browser-service] job failed: %s", e)
+            try:
+                conn.send((False, str(e)))
+            except Exception:
+                pass
+
+
+def serve(address: Optional[Tuple[str, int]] = None) -> None:
+    """Accept jobs until interrupted; the browser pool stays warm between them."""
+    global _serving
+    address = address or _address()
+    if address is None:
+        raise SystemExit("BROWSER_SERVICE_ADDR is not set (e.g. 127.0.0.1:8777)")
+    authkey = _authkey()
+    if authkey is None:
+        raise SystemExit("BROWSER_SERVICE_AUTHKEY is not set; refusing to accept jobs on an unauthenticated socket")
+    _serving = True
+    with Listener(address, authkey=authkey) as listener:
+        logger.info("[browser-service] listening on %s:%s", *address)
+        while True:
+            try:
+                conn = listener.accept()
+            except KeyboardInterrupt:
+                break
+            except Exception as e:
+                logger.warning("[browser-service] rejected connection: %s", e)
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,278 @@
+# app/scraper/card_extractor.py
+"""
+Listing rows straight from captured search-result payloads.
+
+The search/GraphQL JSON behind a results page already carries price, beds,
+baths, lot size, coordinates and status for every card, and usually year
+built, days on market and a remarks snippet (the prioritizer's signals). cards_from_payloads()
+turns those bodies into rows keyed by detail URL, so scrapers only need to
+fetch detail pages for cards that come back incomplete.
+"""
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.utils.logger import logger
+
+REQUIRED_FIELDS = ("address", "price", "beds", "baths", "lot_sqft")
+FINGERPRINT_FIELDS = ("price", "beds", "baths", "lot_sqft")  # plus status
+
+SQFT_PER_ACRE = 43560
+
+_BASES = {
+    "redfin": "https://www.redfin.com",
+    "realtor": "https://www.realtor.com",
+    "zillow": "https://www.zillow.com",
+}
+
+# Search payload pagination metadata: (page-count key, result-count key, page-size key)
+PAGINATION_KEYS = {
+    "zillow": ("totalPages", "totalResultCount", "resultsPerPage"),  # cat1.searchList
+    "realtor": ("total_pages", "total", "count"),                     # data.home_search
+    "redfin": ("numPages", "numHomes", "pageSize"),                   # payload.searchMedian / homes
+}
+
+
+def _loads(body: str) -> Any:
+    body = body.lstrip()
+    if body.startswith("{}&&"):  # Redfin's anti-JSON-hijacking prefix
+        body = body[4:]
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _iter_dicts(obj: Any) -> Iterator[dict]:
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            yield cur
+            stack.extend(cur.values())
+        elif isinstance(cur, list):
+            stack.extend(cur)
+
+
+def _get(obj: Any, *path: str) -> Any:
+    for key in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _value(v: Any) -> Any:
+    """Redfin wraps most scalars as {"value": ...}."""
+    return v.get("value") if isinstance(v, dict) else v
+
+
+def _num(v: Any, cast: Callable = float) -> Optional[float]:
+    v = _value(v)
+    if v is None or isinstance(v, bool):
+        return None
+    if isinstance(v, str):
+        v = v.replace("$", "").replace(",", "").strip()
+    try:
+        return cast(float(v))
+    except (TypeError, ValueError):
+        return None
+
+
+def _days_since(iso: Any) -> Optional[int]:
+    """Whole days since an ISO-8601 date/time (Realtor's list_date)."""
+    if not isinstance(iso, str) or not iso:
+        return None
+    try:
+        then = datetime.fromisoformat(iso.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if then.tzinfo is None:
+        then = then.replace(tzinfo=timezone.utc)
+    return max(0, (datetime.now(timezone.utc) - then).days)
+
+
+def _first(*vals: Any) -> Any:
+    return next((v for v in vals if v is not None), None)
+
+
+def _abs_url(site: str, href: Optional[str]) -> Optional[str]:
+    if not href or not isinstance(href, str):
+        return None
+    if href.startswith("//"):
+        return "https:" + href
+    if href.startswith("/"):
+        return _BASES[site] + href
+    return href if href.startswith("http") else None
+
+
+def _redfin_card(d: dict) -> Optional[dict]:
+    # gis / search: payload.homes[]
+    if "mlsId" not in d and "propertyId" not in d:
+        return None
+    url = _abs_url("redfin", d.get("url"))
+    if not url:
+        return None
+    lat_long = _value(d.get("latLong")) or {}
+    return {
+        "address": _value(d.get("streetLine")),
+        "price": _num(d.get("price"), int),
+        "beds": _num(d.get("beds"), int),
+        "baths": _num(d.get("baths")),
+        "lot_sqft": _num(d.get("lotSize"), int),
+        "lat": _num(lat_long.get("latitude")),
+        "lon": _num(lat_long.get("longitude")),
+        "status": _value(d.get("mlsStatus")),
+        "year_built": _num(d.get("yearBuilt"), int),
+        "days_on_market": _num(d.get("dom"), int),
+        "remarks": _value(d.get("listingRemarks")),
+        "url": url,
+    }
+
+
+def _realtor_card(d: dict) -> Optional[dict]:
+    # frontdoor GraphQL: data.home_search.results[]
+    if "property_id" not in d or "location" not in d:
+        return None
+    url = _abs_url("realtor", d.get("href"))
+    if not url and d.get("permalink"):
+        url = f"{_BASES['realtor']}/realestateandhomes-detail/{d['permalink']}"
+    if not url:
+        return None
+    desc = d.get("description") or {}
+    addr = _get(d, "location", "address") or {}
+    coord = addr.get("coordinate") or {}
+    return {
+        "address": addr.get("line"),
+        "price": _num(d.get("list_price"), int),
+        "beds": _num(desc.get("beds"), int),
+        "baths": _num(_first(desc.get("baths_consolidated"), desc.get("baths"))),
+        "lot_sqft": _num(desc.get("lot_sqft"), int),
+        "lat": _num(coord.get("lat")),
+        "lon": _num(coord.get("lon")),
+        "status": d.get("status"),
+        "year_built": _num(desc.get("year_built"), int),
+        "days_on_market": _days_since(d.get("list_date")),
+        "remarks": desc.get("text"),
+        "url": url,
+    }
+
+
+def _zillow_card(d: dict) -> Optional[dict]:
+    # searchResults.listResults[] / mapResults[]
+    if "zpid" not in d or "detailUrl" not in d:
+        return None
+    url = _abs_url("zillow", d.get("detailUrl"))
+    if not url:
+        return None
+    info = _get(d, "hdpData", "homeInfo") or {}
+    lot = _num(info.get("lotAreaValue"))
+    if lot is not None and str(info.get("lotAreaUnit", "")).lower().startswith("acre"):
+        lot *= SQFT_PER_ACRE
+    lat_long = d.get("latLong") or {}
+    return {
+        "address": d.get("addressStreet") or info.get("streetAddress"),
+        "price": _num(_first(d.get("unformattedPrice"), info.get("price"), d.get("price")), int),
+        "beds": _num(_first(d.get("beds"), info.get("bedrooms")), int),
+        "baths": _num(_first(d.get("baths"), info.get("bathrooms"))),
+        "lot_sqft": int(lot) if lot is not None else None,
+        "lat": _num(_first(lat_long.get("latitude"), info.get("latitude"))),
+        "lon": _num(_first(lat_long.get("longitude"), info.get("longitude"))),
+        "status": d.get("statusType") or info.get("homeStatus"),
+        "year_built": _num(info.get("yearBuilt"), int),
+        "days_on_market": _num(info.get("daysOnZillow"), int),
+        "remarks": _first(info.get("description"), d.get("flexFieldText")),
+        "url": url,
+    }
+
+
+CARD_PARSERS: Dict[str, Callable[[dict], Optional[dict]]] = {
+    "redfin": _redfin_card,
+    "realtor": _realtor_card,
+    "zillow": _zillow_card,
+}
+
+
+def fill_missing(into: dict, row: Optional[dict]) -> dict:
+    """Fill empty fields of `into` from `row` (list and map results overlap; detail pages miss fields)."""
+    for k, v in (row or {}).items():
+        if into.get(k) in (None, "") and v not in (None, ""):
+            into[k] = v
+    return into
+
+
+def cards_from_payloads(site: str, texts: List[str]) -> Dict[str, dict]:
+    """Map detail URL -> listing row for every card found in the captured bodies."""
+    parse = CARD_PARSERS.get(site)
+    if parse is None:
+        return {}
+    cards: Dict[str, dict] = {}
+    for body in texts:
+        data = _loads(body)
+        if data is None:
+            continue
+        for d in _iter_dicts(data):
+            try:
+                row = parse(d)
+            except Exception as e:
+                logger.debug("[cards] %s: skipped malformed card: %s", site, e)
+                continue
+            if row is None:
+                continue
+            row["source"] = site
+            fill_missing(cards.setdefault(row["url"], {}), row)
+    return cards
+
+
+def result_pages(site: str, texts: List[str]) -> Optional[int]:
+    """Number of results pages the search reports, if any captured body says so."""
+    keys = PAGINATION_KEYS.get(site)
+    if keys is None:
+        return None
+    pages_key, total_key, size_key = keys
+    best = None
+    for body in texts:
+        data = _loads(body)
+        if data is None:
+            continue
+        for d in _iter_dicts(data):
+            pages = _num(d.get(pages_key), int)
+            if pages is None:
+                total, size = _num(d.get(total_key), int), _num(d.get(size_key), int)
+                if total is not None and size:
+                    pages = -(-total // size)
+            if pages and pages > (best or 0):
+                best = pages
+    return best
+
+
+def card_fingerprint(card: Optional[dict]) -> Optional[str]:
+    """Digest of the card fields a detail fetch depends on (price, status, beds/baths, lot)."""
+    if not card:
+        return None
+    status = card.get("status")
+    values = [_num(card.get(k)) for k in FINGERPRINT_FIELDS] + [str(status).strip().lower() if status else None]
+    return hashlib.sha1(json.dumps(values).encode("utf-8")).hexdigest()[:16]
+
+
+def missing_fields(row: Optional[dict]) -> List[str]:
+    if not row:
+        return list(REQUIRED_FIELDS)
+    return [f for f in REQUIRED_FIELDS if row.get(f) in (None, "")]
+
+
+def is_complete(row: Optional[dict]) -> bool:
+    return not missing_fields(row)
+
+
+def partition(urls: List[str], cards: Dict[str, dict]) -> Tuple[List[dict], List[str]]:
+    """Split into rows already complete from their card and URLs that still need a detail fetch."""
+    rows, todo = [], []
+    for u in urls:
+        card = cards.get(u)
+        if is_complete(card):
+            rows.append(dict(card))
+        else:
+            todo.append(u)
+    return rows, todo
@@ -0,0 +1,73 @@
+# app/scraper/deadline.py
+"""
+Per-page time budget shared by every extraction strategy.
+
+A Deadline is created once a detail page has its tab (not while it queues
+for one) and handed to each step (navigation, waits, extraction); its clock
+starts when the first step asks it for time, so a rate-limiter wait before the
+first navigation is not charged to the page. Steps ask it for a timeout capped
+by what is left (timeout_ms) or whether they should run at all (allows);
+anything skipped or shortened is remembered, and finish() records pages that
+ran out of budget in the run report.
+"""
+import time
+from typing import List, Optional
+
+from app.scraper.run_report import REPORT
+
+DETAIL_BUDGET_S = 25.0
+CLAMP_SLACK_MS = 250  # budget used before a step that still doesn't count as cutting it short
+
+
+class Deadline:
+    def __init__(self, budget_s: float = DETAIL_BUDGET_S, site: str = "", url: str = ""):
+        self.budget_s = budget_s
+        self.site = site
+        self.url = url
+        self.started: Optional[float] = None
+        self.skipped: List[str] = []
+        self.shortened: List[str] = []
+
+    def elapsed(self) -> float:
+        if self.started is None:
+            self.started = time.monotonic()
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.budget_s - self.elapsed())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def allows(self, step: str, min_s: float = 0.5) -> bool:
+        """False (and the step is noted as skipped) when less than min_s is left."""
+        if self.remaining() < min_s:
+            self.skipped.append(step)
+            return False
+        return True
+
+    def timeout_ms(self, step: str, cap_ms: int) -> int:
+        """
+        The step's usual timeout, cut down to the remaining budget (never 0:
+        Playwright reads that as 'no timeout'). Only a cut below what the full
+        budget would have allowed counts as shortened; a usual timeout longer
+        than the whole budget is just clamped.
+        """
+        left = int(self.remaining() * 1000)
+        if left >= cap_ms:
+            return cap_ms
+        if left < min(cap_ms, self.budget_s * 1000) - CLAMP_SLACK_MS:
+            self.shortened.append(step)
+        return max(1, left)
+
+    @property
+    def hit(self) -> bool:
+        return bool(self.skipped or self.shortened) or self.expired()
+
+    def finish(self) -> None:
+        if self.hit:
+            REPORT.add("deadline_hits", {
+                "site": self.site, "url": self.url, "budget_s": self.budget_s,
+                "elapsed_s": round(self.elapsed(), 2),
+                "skipped": self.skipped, "shortened": self.shortened,
+            })
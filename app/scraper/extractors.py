@@ -0,0 +1,562 @@
+# app/scraper/extractors.py
+"""
+Declarative detail-page extractors for every site.
+
+Each site declares, per output field, tiers of strategies (decoded JSON
+first, then markup, then loose text) and a normalizer:
+
+  Json(source, *paths)   first value present at a dotted path of a JSON source
+                         the site knows how to locate (SITE.sources)
+  Css(group, pattern)    visible text of the site's selector group, optionally
+                         group 1 of `pattern` in it
+  Regex(pattern, near)   group 1 of `pattern`, searched only in windows around
+                         the `near` labels instead of the whole page
+
+register() compiles a site once (regexes, strategy names, the JSON keys and
+selector groups a browser needs). extract() wraps the page in a Document that
+locates each JSON source, parses the DOM and cuts each window at most once,
+then fills every field from the first strategy that yields a value, in the
+order strategy_stats has learned. The browser path builds the Document from
+one page.evaluate result instead of HTML (see zillow_extract).
+"""
+import json
+import re
+from dataclasses import dataclass, field as dc_field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.scraper.parsed_document import ParsedDocument
+from app.scraper.strategy_stats import STATS
+
+FIELDS = ['address', 'price', 'beds', 'baths', 'lot_sqft']
+
+SQFT_PER_ACRE = 43560
+MAX_TEXTS_PER_GROUP = 12
+WINDOW_BEFORE = 200
+WINDOW_AFTER = 1500
+MAX_ESCAPED_CHARS = 200_000  # longest escaped payload slice object_after() unescapes
+LD_TYPES = {'RealEstateListing', 'SingleFamilyResidence', 'House', 'Residence', 'Apartment', 'Product'}
+
+
+# ---------- normalizers ----------
+
+def _number(value) -> Optional[float]:
+    if value is None or isinstance(value, (dict, list, bool)):
+        return None
+    try:
+        return float(str(value).replace(',', '').replace('$', '').strip())
+    except ValueError:
+        return None
+
+
+def text(value) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value).strip() or None
+
+
+def street(value) -> Optional[str]:
+    """First comma-separated part: "12 Walnut St, Newton, MA" -> "12 Walnut St"."""
+    value = text(value)
+    return (value.split(',')[0].strip() or None) if value else None
+
+
+def amount(value) -> Optional[str]:
+    """Whole-dollar / whole-sqft string: "$1,250,000" -> "1250000"."""
+    n = _number(value)
+    return str(int(n)) if n is not None else None
+
+
+def integer(value) -> Optional[int]:
+    n = _number(value)
+    return int(n) if n is not None else None
+
+
+def number(value) -> Optional[float]:
+    return _number(value)
+
+
+def acres_to_sqft(value) -> Optional[int]:
+    n = _number(value)
+    return int(n * SQFT_PER_ACRE) if n is not None else None
+
+
+# ---------- JSON location helpers ----------
+
+_DECODER = json.JSONDecoder()
+_SPACE_RE = re.compile(r'\s*')
+_STRING_BODY_RE = re.compile(r'(?:[^"\\]|\\.)*')
+NEXT_DATA_RE = re.compile(r'<script[^>]+id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+
+def _raw_decode(html: str, pos: int) -> Optional[dict]:
+    pos = _SPACE_RE.match(html, pos).end()
+    try:
+        obj, _ = _DECODER.raw_decode(html, pos)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def object_after(html: str, key: str) -> Optional[dict]:
+    """Decode the JSON object stored under `key`, plain or inside an escaped JSON string."""
+    plain = f'"{key}":'
+    i = html.find(plain)
+    if i >= 0:
+        return _raw_decode(html, i + len(plain))
+    i = html.find(f'\\"{key}\\":')
+    if i < 0:
+        return None
+    body = _STRING_BODY_RE.match(html, i, i + MAX_ESCAPED_CHARS).group(0)
+    try:
+        unescaped = json.loads(f'"{body}"')
+    except ValueError:
+        return None
+    return _raw_decode(unescaped, len(plain))
+
+
+def _ld_json_blocks(html: str) -> Iterator[str]:
+    pos = 0
+    while True:
+        i = html.find('application/ld+json', pos)
+        if i < 0:
+            return
+        start = html.find('>', i) + 1
+        end = html.find('</script>', start)
+        if start <= 0 or end < 0:
+            return
+        yield html[start:end]
+        pos = end
+
+
+def ld_listing(html: str) -> Optional[dict]:
+    """First JSON-LD object typed as a listing/residence."""
+    for block in _ld_json_blocks(html):
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for item in data if isinstance(data, list) else [data]:
+            if not isinstance(item, dict):
+                continue
+            types = item.get('@type')
+            if (set(types) if isinstance(types, list) else {types}) & LD_TYPES:
+                return item
+    return None
+
+
+def next_data(html: str) -> Optional[dict]:
+    m = NEXT_DATA_RE.search(html)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
+
+
+def get_path(obj: Any, path: str):
+    """Dotted lookup; lists step into their first item, {"value": x} unwraps to x."""
+    for part in path.split('.'):
+        if isinstance(obj, list):
+            obj = obj[0] if obj else None
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(part)
+    if isinstance(obj, dict) and 'value' in obj:  # JSON-LD: {"value": 8000, "unitCode": "FTK"}
+        obj = obj['value']
+    return obj
+
+
+def _first_group(m: Optional[re.Match]):
+    if not m:
+        return None
+    return next((g for g in m.groups() if g is not None), None) if m.groups() else m.group(0)
+
+
+# ---------- strategies ----------
+
+class Json:
+    """First scalar found at `paths` inside the JSON source `source`."""
+
+    def __init__(self, source: str, *paths: str):
+        self.source, self.paths, self.name = source, paths, source
+
+    def applies(self, doc) -> bool:
+        return doc.source(self.source) is not None
+
+    def run(self, doc):
+        obj = doc.source(self.source)
+        for path in self.paths:
+            value = get_path(obj, path)
+            if value is not None and not isinstance(value, (dict, list)):
+                return value
+        return None
+
+
+class Css:
+    """Texts of the site's selector `group`: group 1 of `pattern` if given, then `convert`."""
+
+    def __init__(self, group: str, pattern: Optional[str] = None,
+                 convert: Optional[Callable] = None, flags: int = re.I):
+        self.group, self.convert = group, convert
+        self.regex = re.compile(pattern, flags) if pattern else None
+        self.name = f"{group}:{pattern}" if pattern else group
+
+    def applies(self, doc) -> bool:
+        return True
+
+    def run(self, doc):
+        for t in doc.texts(self.group):
+            value = _first_group(self.regex.search(t)) if self.regex else t
+            if value is not None and self.convert:
+                value = self.convert(value)
+            if value is not None:
+                return value
+        return None
+
+
+class Regex:
+    """Group 1 of `pattern` within windows around the `near` labels (whole page if none)."""
+
+    def __init__(self, pattern: str, near: Sequence[str] = (), flags: int = 0,
+                 convert: Optional[Callable] = None):
+        self.regex, self.near, self.convert, self.name = re.compile(pattern, flags), tuple(near), convert, pattern
+
+    def applies(self, doc) -> bool:
+        return True
+
+    def run(self, doc):
+        value = _first_group(self.regex.search(doc.window(self.near)))
+        return self.convert(value) if value is not None and self.convert else value
+
+
+# ---------- documents ----------
+
+class HtmlDocument:
+    """A fetched page; each JSON source, the DOM and each window are built at most once."""
+
+    def __init__(self, html: str, site: "Site", parsed: Optional[ParsedDocument] = None):
+        self.html, self.site = html or '', site
+        self._sources: Dict[str, Any] = {}
+        self._texts: Dict[str, List[str]] = {}
+        self._windows: Dict[tuple, str] = {}
+        self._parsed = parsed
+
+    @property
+    def parsed(self) -> ParsedDocument:
+        """DOM, built on first CSS lookup (and shareable with other readers of the page)."""
+        if self._parsed is None:
+            self._parsed = ParsedDocument(self.html)
+        return self._parsed
+
+    def source(self, name: str):
+        if name not in self._sources:
+            locate = self.site.sources.get(name)
+            self._sources[name] = locate(self) if locate else None
+        return self._sources[name]
+
+    def texts(self, group: str) -> List[str]:
+        if group not in self._texts:
+            self._texts[group] = self.parsed.texts(self.site.text_groups.get(group, []), limit=MAX_TEXTS_PER_GROUP)
+        return self._texts[group]
+
+    def window(self, anchors: tuple) -> str:
+        if not anchors:
+            return self.html
+        if anchors not in self._windows:
+            parts = []
+            for anchor in anchors:
+                i = self.html.find(anchor)
+                if i >= 0:
+                    parts.append(self.html[max(0, i - WINDOW_BEFORE):i + WINDOW_AFTER])
+            self._windows[anchors] = '\n'.join(parts)
+        return self._windows[anchors]
+
+
+class PrefetchedDocument:
+    """JSON sources and text groups already collected in the browser; no HTML to window."""
+
+    def __init__(self, sources: Dict[str, Any], texts: Dict[str, List[str]]):
+        self.sources, self.text_groups = sources, texts
+
+    def source(self, name: str):
+        return self.sources.get(name)
+
+    def texts(self, group: str) -> List[str]:
+        return self.text_groups.get(group) or []
+
+    def window(self, anchors: tuple) -> str:
+        return ''
+
+
+# ---------- sites ----------
+
+@dataclass
+class Field:
+    normalize: Callable[[Any], Any]
+    tiers: List[List[Any]]
+
+
+@dataclass
+class Site:
+    name: str
+    fields: Dict[str, Field]
+    sources: Dict[str, Callable[[HtmlDocument], Any]] = dc_field(default_factory=dict)  # HTML locators
+    text_groups: Dict[str, List[str]] = dc_field(default_factory=dict)                  # CSS selectors
+
+    def __post_init__(self):
+        self.names: Dict[str, List[List[str]]] = {}
+        self.strategies: Dict[str, Dict[str, Any]] = {}
+        for fname, spec in self.fields.items():
+            by_name = {}
+            for strategy in (s for tier in spec.tiers for s in tier):
+                if strategy.name in by_name:
+                    raise ValueError(f"{self.name}.{fname}: duplicate strategy {strategy.name!r}")
+                by_name[strategy.name] = strategy
+            self.strategies[fname] = by_name
+            self.names[fname] = [[s.name for s in tier] for tier in spec.tiers]
+
+    @property
+    def json_keys(self) -> List[str]:
+        """Top-level keys any Json strategy reads (what a browser needs to ship back)."""
+        return sorted({p.split('.')[0] for spec in self.fields.values() for tier in spec.tiers
+                       for s in tier if isinstance(s, Json) for p in s.paths})
+
+    def extract(self, doc) -> dict:
+        row = {}
+        for fname, spec in self.fields.items():
+            value = None
+            for name in STATS.order(self.name, fname, self.names[fname]):
+                strategy = self.strategies[fname][name]
+                if not strategy.applies(doc):
+                    continue
+                value = spec.normalize(strategy.run(doc))
+                STATS.record(self.name, fname, name, value is not None)
+                if value is not None:
+                    break
+            row[fname] = value
+        return row
+
+
+SITES: Dict[str, Site] = {}
+
+
+def register(site: Site) -> Site:
+    SITES[site.name] = site
+    return site
+
+
+def extract(site: str, html: str) -> dict:
+    """FIELDS of one detail page (None where nothing matched)."""
+    spec = SITES[site]
+    return spec.extract(HtmlDocument(html, spec))
+
+
+def _ld(*paths: str) -> Json:
+    """schema.org paths on the listing itself or its mainEntity."""
+    return Json('jsonld', *paths, *(f'mainEntity.{p}' for p in paths))
+
+
+# ---------- Redfin ----------
+
+register(Site(
+    name='redfin',
+    sources={
+        'above_the_fold': lambda doc: object_after(doc.html, 'addressSectionInfo'),
+        'public_records': lambda doc: object_after(doc.html, 'basicInfo'),
+        'jsonld': lambda doc: ld_listing(doc.html),
+    },
+    fields={
+        'address': Field(text, [
+            [Json('above_the_fold', 'streetAddress.assembledAddress', 'streetAddress.streetLine', 'streetAddress'),
+             _ld('address.streetAddress')],
+            [Regex(r'<h1[^>]*>([^<]+?(?=\s*\$|\s*\||\s*<))', near=('<h1',), flags=re.I),
+             Regex(r'<title>([^|]+?)(?=\s*\$|\s*\|)', near=('<title',), flags=re.I),
+             Regex(r'<span[^>]*>Address:\s*([^<]+)', near=('Address:',), flags=re.I)],
+            [Regex(r'<div[^>]*>([^<]+?(?:Street|Road|Avenue|Lane|Drive|Place|Circle|Court|Terrace|Way)[^<]*)</div>',
+                   near=('street-address', '<h1'), flags=re.I)],
+        ]),
+        'price': Field(amount, [
+            [Json('above_the_fold', 'priceInfo.amount', 'price'), _ld('offers.price')],
+            [Regex(r'<div[^>]*>Price:\s*\$?([\d,]+)', near=('Price:',)),
+             Regex(r'abp-price[^>]*>[^$]{0,200}\$([\d,]+)', near=('abp-price',))],
+            [Regex(r'\$([0-9,]+)', near=('abp-price', 'Price:', 'statsValue')),
+             Regex(r'([0-9,]+)\s*dollars', near=('dollars',))],
+        ]),
+        'beds': Field(integer, [
+            [Json('above_the_fold', 'beds'), Json('public_records', 'beds'),
+             _ld('numberOfBedrooms', 'numberOfRooms')],
+            [Regex(r'<span[^>]*>(\d+)\s*(?:Beds|Bedrooms)', near=('Beds', 'Bedrooms')),
+             Regex(r'Beds:\s*(\d+)', near=('Beds:',))],
+            [Regex(r'(\d+)\s*(?:Beds|Bedrooms)', near=('abp-beds', 'Beds', 'Bedrooms')),
+             Regex(r'(\d+)\s*(?:BR|bed)', near=('abp-beds', 'BR', 'bed'))],
+        ]),
+        'baths': Field(number, [
+            [Json('above_the_fold', 'baths'), Json('public_records', 'baths'),
+             _ld('numberOfBathroomsTotal', 'numberOfBathrooms')],
+            [Regex(r'<span[^>]*>(\d+(?:\.\d+)?)\s*(?:Baths|Bathrooms)', near=('Baths', 'Bathrooms')),
+             Regex(r'Baths:\s*(\d+(?:\.\d+)?)', near=('Baths:',))],
+            [Regex(r'(\d+(?:\.\d+)?)\s*(?:Baths|Bathrooms)', near=('abp-baths', 'Baths', 'Bathrooms')),
+             Regex(r'(\d+(?:\.\d+)?)\s*(?:BA|bath)', near=('abp-baths', 'BA', 'bath'))],
+        ]),
+        'lot_sqft': Field(integer, [
+            [Json('above_the_fold', 'lotSize', 'lotSqFt'), Json('public_records', 'lotSqFt'), _ld('lotSize')],
+            [Regex(r'Lot Size:\s*([\d,]+)', near=('Lot Size',)),
+             Regex(r'Lot:\s*([\d,]+)\s*sq\s*ft', near=('Lot:',)),
+             Regex(r'Lot Size \(sq ft\):\s*([\d,]+)', near=('Lot Size',))],
+            [Regex(r'(\d+(?:,\d+)?)\s*sq\s*ft\s*lot', near=('sq ft lot',)),
+             Regex(r'(\d+(?:,\d+)?)\s*Square Feet', near=('Square Feet',))],
+        ]),
+    },
+))
+
+
+# ---------- Realtor ----------
+
+REALTOR_DETAIL_PATHS = ['props.pageProps.initialReduxState.propertyDetails', 'props.pageProps.property',
+                        'props.pageProps.initialProps.property']
+
+
+def _realtor_details(doc: HtmlDocument) -> Optional[dict]:
+    data = doc.source('next_data')
+    return next((d for d in (get_path(data, p) for p in REALTOR_DETAIL_PATHS) if isinstance(d, dict)), None)
+
+
+register(Site(
+    name='realtor',
+    sources={
+        'next_data': lambda doc: next_data(doc.html),
+        'property_details': _realtor_details,
+        'jsonld': lambda doc: ld_listing(doc.html),
+    },
+    fields={
+        'address': Field(text, [
+            [Json('property_details', 'location.address.line'), _ld('address.streetAddress')],
+            [Regex(r'"street":"([^"]+)"', near=('"street"',)),
+             Regex(r'"addressLine":"([^"]+)"', near=('"addressLine"',)),
+             Regex(r'"address":"([^"]+)"', near=('"address"',))],
+        ]),
+        'price': Field(amount, [
+            [Json('property_details', 'list_price', 'price'), _ld('offers.price')],
+            [Regex(r'"price":\s*"?\$?([\d,]+)"?', near=('"price"',)),
+             Regex(r'"list_price":\s*([\d,]+)', near=('"list_price"',)),
+             Regex(r'"price_raw":\s*([\d,]+)', near=('"price_raw"',))],
+        ]),
+        'beds': Field(integer, [
+            [Json('property_details', 'description.beds'), _ld('numberOfBedrooms', 'numberOfRooms')],
+            [Regex(r'"beds":\s*(\d+)', near=('"beds"',))],
+        ]),
+        'baths': Field(number, [
+            [Json('property_details', 'description.baths_consolidated', 'description.baths'),
+             _ld('numberOfBathroomsTotal', 'numberOfBathrooms')],
+            [Regex(r'"baths":\s*(\d+(?:\.\d+)?)', near=('"baths"',))],
+        ]),
+        'lot_sqft': Field(integer, [
+            [Json('property_details', 'description.lot_sqft'), _ld('lotSize')],
+            [Regex(r'"lot_size":\s*{[^}]*"size":\s*(\d+)', near=('"lot_size"',)),
+             Regex(r'"lot_sqft":\s*(\d+)', near=('"lot_sqft"',))],
+        ]),
+    },
+))
+
+
+# ---------- Zillow ----------
+
+# JSON sources; in the browser EXTRACT_JS tags its objects with these names
+ZILLOW_SOURCES = ['nextjs', 'gdp_cache', 'apollo', 'redux', 'hdpjs', 'jsonld']
+
+ZILLOW_JSON_FIELDS = {
+    'address': ['streetAddress', 'address.streetAddress', 'location.address', 'fullAddress'],
+    'price': ['price', 'listPrice', 'homePrice', 'unformattedPrice'],
+    'beds': ['bedrooms', 'numberOfBedrooms', 'beds', 'numBeds'],
+    'baths': ['bathrooms', 'numberOfBathrooms', 'baths', 'numBaths'],
+    'lot_sqft': ['lotSize', 'lotSizeSquareFeet', 'lotAreaValue', 'lotArea'],
+}
+
+ZILLOW_TEXT_GROUPS = {
+    'address': ['h1[class*="address"]', '[data-testid="property-address"]', '[data-testid="address"]',
+                '[itemprop="streetAddress"]', '[class*="address"]', '[class*="Address"]', 'h1'],
+    'price': ['[data-testid="price"]', '[data-testid*="price"]', '[class*="Price"]',
+              'span[class*="price"]', 'div[class*="price"]'],
+    'facts': ['[data-testid="bed-bath-living-area-container"]', '[data-testid="bed-bath-item"]',
+              '[data-testid="facts-list"]', '[data-testid="facts-container"]', '[class*="bed-bath-summary"]',
+              '[class*="summary-container"]', '[class*="summary-list"]', '[class*="home-facts"]',
+              '[class*="facts-container"]', '[class*="fact-group"]'],
+}
+
+STREET_RE = re.compile(r'\b(?:street|st|road|rd|ave|avenue|dr|ln|way)\b', re.I)
+
+
+def _street_line(value: str) -> Optional[str]:
+    return street(value) if 'Newton' in value or STREET_RE.search(value) else None
+
+
+def _zillow_json(fname: str) -> List[Json]:
+    # Non-dotted keys may also sit under a nested "property" object
+    paths = [q for p in ZILLOW_JSON_FIELDS[fname] for q in ([p] if '.' in p else [p, f'property.{p}'])]
+    return [Json(src, *paths) for src in ZILLOW_SOURCES]
+
+
+def _gdp_cache_property(doc: HtmlDocument) -> Optional[dict]:
+    cache = get_path(doc.source('next_data'), 'props.pageProps.componentProps.gdpClientCache')
+    if isinstance(cache, str):
+        try:
+            cache = json.loads(cache)
+        except ValueError:
+            return None
+    for entry in (cache or {}).values() if isinstance(cache, dict) else ():
+        if isinstance(entry, dict) and isinstance(entry.get('property'), dict):
+            return entry['property']
+    return None
+
+
+ZILLOW = register(Site(
+    name='zillow',
+    sources={
+        'next_data': lambda doc: next_data(doc.html),
+        'nextjs': lambda doc: get_path(doc.source('next_data'), 'props.pageProps.data.property'),
+        'gdp_cache': _gdp_cache_property,
+        'jsonld': lambda doc: ld_listing(doc.html),
+    },
+    text_groups=ZILLOW_TEXT_GROUPS,
+    fields={
+        'address': Field(street, [
+            _zillow_json('address'),
+            [Regex(r'"streetAddress":\s*"([^"]+)"', near=('"streetAddress"',))],
+            [Css('address', convert=_street_line),
+             Regex(r'<h1[^>]*>([^,<]+),\s*Newton', near=('<h1',)),
+             Regex(r'<title>([^,|]+),\s*Newton', near=('<title',))],
+        ]),
+        'price': Field(amount, [
+            _zillow_json('price'),
+            [Regex(r'"price":\s*"?\$?([\d,]+)"?', near=('"price"',))],
+            [Css('price', r'\$\s?([\d,]+)'),
+             Regex(r'<span[^>]*>[$]?([\d,]+,\d{3})</span>', near=('<span',))],
+        ]),
+        'beds': Field(integer, [
+            _zillow_json('beds'),
+            [Regex(r'"bedrooms":\s*"?(\d+)"?', near=('"bedrooms"',)),
+             Regex(r'"numberOfBedrooms":\s*"?(\d+)"?', near=('"numberOfBedrooms"',))],
+            [Css('facts', r'(\d+)\s*(?:bed|bd|br)')],
+            [Regex(r'(\d+)\s*(?:bed|bd)', near=('bed', 'bd'))],
+        ]),
+        'baths': Field(number, [
+            _zillow_json('baths'),
+            [Regex(r'"bathrooms":\s*"?([\d.]+)"?', near=('"bathrooms"',)),
+             Regex(r'"numberOfBathrooms":\s*"?([\d.]+)"?', near=('"numberOfBathrooms"',))],
+            [Css('facts', r'(\d+(?:\.\d+)?)\s*(?:bath|ba)')],
+            [Regex(r'(\d+(?:\.\d+)?)\s*(?:bath|ba\b)', near=('bath', ' ba'))],
+        ]),
+        'lot_sqft': Field(amount, [
+            _zillow_json('lot_sqft'),
+            [Regex(r'"lotSize":\s*{\s*"value":\s*"?(\d+)"?', near=('"lotSize"',)),
+             Regex(r'"lotSizeValue":\s*"?(\d+)"?', near=('"lotSizeValue"',))],
+            [Css('facts', r'lot (?:size|area|dimensions?|sq\.?\s*ft\.?):\s*([\d,]+)'),
+             Css('facts', r'([\d,]+)\s*sq\.?\s*ft\.?\s*lot'),
+             Css('facts', r'lot.*?([\d,]+)\s*(?:square\s*feet|sq\.?\s*ft|sf)'),
+             Css('facts', r'lot[^\n]*?([\d.]+)\s*acres?|([\d.]+)\s*acres?\s*lot', convert=acres_to_sqft),
+             Regex(r'Lot:\s*([\d,]+)\s*sq\s*ft', near=('Lot:',), flags=re.I)],
+            [Regex(r'([\d,.]+)\s*acres?', near=('acre',), convert=acres_to_sqft)],
+        ]),
+    },
+))
@@ -0,0 +1,100 @@
+# app/scraper/fetch_archive.py
+"""
+Record / replay of everything a pipeline run pulls from the network.
+
+In "record" mode the HTTP client, the Playwright harvester and the geocoder
+write what they received into one compressed zip archive. In "replay" mode the
+same call sites read those bytes back and never touch the network, so
+dev_pipeline.run_pipeline can be benchmarked and profiled reproducibly.
+"""
+import hashlib
+import json
+import threading
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.utils.logger import logger
+
+FETCH_MODES = ("live", "record", "replay")
+
+
+class FetchArchive:
+    def __init__(self, path: Path, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"FetchArchive mode must be 'record' or 'replay', got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._names = set()
+        self.misses = 0
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+        else:
+            self._zip = zipfile.ZipFile(self.path, "r")
+            self._names = set(self._zip.namelist())
+
+    @staticmethod
+    def _name(kind: str, key: str) -> str:
+        return f"{kind}/{hashlib.sha1(key.encode('utf-8')).hexdigest()}.json"
+
+    def put(self, kind: str, key: str, record: Dict) -> None:
+        """Store one record; the first record for a key wins so replays stay deterministic."""
+        if self.mode != "record":
+            return
+        name = self._name(kind, key)
+        data = json.dumps({"key": key, **record}, ensure_ascii=False)
+        with self._lock:
+            if name in self._names:
+                return
+            self._names.add(name)
+            self._zip.writestr(name, data)
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        name = self._name(kind, key)
+        with self._lock:
+            if name not in self._names:
+                self.misses += 1
+                return None
+            return json.loads(self._zip.read(name))
+
+    def close(self) -> None:
+        with self._lock:
+            self._zip.close()
+        logger.info("[archive] %s %s (%d entries, %d misses)", self.mode, self.path, len(self._names), self.misses)
+
+
+_active: Optional[FetchArchive] = None
+
+
+def active() -> Optional[FetchArchive]:
+    return _active
+
+
+def recording() -> bool:
+    return _active is not None and _active.mode == "record"
+
+
+def replaying() -> bool:
+    return _active is not None and _active.mode == "replay"
+
+
+@contextmanager
+def session(mode: str, path: Optional[str] = None):
+    """Activate record/replay for the duration of a pipeline run ('live' is a no-op)."""
+    global _active
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode {mode!r}; expected one of {FETCH_MODES}")
+    if mode == "live":
+        yield None
+        return
+    if _active is not None:
+        raise RuntimeError("A fetch archive session is already active")
+    _active = FetchArchive(Path(path), mode)
+    try:
+        yield _active
+    finally:
+        _active.close()
+        _active = None
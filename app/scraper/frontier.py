@@ -0,0 +1,164 @@
+# app/scraper/frontier.py
+"""
+Results-page frontier: walks a search's pages lazily and streams the detail
+URLs found on them.
+
+Instead of a fixed page list (pg-2, 3_p, ...) and a [:N] slice of the
+detail URLs, the frontier harvests page 1, learns where pagination goes (the
+page count in the search payload, else the rendered next link, else the
+site's page-URL scheme) and harvests the next page only once the consumer has
+taken every URL from the current one. It stops at the last page, at the first
+page that brings no new listings, at MAX_RESULT_PAGES, or when the
+detail-fetch budget is spent: a small market costs a page or two, a large one
+is walked in full.
+
+With PRIORITIZE on and a budget set, pages are walked up front instead, until
+there are CANDIDATES_PER_FETCH times as many candidates as the budget can
+fetch, and the budget goes to the best-scoring of them (see prioritizer).
+Without a budget every candidate gets fetched anyway, so the walk stays lazy.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from app.scraper import prioritizer
+from app.scraper.browser_fetch import harvest_page
+from app.scraper.card_extractor import fill_missing, partition
+from app.scraper.seen_index import SeenIndex, get_index
+from app.scraper.url_filters import filter_newton_urls, listing_id
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+MAX_RESULT_PAGES = 25  # hard stop if a site keeps reporting more pages
+CANDIDATES_PER_FETCH = 3  # prioritized pre-walk stops at this many candidates per budgeted fetch
+
+# Page n of a search, from its first page URL
+PAGE_URLS: Dict[str, Callable[[str, int], str]] = {
+    "redfin": lambda first, n: f"{first.rstrip('/')}/page-{n}",
+    "realtor": lambda first, n: f"{first.rstrip('/')}/pg-{n}",
+    "zillow": lambda first, n: f"{first.rstrip('/')}/{n}_p/",
+}
+
+
+class Pager:
+    """Which results page comes next; shared by Frontier and the in-browser Zillow walk."""
+
+    def __init__(self, site: str, first_url: str, max_pages: int = MAX_RESULT_PAGES):
+        self.site = site
+        self.first_url = first_url
+        self.max_pages = max_pages
+        self.pages = 0
+        self.last_page: Optional[int] = None
+        self.visited = {first_url}
+
+    def advance(self, new_listings: int, pagination: Optional[dict] = None) -> Optional[str]:
+        """Record the page just harvested; URL of the next one, or None when the walk is done."""
+        pagination = pagination or {}
+        self.pages += 1
+        self.last_page = pagination.get("last_page") or self.last_page
+        if not new_listings:
+            reason = "no new listings"
+        elif self.pages >= self.max_pages:
+            reason = "page cap"
+        elif self.last_page and self.pages >= self.last_page:
+            reason = "last page"
+        else:
+            url = pagination.get("next_url") or PAGE_URLS[self.site](self.first_url, self.pages + 1)
+            if url not in self.visited:
+                self.visited.add(url)
+                return url
+            reason = "next link loops back"
+        logger.debug("[frontier] %s: stop after %d pages (%s)", self.site, self.pages, reason)
+        return None
+
+
+class Frontier:
+    """
+    Iterate to get the detail URLs that still need a fetch: best lead first
+    (prioritizer.rank) when prioritizing, else in page order.
+    Listings complete from their search card collect in .rows instead, and
+    .cards holds every card seen so far (for fill_missing on detail rows).
+    Every listing found is marked in the seen index; .new holds the URLs no
+    earlier run had seen. With delta crawl on, listings whose card is unchanged
+    since their last detail fetch are not yielded: their stored row goes to
+    .rows. Report each detail row back with fetched() so the next run can
+    reuse it.
+    """
+
+    def __init__(self, site: str, first_url: str, budget: Optional[int] = None,
+                 max_pages: int = MAX_RESULT_PAGES, harvest: Callable = harvest_page,
+                 seen: Optional[SeenIndex] = None, prioritize: Optional[bool] = None, **harvest_kw):
+        self.site = site
+        self.first_url = first_url
+        self.budget = SETTINGS.fetch_budget if budget is None else budget
+        self.max_pages = max_pages
+        self.harvest = harvest
+        self.harvest_kw = harvest_kw
+        self.seen = seen
+        self.prioritize = SETTINGS.prioritize if prioritize is None else prioritize
+        self.cards: Dict[str, dict] = {}
+        self.rows: List[dict] = []
+        self.new: List[str] = []
+        self.pages = 0
+        self.yielded = 0
+        self.unchanged = 0
+        self._ids: set = set()
+
+    @property
+    def index(self) -> SeenIndex:
+        return self.seen if self.seen is not None else get_index()
+
+    def fetched(self, url: str, row: dict) -> None:
+        """Store the detail row for `url` against its current search card (see SeenIndex.delta)."""
+        self.index.record_fetch(self.site, url, self.cards.get(url), row)
+
+    def _walk(self) -> Iterator[List[str]]:
+        """Harvest results pages lazily; yields each page's URLs that need a detail fetch."""
+        pager = Pager(self.site, self.first_url, self.max_pages)
+        seen = self.index
+        url: Optional[str] = self.first_url
+        while url:
+            try:
+                links, cards, pagination = self.harvest(url, self.site, **self.harvest_kw)
+            except Exception as e:
+                print(f"[{self.site}] harvest failed {url}: {e}")
+                return
+            for u, card in cards.items():
+                fill_missing(self.cards.setdefault(u, {}), card)
+            fresh = [u for u in filter_newton_urls(self.site, links) if listing_id(self.site, u) not in self._ids]
+            self._ids.update(listing_id(self.site, u) for u in fresh)
+            new = seen.mark(self.site, fresh)
+            self.new.extend(new)
+            self.pages = pager.pages + 1
+            rows, todo = partition(fresh, self.cards)
+            todo, reused = seen.delta(self.site, todo, self.cards)
+            self.rows.extend(rows + reused)
+            self.unchanged += len(reused)
+            print(f"[{self.site}] results page {self.pages}: {len(fresh)} listings ({len(new)} new), "
+                  f"{len(rows)} complete from cards, {len(reused)} unchanged since last fetch")
+            yield todo
+            url = pager.advance(len(fresh), pagination)
+
+    def __iter__(self) -> Iterator[str]:
+        batches: Iterable[List[str]] = self._walk()
+        if self.prioritize and self.budget:
+            # Ranking needs the candidates' cards, so results pages are walked first, but only
+            # until there is a comfortable choice for the budget
+            candidates: List[str] = []
+            for batch in batches:
+                candidates.extend(batch)
+                if len(candidates) >= self.budget * CANDIDATES_PER_FETCH:
+                    break
+            batches = [prioritizer.rank(self.site, candidates, self.cards)]
+        for batch in batches:
+            for u in batch:
+                if self._spent():
+                    return
+                self.yielded += 1
+                yield u
+            if self._spent():  # before pulling the next batch, which harvests another results page
+                return
+
+    def _spent(self) -> bool:
+        if self.budget and self.yielded >= self.budget:
+            print(f"[{self.site}] fetch budget of {self.budget} detail pages spent")
+            return True
+        return False
@@ -0,0 +1,150 @@
+# app/scraper/http_cache.py
+"""
+Persistent on-disk response cache for the shared HTTP client.
+
+Bodies are stored gzip-compressed under their SHA-256 (content-addressed, so
+identical pages share one blob); a small SQLite index maps URL -> blob plus the
+ETag / Last-Modified validators. Entries younger than the TTL are served from
+disk; older ones are revalidated with a conditional GET so an unchanged page
+costs a 304 instead of a full download. Entries not stored or revalidated
+within HTTP_CACHE_MAX_AGE are purged when the cache is opened.
+"""
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    status: int
+    body_hash: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    path: Optional[Path] = None
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional-request headers for revalidating this entry."""
+        out = {}
+        if self.etag:
+            out["If-None-Match"] = self.etag
+        if self.last_modified:
+            out["If-Modified-Since"] = self.last_modified
+        return out
+
+    def text(self) -> str:
+        return gzip.decompress(self.path.read_bytes()).decode("utf-8", errors="replace")
+
+
+class ResponseCache:
+    def __init__(self, root: Path, ttl: float):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url_key       TEXT PRIMARY KEY,
+                url           TEXT,
+                status        INTEGER,
+                etag          TEXT,
+                last_modified TEXT,
+                body_hash     TEXT,
+                stored_at     REAL
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, body_hash: str) -> Path:
+        return self.blob_dir / body_hash[:2] / f"{body_hash}.gz"
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, body_hash, stored_at, etag, last_modified "
+                "FROM responses WHERE url_key = ?", (self._key(url),)
+            ).fetchone()
+        if not row:
+            return None
+        entry = CacheEntry(*row)
+        entry.path = self._blob_path(entry.body_hash)
+        return entry if entry.path.exists() else None
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.age() < self.ttl
+
+    def store(self, url: str, status: int, headers: Mapping[str, str], text: str) -> CacheEntry:
+        raw = text.encode("utf-8")
+        body_hash = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(body_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(gzip.compress(raw, compresslevel=6))
+            tmp.replace(path)
+        entry = CacheEntry(url=url, status=status, body_hash=body_hash, stored_at=time.time(),
+                           etag=headers.get("etag"), last_modified=headers.get("last-modified"),
+                           path=path)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self._key(url), url, status, entry.etag, entry.last_modified, body_hash, entry.stored_at),
+            )
+            self._db.commit()
+        return entry
+
+    def refresh(self, entry: CacheEntry, headers: Mapping[str, str]) -> CacheEntry:
+        """Record a 304: the stored body is still current, restart its TTL."""
+        entry.stored_at = time.time()
+        entry.etag = headers.get("etag") or entry.etag
+        entry.last_modified = headers.get("last-modified") or entry.last_modified
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, etag = ?, last_modified = ? WHERE url_key = ?",
+                (entry.stored_at, entry.etag, entry.last_modified, self._key(entry.url)),
+            )
+            self._db.commit()
+        return entry
+
+    def purge(self, max_age: float) -> int:
+        """Drop index rows older than max_age seconds and any blobs no longer referenced."""
+        cutoff = time.time() - max_age
+        with self._lock:
+            cur = self._db.execute("DELETE FROM responses WHERE stored_at < ?", (cutoff,))
+            self._db.commit()
+            live = {h for (h,) in self._db.execute("SELECT DISTINCT body_hash FROM responses")}
+        for blob in self.blob_dir.glob("*/*.gz"):
+            if blob.stem not in live:
+                blob.unlink(missing_ok=True)
+        return cur.rowcount
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Process-wide cache, or None when HTTP_CACHE_TTL is 0 (disabled). Stale entries are purged on open."""
+    global _cache
+    if _cache is None and SETTINGS.http_cache_ttl > 0:
+        _cache = ResponseCache(Path(SETTINGS.http_cache_dir), SETTINGS.http_cache_ttl)
+        purged = _cache.purge(max(SETTINGS.http_cache_max_age, SETTINGS.http_cache_ttl))
+        logger.debug("[cache] using %s (ttl=%ss, purged %d)", SETTINGS.http_cache_dir, SETTINGS.http_cache_ttl, purged)
+    return _cache
@@ -0,0 +1,213 @@
+# app/scraper/http_client.py
+"""
+Shared fetch layer for listing/detail pages.
+
+A single pooled httpx.AsyncClient (keep-alive, HTTP/2 when `h2` is installed,
+gzip/brotli transfer) runs on the shared scraper loop. Every host gets its own
+concurrency cap, and each request is paced by the adaptive per-host limiter.
+Successful responses go through the on-disk cache (http_cache), except block
+or captcha pages served with a 200, and are revalidated with ETag / Last-Modified once their TTL has passed. When a
+record/replay session is active (fetch_archive) responses are written to, or
+served from, the run archive instead.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.scraper import fetch_archive
+from app.scraper._event_loop import register_cleanup, run_sync
+from app.scraper.http_cache import get_cache
+from app.scraper.rate_limiter import host_of, limiter
+from app.utils.logger import logger
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2 = True
+except ImportError:
+    HTTP2 = False
+
+DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+DEFAULT_HEADERS = {
+    "User-Agent": DEFAULT_UA,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+REQUEST_TIMEOUT = 20
+MAX_CONNECTIONS = 40
+MAX_KEEPALIVE = 20
+KEEPALIVE_EXPIRY = 30.0
+PER_HOST_CONCURRENCY = 4
+FETCH_CONCURRENCY = 16   # in-flight requests for streaming fetches (aiter_fetch)
+
+BLOCK_STATUSES = (403, 429, 503)
+BLOCK_MARKERS = (
+    "px-captcha", "perimeterx", "captcha-delivery", "are you a robot",
+    "access to this page has been denied", "pardon our interruption",
+    "request unsuccessful. incapsula", "please verify you are a human",
+)
+
+_client: Optional[httpx.AsyncClient] = None
+_host_slots: Dict[str, asyncio.Semaphore] = {}
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int = 0
+    text: str = ""
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 400
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2,
+            headers=DEFAULT_HEADERS,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        register_cleanup(aclose)
+    return _client
+
+
+def looks_blocked(res: FetchResult) -> bool:
+    if res.status in BLOCK_STATUSES:
+        return True
+    head = (res.text or "")[:20000].lower()
+    return any(m in head for m in BLOCK_MARKERS)
+
+
+def _retry_after(r: httpx.Response) -> Optional[float]:
+    try:
+        return float(r.headers.get("retry-after", ""))
+    except ValueError:
+        return None
+
+
+def _host_slot(host: str) -> asyncio.Semaphore:
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(PER_HOST_CONCURRENCY)
+    return slot
+
+
+async def afetch(url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None, use_cache: bool = True) -> FetchResult:
+    """Fetch one URL through the shared client. Never raises; see FetchResult.error."""
+    if fetch_archive.replaying():
+        rec = fetch_archive.active().get("http", url)
+        if rec is None:
+            return FetchResult(url=url, error="not in replay archive")
+        return FetchResult(url=url, status=rec["status"], text=rec["text"])
+
+    result = await _afetch_network(url, headers, timeout, use_cache)
+    if fetch_archive.recording() and result.error is None:
+        fetch_archive.active().put("http", url, {"status": result.status, "text": result.text})
+    return result
+
+
+async def _afetch_network(url: str, headers: Optional[Dict[str, str]],
+                          timeout: Optional[float], use_cache: bool) -> FetchResult:
+    cache = get_cache() if use_cache else None
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        return FetchResult(url=url, status=entry.status, text=entry.text(), from_cache=True)
+
+    req_headers = dict(headers or {})
+    if entry:
+        req_headers.update(entry.validators())
+
+    host = host_of(url)
+    async with _host_slot(host):
+        await limiter.acquire_async(host)
+        started = time.monotonic()
+        try:
+            r = await _get_client().get(url, headers=req_headers, timeout=timeout or REQUEST_TIMEOUT)
+        except Exception as e:
+            elapsed = time.monotonic() - started
+            limiter.record(host, 0, elapsed)
+            return FetchResult(url=url, error=str(e) or e.__class__.__name__, elapsed=elapsed)
+        elapsed = time.monotonic() - started
+        limiter.record(host, r.status_code, elapsed, retry_after=_retry_after(r))
+
+    if r.status_code == 304 and entry:
+        cache.refresh(entry, r.headers)
+        return FetchResult(url=url, status=entry.status, text=entry.text(), elapsed=elapsed, from_cache=True)
+    result = FetchResult(url=url, status=r.status_code, text=r.text, elapsed=elapsed)
+    if r.status_code == 200 and cache and not looks_blocked(result):
+        cache.store(url, r.status_code, r.headers, r.text)
+    return result
+
+
+async def afetch_many(urls: List[str], headers: Optional[Dict[str, str]] = None) -> List[FetchResult]:
+    """Fetch URLs concurrently (bounded per host); results keep input order."""
+    return list(await asyncio.gather(*(afetch(u, headers=headers) for u in urls)))
+
+
+async def aiter_fetch(urls: List[str], concurrency: int = FETCH_CONCURRENCY,
+                      headers: Optional[Dict[str, str]] = None) -> AsyncIterator[FetchResult]:
+    """
+    Yield results as they complete, with at most `concurrency` requests in flight.
+    New requests start only when the consumer asks for more, so a slow consumer
+    throttles fetching instead of piling up bodies.
+    """
+    pending = iter(urls)
+    running = set()
+    while True:
+        for u in pending:
+            running.add(asyncio.ensure_future(afetch(u, headers=headers)))
+            if len(running) >= concurrency:
+                break
+        if not running:
+            return
+        done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+def fetch_many(urls: List[str], headers: Optional[Dict[str, str]] = None) -> List[FetchResult]:
+    """Synchronous wrapper around afetch_many() for the scraper modules."""
+    if not urls:
+        return []
+    results = run_sync(afetch_many(list(urls), headers=headers))
+    failed = sum(1 for r in results if not r.ok)
+    cached = sum(1 for r in results if r.from_cache)
+    logger.debug("[http] fetched %d urls (%d cached, %d failed, http2=%s)", len(results), cached, failed, HTTP2)
+    return results
+
+
+def fetch_text(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+    """Fetch a single page and return its body; raises on network errors and 4xx/5xx."""
+    r = run_sync(afetch(url, headers=headers))
+    if r.error:
+        raise httpx.HTTPError(r.error)
+    if r.status >= 400:
+        raise httpx.HTTPError(f"HTTP {r.status} for {url}")
+    return r.text
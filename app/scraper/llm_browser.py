@@ -1,12 +1,11 @@
 # app/scraper/llm_browser.py
 import os
 import re
-import time
 from typing import List, Dict
-import httpx
 import pandas as pd
-from bs4 import BeautifulSoup
 
+from app.scraper.parse_pipeline import parse_fetched, summarize_page
+from app.scraper.parsed_document import MIN_MAIN_TEXT
 from app.utils.logger import logger
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -19,14 +18,6 @@ try:
 except Exception:
     openai = None
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/123.0.0.0 Safari/537.36"
-)
-REQUEST_TIMEOUT = 25
-DELAY = 1.0  # polite delay between page fetches
-
 # Regex prefilter (cheap)
 PHRASES = [
     r"tear[\s-]?down",
@@ -41,42 +32,6 @@ PHRASES_RE = re.compile("|".join(PHRASES), re.IGNORECASE)
 
 NEWTON_TEXT_RE = re.compile(r"\bNewton\b.*\bMA\b|\b0245\d\b", re.IGNORECASE)
 
-def _fetch(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
-    with httpx.Client(timeout=REQUEST_TIMEOUT, headers=headers, follow_redirects=True) as c:
-        r = c.get(url)
-        r.raise_for_status()
-        return r.text
-
-def _page_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    # Try common long-content areas first
-    candidates = []
-    for sel in [
-        "[data-rf-test-id='abp-description']",  # redfin often
-        ".ds-overview-section",                 # zillow sometimes
-        "section#property-details",             # realtor sometimes
-        "main", "article", "section", "div"
-    ]:
-        for n in soup.select(sel):
-            t = n.get_text(" ", strip=True)
-            if t and len(t) > 120:
-                candidates.append(t)
-    text = max(candidates, key=len) if candidates else soup.get_text(" ", strip=True)
-    return re.sub(r"\s+", " ", text or "").strip()
-
-def _title(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    return ((soup.title.string if soup.title else "") or "").strip()
-
-def _address_from_title(html: str) -> str:
-    t = _title(html)
-    m = re.search(
-        r"\b\d{1,6}\s+[A-Za-z0-9'.-]+\s+(St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Ct|Court)\b",
-        t, re.IGNORECASE
-    )
-    return m.group(0) if m else t
-
 def _llm_confirm(text: str) -> Dict:
     """
     Use OpenAI to confirm redevelopment signal.
@@ -119,16 +74,14 @@ def scan_listing_urls(urls: List[str], site: str, city: str) -> pd.DataFrame:
     rows: List[Dict] = []
     kept = 0
 
-    for i, u in enumerate(urls, 1):
-        time.sleep(DELAY)
-        try:
-            html = _fetch(u)
-        except Exception as e:
-            logger.debug("[%s] fetch fail (%d/%d): %s", site, i, len(urls), e)
+    # Pages are parsed in worker processes while later ones are still downloading.
+    for i, page in enumerate(parse_fetched(urls, summarize_page, MIN_MAIN_TEXT), 1):
+        u = page.url
+        if not page.ok:
+            logger.debug("[%s] fetch fail (%d/%d): %s", site, i, len(urls), page.error or page.status)
             continue
-
-        title = _title(html)
-        text  = _page_text(html)
+        title = page.data["title"]
+        text  = page.data["text"]
         if not (NEWTON_TEXT_RE.search(title) or NEWTON_TEXT_RE.search(text)):
             continue
 
@@ -139,7 +92,7 @@ def scan_listing_urls(urls: List[str], site: str, city: str) -> pd.DataFrame:
 
         kept += 1
         rows.append({
-            "address": _address_from_title(html) or "",
+            "address": page.data["address"] or "",
             "city": city,
             "state": "MA",
             "price": None, "beds": None, "baths": None, "lot_sqft": None,
@@ -1,22 +1,17 @@
 import os
 import re
-import time
 from typing import List, Dict, Tuple
-import httpx
 import pandas as pd
-from bs4 import BeautifulSoup
 
+from app.scraper.http_client import fetch_text
+from app.scraper.parse_pipeline import parse_fetched, summarize_page
+from app.scraper.parsed_document import ParsedDocument
 from app.utils.logger import logger
 
 # ---- Config ----
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 CITY = "Newton, MA"
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/123.0.0.0 Safari/537.36"
-)
 
 # Site search entry points (public browse pages for Newton, MA)
 SEARCH_PAGES: List[Tuple[str, str]] = [
@@ -27,8 +22,6 @@ SEARCH_PAGES: List[Tuple[str, str]] = [
 
 # How many listing links to inspect per site
 MAX_LINKS_PER_SITE = 25
-REQUEST_TIMEOUT = 20
-DELAY_BETWEEN_REQUESTS = 1.2  # seconds
 
 # Phrases to detect
 PHRASES = [
@@ -104,11 +97,7 @@ def _llm_filter(text: str) -> Dict:
 
 
 def _fetch(url: str) -> str:
-    headers = {"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
-    with httpx.Client(timeout=REQUEST_TIMEOUT, headers=headers, follow_redirects=True) as client:
-        r = client.get(url)
-        r.raise_for_status()
-        return r.text
+    return fetch_text(url)
 
 
 def _extract_links(site: str, html: str) -> List[str]:
@@ -116,10 +105,8 @@ def _extract_links(site: str, html: str) -> List[str]:
     Best-effort extraction of listing links from a site search page.
     We err on the side of collecting extra links, LLM/regex narrows later.
     """
-    soup = BeautifulSoup(html, "html.parser")
     links = []
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
+    for href in ParsedDocument(html).links:
         # Normalize relative links
         if href.startswith("//"):
             href = "https:" + href
@@ -151,55 +138,6 @@ def _extract_links(site: str, html: str) -> List[str]:
     return out
 
 
-def _extract_text_from_listing(html: str) -> str:
-    """
-    Extract visible text chunks likely to contain marketing remarks.
-    Very simple: strip tags and collapse whitespace.
-    """
-    soup = BeautifulSoup(html, "html.parser")
-
-    # Try common description containers first
-    candidates = []
-    for sel in [
-        "[data-rf-test-id='abp-description']",  # redfin (often)
-        ".ds-overview-section",                 # zillow (varies)
-        "section#property-details",             # realtor (varies)
-        "article", "main", "section", "div"
-    ]:
-        for node in soup.select(sel):
-            txt = node.get_text(" ", strip=True)
-            if txt and len(txt) > 80:
-                candidates.append(txt)
-
-    # Fallback to whole-page text
-    if not candidates:
-        txt = soup.get_text(" ", strip=True)
-    else:
-        # choose the longest chunk
-        txt = max(candidates, key=len)
-
-    # collapse whitespace
-    return re.sub(r"\s+", " ", txt or "").strip()
-
-
-def _extract_address_from_title_or_meta(html: str, default: str = "") -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    title = (soup.title.string if soup.title else "") or ""
-    # meta og:title / twitter:title
-    for prop in ["og:title", "twitter:title"]:
-        m = soup.find("meta", property=prop) or soup.find("meta", attrs={"name": prop})
-        if m and m.get("content"):
-            title = m["content"]
-            break
-
-    # Heuristic: number + street + type
-    m = re.search(
-        r"\b\d{1,6}\s+[A-Za-z0-9'.-]+\s+(St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Ct|Court)\b",
-        title, flags=re.IGNORECASE
-    )
-    return m.group(0) if m else default or title.strip()
-
-
 def llm_powered_search(city: str = CITY) -> pd.DataFrame:
     """
     Crawl site search pages for Redfin/Realtor/Zillow, gather listing links,
@@ -222,15 +160,13 @@ def llm_powered_search(city: str = CITY) -> pd.DataFrame:
             logger.warning("[LLM Search] Failed to fetch search page %s: %s", url, e)
             continue
 
-        for link in links:
-            time.sleep(DELAY_BETWEEN_REQUESTS)
-            try:
-                page = _fetch(link)
-            except Exception as e:
-                logger.debug("[LLM Search] Skip %s (fetch failed: %s)", link, e)
+        # Listing pages are parsed in worker processes while later ones are still downloading
+        for page in parse_fetched(links, summarize_page, 80):
+            link = page.url
+            if not page.ok:
+                logger.debug("[LLM Search] Skip %s (fetch failed: %s)", link, page.error or page.status)
                 continue
-
-            text = _extract_text_from_listing(page)
+            text = page.data["text"]
             # Quick regex gate to avoid spending tokens on random pages
             if not PHRASES_RE.search(text):
                 # Still let LLM try the title/meta in case copy is short
@@ -247,7 +183,7 @@ def llm_powered_search(city: str = CITY) -> pd.DataFrame:
                 matched = llm.get("matched", [])
                 reason = llm.get("reason", "regex+LLM match")
 
-            address = _extract_address_from_title_or_meta(page)
+            address = page.data["address"]
             all_rows.append({
                 "address": address or "",
                 "city": city,
@@ -0,0 +1,156 @@
+# app/scraper/parse_pipeline.py
+"""
+Fetch -> parse pipeline: network waits and HTML parsing overlap, and parsing
+uses every core.
+
+A fetch stage (any async iterator of FetchResult: http_client.aiter_fetch or
+tiered_fetch.aiter_pages) feeds a bounded queue; parser tasks hand each body
+to a ProcessPoolExecutor and keep only the compact dict the worker returns.
+When the parsers fall behind the queue fills, the fetch stage stops pulling
+new URLs, and at most QUEUE_SIZE + parser-count bodies are held in memory.
+
+Worker functions must be module-level (they are pickled by name). Extractor
+strategy hits recorded inside a worker are shipped back with each result and
+merged into strategy_stats.STATS here. SETTINGS.parse_workers = 0 parses on a
+thread of this process instead (debugging, tiny batches).
+"""
+import asyncio
+import atexit
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.scraper._event_loop import run_sync
+from app.scraper.extractors import extract
+from app.scraper.http_client import FetchResult, aiter_fetch
+from app.scraper.parsed_document import ParsedDocument
+from app.scraper.strategy_stats import STATS
+from app.scraper.tiered_fetch import aiter_pages
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+QUEUE_SIZE = 32          # fetched bodies waiting for a parser
+PARSERS_PER_WORKER = 2   # in-flight parse calls per worker process (keeps them busy)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass
+class Parsed:
+    url: str
+    status: int = 0
+    error: Optional[str] = None
+    data: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.data is not None
+
+
+# ---------- worker functions ----------
+
+def extract_row(html: str, site: str) -> dict:
+    """Site extractor row (extractors.FIELDS) for one detail page."""
+    return extract(site, html)
+
+
+def summarize_page(html: str, min_len: int) -> dict:
+    """Title, main text and best street address of a page, for the text scanners."""
+    doc = ParsedDocument(html)
+    return {"title": doc.title, "text": doc.main_text(min_len), "address": doc.address()}
+
+
+def _in_worker(fn: Callable, html: str, args: tuple) -> Tuple[dict, Dict]:
+    return fn(html, *args), STATS.drain()
+
+
+# ---------- pipeline ----------
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: the parent runs an event-loop thread, which fork would copy mid-flight
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+async def _parse(executor: Optional[Executor], fn: Callable, html: str, args: tuple) -> dict:
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        return await loop.run_in_executor(None, fn, html, *args)
+    data, delta = await loop.run_in_executor(executor, _in_worker, fn, html, args)
+    STATS.merge(delta)
+    return data
+
+
+async def arun(source: AsyncIterator[FetchResult], fn: Callable, *args,
+               workers: Optional[int] = None, queue_size: int = QUEUE_SIZE) -> List[Parsed]:
+    """
+    Parse every page `source` yields with fn(html, *args) while later pages are
+    still downloading. Results come back in completion order.
+    """
+    workers = SETTINGS.parse_workers if workers is None else workers
+    executor = _get_pool(workers) if workers > 0 else None
+    n_parsers = max(1, workers) * PARSERS_PER_WORKER
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    out: List[Parsed] = []
+
+    async def produce():
+        try:
+            async for res in source:
+                await queue.put(res)   # waits while the parsers are behind
+        finally:
+            for _ in range(n_parsers):
+                await queue.put(None)
+
+    async def consume():
+        while True:
+            res = await queue.get()
+            if res is None:
+                return
+            if not res.ok:
+                out.append(Parsed(url=res.url, status=res.status, error=res.error or f"HTTP {res.status}"))
+                continue
+            try:
+                data = await _parse(executor, fn, res.text, args)
+            except Exception as e:
+                out.append(Parsed(url=res.url, status=res.status, error=f"parse: {e}"))
+                continue
+            out.append(Parsed(url=res.url, status=res.status, data=data))
+
+    await asyncio.gather(produce(), *(consume() for _ in range(n_parsers)))
+    return out
+
+
+def _in_order(urls: List[str], parsed: List[Parsed]) -> List[Parsed]:
+    by_url = {p.url: p for p in parsed}
+    return [by_url.get(u) or Parsed(url=u, error="not fetched") for u in urls]
+
+
+def parse_fetched(urls: List[str], fn: Callable, *args) -> List[Parsed]:
+    """Plain-HTTP fetch of `urls` pipelined into fn(html, *args); input order."""
+    if not urls:
+        return []
+    parsed = run_sync(arun(aiter_fetch(list(urls)), fn, *args))
+    logger.debug("[pipeline] %d pages, %d parsed", len(urls), sum(p.ok for p in parsed))
+    return _in_order(urls, parsed)
+
+
+def parse_tiered(site: str, urls: Iterable[str], fn: Callable, *args, chunk: int = QUEUE_SIZE) -> Iterator[Parsed]:
+    """
+    Tiered (HTTP, then browser) fetch of detail pages pipelined into fn(html, *args);
+    input order. `urls` is pulled `chunk` at a time, so a lazy source
+    (frontier.Frontier) is only asked for more once the last chunk is parsed.
+    """
+    it = iter(urls)
+    try:
+        while True:
+            batch = list(islice(it, chunk))
+            if not batch:
+                return
+            yield from _in_order(batch, run_sync(arun(aiter_pages(batch, site), fn, *args)))
+    finally:
+        STATS.save()
@@ -0,0 +1,232 @@
+# app/scraper/parsed_document.py
+"""
+Parse-once HTML document shared by the page readers.
+
+The scanners used to build a BeautifulSoup tree per question (text, title,
+address), i.e. up to three pure-Python parses per page. ParsedDocument parses
+at most once, on first use, and computes title, meta tags, main text, links
+and address candidates lazily from that one tree.
+
+Backends, fastest first: selectolax (if installed), BeautifulSoup over lxml,
+BeautifulSoup over html.parser. SETTINGS.html_parser ("auto" by default)
+forces one.
+"""
+import re
+from functools import cached_property
+from typing import Dict, List, Optional
+
+from app.utils.config_loader import SETTINGS
+
+try:
+    from selectolax.parser import HTMLParser  # type: ignore
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml  # type: ignore  # noqa: F401
+    _BS4_PARSER = "lxml"
+except ImportError:
+    _BS4_PARSER = "html.parser"
+
+# Site description containers as (tag or None, attribute, value), preferred over generic blocks
+DESCRIPTION_MARKERS = [
+    (None, "data-rf-test-id", "abp-description"),  # redfin
+    (None, "class", "ds-overview-section"),        # zillow
+    ("section", "id", "property-details"),         # realtor
+]
+BLOCK_TAGS = {"main", "article", "section", "div"}
+SKIP_TAGS = {"script", "style", "noscript", "template", "head"}
+MIN_MAIN_TEXT = 120
+MAIN_TEXT_SHARE = 0.8  # deepest block keeping this share of the best block's non-link text wins
+
+STREET_ADDRESS_RE = re.compile(
+    r"\b\d{1,6}\s+[A-Za-z0-9'.-]+\s+(St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Ln|Lane|Way|Ct|Court)\b", re.I)
+TITLE_METAS = ["og:title", "twitter:title"]
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _has_value(attr, value: str) -> bool:
+    """Attribute equals `value`, or contains it as a class-style token."""
+    if isinstance(attr, (list, tuple)):
+        return value in attr
+    return bool(attr) and (attr == value or value in attr.split())
+
+
+def _backend(name: str) -> str:
+    if name == "selectolax" and HTMLParser is None:
+        raise RuntimeError("HTML_PARSER=selectolax but selectolax is not installed")
+    if name == "auto":
+        return "selectolax" if HTMLParser is not None else _BS4_PARSER
+    return name
+
+
+BACKEND = _backend(SETTINGS.html_parser)
+
+
+class ParsedDocument:
+    def __init__(self, html: str, backend: Optional[str] = None):
+        self.html = html or ""
+        self.backend = _backend(backend) if backend else BACKEND
+
+    @cached_property
+    def tree(self):
+        if self.backend == "selectolax":
+            tree = HTMLParser(self.html)
+            tree.strip_tags(["script", "style"])  # bs4's get_text skips these too
+            return tree
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(self.html, self.backend)
+
+    # ---- backend-neutral node access ----
+
+    def select(self, selector: str) -> list:
+        return self.tree.css(selector) if self.backend == "selectolax" else self.tree.select(selector)
+
+    def node_text(self, node) -> str:
+        if self.backend == "selectolax":
+            return node.text(separator=" ", strip=True)
+        return node.get_text(" ", strip=True)
+
+    def _attrs(self, node) -> Dict[str, str]:
+        return dict(node.attributes) if self.backend == "selectolax" else dict(node.attrs)
+
+    def texts(self, selectors: List[str], limit: int = 0) -> List[str]:
+        """Non-empty texts of the nodes matching each selector, in selector order."""
+        out: List[str] = []
+        for selector in selectors:
+            out.extend(t for t in (self.node_text(n) for n in self.select(selector)) if t)
+            if limit and len(out) >= limit:
+                return out[:limit]
+        return out
+
+    # ---- lazily computed page facts ----
+
+    @cached_property
+    def title(self) -> str:
+        nodes = self.select("title")
+        if not nodes:
+            return ""
+        if self.backend == "selectolax":
+            return nodes[0].text().strip()
+        return (nodes[0].string or "").strip()
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """content of <meta> tags by property/name (first occurrence wins)."""
+        out: Dict[str, str] = {}
+        for node in self.select("meta"):
+            attrs = self._attrs(node)
+            key = attrs.get("property") or attrs.get("name")
+            if key and attrs.get("content") and key not in out:
+                out[key] = attrs["content"]
+        return out
+
+    @cached_property
+    def display_title(self) -> str:
+        """og:title / twitter:title if present, else <title>."""
+        return next((self.meta[k] for k in TITLE_METAS if self.meta.get(k)), self.title)
+
+    @cached_property
+    def text(self) -> str:
+        """Whole-page text, whitespace collapsed."""
+        root = (self.tree.body or self.tree.root) if self.backend == "selectolax" else self.tree
+        return _SPACE_RE.sub(" ", self.node_text(root) if root is not None else "").strip()
+
+    def _walk(self):
+        """
+        Post-order walk yielding (tag, node, depth, text_len, link_len, is_description)
+        per element. Lengths are summed bottom-up, so the whole tree costs one pass
+        and no strings.
+        """
+        if self.backend == "selectolax":
+            root = self.tree.root
+            children = lambda n: n.iter(include_text=True)
+            tag_of = lambda n: n.tag
+            attrs_of = lambda n: n.attributes
+            text_len = lambda n: len(n.text(deep=False, strip=True)) if n.tag == "-text" else None
+        else:
+            from bs4 import CData, NavigableString, Tag
+            root = self.tree
+            children = lambda n: n.contents
+            tag_of = lambda n: n.name if isinstance(n, Tag) else None
+            attrs_of = lambda n: n.attrs
+            text_len = (lambda n: len(n.strip()) if type(n) in (NavigableString, CData) else
+                        (0 if isinstance(n, NavigableString) else None))
+        if root is None:
+            return
+        frames = []                      # open elements: [tag, node, depth, text_len, link_len, is_description]
+        work = [(root, 0)]
+        while work:
+            item = work.pop()
+            if item is None:             # end of the element on top of `frames`
+                tag, node, depth, text, link, described = frames.pop()
+                if tag == "a":
+                    link = text
+                if frames:
+                    frames[-1][3] += text
+                    frames[-1][4] += link
+                yield tag, node, depth, text, link, described
+                continue
+            node, depth = item
+            n = text_len(node)
+            if n is not None:
+                if n and frames:
+                    frames[-1][3] += n + 1   # + separator, as in get_text(" ")
+                continue
+            tag = tag_of(node)
+            if tag in SKIP_TAGS or (tag or "").startswith(("-", "_")):  # selectolax text/comment nodes
+                continue
+            attrs = attrs_of(node) or {}
+            frames.append([tag, node, depth, 0, 0, any(
+                (want is None or want == tag) and _has_value(attrs.get(attr), value)
+                for want, attr, value in DESCRIPTION_MARKERS)])
+            work.append(None)
+            work.extend((child, depth + 1) for child in reversed(list(children(node))))
+
+    def main_text(self, min_len: int = MIN_MAIN_TEXT) -> str:
+        """
+        Main content block, found in one text-density pass: a site description
+        container if one has over `min_len` chars, else the deepest
+        main/article/section/div keeping MAIN_TEXT_SHARE of the best block's
+        non-link text, else the whole page text. Only the winner is materialized.
+        """
+        cache = self.__dict__.setdefault("_main_text", {})
+        if min_len not in cache:
+            described, blocks = [], []
+            for tag, node, depth, text, link, is_description in self._walk():
+                if is_description:
+                    described.append((text, node))
+                if tag in BLOCK_TAGS:
+                    blocks.append((text - link, depth, node))
+            t = ""
+            best_described = max(described, key=lambda d: d[0], default=None)
+            if best_described and best_described[0] > min_len:
+                t = self.node_text(best_described[1])
+            if len(t) <= min_len:
+                best = max((b[0] for b in blocks), default=0)
+                if best > min_len:
+                    _, _, node = max((b for b in blocks if b[0] >= MAIN_TEXT_SHARE * best), key=lambda b: b[1])
+                    t = self.node_text(node)
+            if len(t) <= min_len:
+                t = self.text
+            cache[min_len] = _SPACE_RE.sub(" ", t).strip()
+        return cache[min_len]
+
+    @cached_property
+    def address_candidates(self) -> List[str]:
+        """Street addresses found in og:title, twitter:title and <title>, in that order."""
+        out: List[str] = []
+        for t in [self.meta.get(k, "") for k in TITLE_METAS] + [self.title]:
+            m = STREET_ADDRESS_RE.search(t or "")
+            if m and m.group(0) not in out:
+                out.append(m.group(0))
+        return out
+
+    def address(self, default: str = "") -> str:
+        """Best street address, else `default`, else the display title."""
+        return (self.address_candidates[0] if self.address_candidates else "") or default or self.display_title
+
+    @cached_property
+    def links(self) -> List[str]:
+        """href of every <a href>, in document order."""
+        return [self._attrs(a).get("href") for a in self.select("a[href]") if self._attrs(a).get("href")]
@@ -0,0 +1,146 @@
+# app/scraper/payload_capture.py
+"""
+Selective network payload capture for results-page harvests.
+
+Only responses from the sites' real search / GraphQL endpoints with a JSON-ish
+content type and a sane size are pulled into Python; JS bundles and everything
+else are ignored without reading the body. Bodies are read in background tasks
+so the response callback never blocks, and snapshot files are written by a
+bounded background writer thread.
+"""
+import asyncio
+import queue
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern
+
+from app.utils.logger import logger
+
+MIN_PAYLOAD_CHARS = 400
+MAX_PAYLOAD_BYTES = 5_000_000
+SNAPSHOT_CHARS = 200_000
+WRITER_QUEUE_SIZE = 64
+
+PAYLOAD_ENDPOINTS: Dict[str, List[Pattern]] = {
+    "redfin": [
+        re.compile(r"/stingray/api/gis(?:-csv)?\b"),
+        re.compile(r"/stingray/api/v\d+/search"),
+        re.compile(r"/stingray/do/gis-search"),
+    ],
+    "realtor": [
+        re.compile(r"/api/v1/hulk(?:_main_srp)?\b"),
+        re.compile(r"/frontdoor/graphql"),
+        re.compile(r"/api/v1/rdc_search"),
+    ],
+    "zillow": [
+        re.compile(r"/search/getsearchpagestate\.htm"),
+        re.compile(r"/async-create-search-page-state"),
+        re.compile(r"/zg-graph|/graphql"),
+    ],
+}
+
+# Several of these endpoints answer with text/plain; bundles (javascript) never qualify.
+PAYLOAD_CONTENT_TYPES = ("application/json", "+json", "text/plain")
+
+
+class SnapshotWriter:
+    """Bounded background writer; drops snapshots rather than stalling the browser."""
+
+    def __init__(self, maxsize: int = WRITER_QUEUE_SIZE):
+        self._q: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, text: str) -> None:
+        try:
+            self._q.put_nowait((path, text))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        self._q.join()
+
+    def _run(self) -> None:
+        while True:
+            path, text = self._q.get()
+            try:
+                path.write_text(text, encoding="utf-8", errors="ignore")
+            except Exception:
+                pass
+            finally:
+                self._q.task_done()
+
+
+_writer: Optional[SnapshotWriter] = None
+
+
+def snapshot_writer() -> SnapshotWriter:
+    global _writer
+    if _writer is None:
+        _writer = SnapshotWriter()
+    return _writer
+
+
+class PayloadCapture:
+    def __init__(self, site: str, snapshot_dir: Optional[Path] = None,
+                 max_bytes: int = MAX_PAYLOAD_BYTES):
+        self.site = site
+        self.snapshot_dir = snapshot_dir
+        self.max_bytes = max_bytes
+        self.endpoints = PAYLOAD_ENDPOINTS.get(site, [])
+        self.texts: List[str] = []
+        self.stats = {"seen": 0, "captured": 0, "skipped_type": 0, "skipped_size": 0}
+        self._pending: List[asyncio.Task] = []
+
+    def wants(self, url: str, content_type: str, content_length: Optional[int]) -> bool:
+        """Cheap header-only check: right endpoint, right content type, not oversized."""
+        url_l = url.lower()
+        if not any(p.search(url_l) for p in self.endpoints):
+            return False
+        ct = (content_type or "").lower()
+        if not any(t in ct for t in PAYLOAD_CONTENT_TYPES):
+            self.stats["skipped_type"] += 1
+            return False
+        if content_length is not None and content_length > self.max_bytes:
+            self.stats["skipped_size"] += 1
+            return False
+        return True
+
+    def on_response(self, resp) -> None:
+        """Playwright 'response' listener; schedules the body read and returns immediately."""
+        self.stats["seen"] += 1
+        try:
+            headers = resp.headers or {}
+            length = headers.get("content-length")
+            if self.wants(resp.url, headers.get("content-type", ""), int(length) if length and length.isdigit() else None):
+                self._pending.append(asyncio.ensure_future(self._grab(resp)))
+        except Exception:
+            pass
+
+    async def _grab(self, resp) -> None:
+        try:
+            body = await resp.body()
+        except Exception:
+            return
+        if len(body) > self.max_bytes:
+            self.stats["skipped_size"] += 1
+            return
+        txt = body.decode("utf-8", errors="ignore")
+        if len(txt) < MIN_PAYLOAD_CHARS:
+            return
+        self.texts.append(txt)
+        self.stats["captured"] += 1
+        if self.snapshot_dir is not None:
+            path = self.snapshot_dir / f"{self.site}_{int(time.time() * 1000)}_{len(self.texts)}.json"
+            snapshot_writer().submit(path, txt[:SNAPSHOT_CHARS])
+
+    async def drain(self, timeout: float = 5.0) -> List[str]:
+        """Wait (bounded) for in-flight body reads, then return everything captured."""
+        pending = [t for t in self._pending if not t.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        logger.debug("[capture] %s %s", self.site, self.stats)
+        return list(self.texts)
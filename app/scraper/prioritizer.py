@@ -0,0 +1,122 @@
+# app/scraper/prioritizer.py
+"""
+Orders harvested listings by teardown potential using search-card data only,
+so a capped or time-boxed run spends its detail fetches on the best leads
+first.
+
+Each signal is scaled to 0..1 and weighted (WEIGHTS):
+  lot_per_dollar  lot sqft per dollar, as a percentile within the batch
+  below_median    asking price against the median of its zip code
+                  (the whole batch when the zip has too few priced cards)
+  age             older homes score higher (NEW_YEAR and newer -> 0, OLD_YEAR and older -> 1)
+  remarks         teardown / builder keywords in the card's remarks
+  days_on_market  longer on the market -> more room to negotiate (STALE_DAYS -> 1)
+A signal a card doesn't carry counts as NEUTRAL, so a thin card neither
+jumps the queue nor sinks to the end.
+"""
+import re
+from statistics import median
+from typing import Dict, List, Optional
+
+from app.utils.logger import logger
+
+WEIGHTS = {
+    "lot_per_dollar": 0.35,
+    "below_median": 0.25,
+    "age": 0.15,
+    "remarks": 0.15,
+    "days_on_market": 0.10,
+}
+NEUTRAL = 0.5
+OLD_YEAR, NEW_YEAR = 1920, 2000
+STALE_DAYS = 120
+MIN_ZIP_CARDS = 3  # priced cards a zip needs for its own median
+
+REMARKS_RE = re.compile(
+    r"tear[\s-]?down|\bbuilder\b|contractor[s]?\s+special|development\s+opportunit(?:y|ies)|\bdeveloper[s]?\b"
+    r"|fixer[\s-]?upper|\bas[-\s]?is\b|subdivid|zoned\s+multi|corner\s+lot|\bbuild\s+your\b|\bland\s+value\b",
+    re.I,
+)
+ZIP_RE = re.compile(r"(?:MA[-_ ]|-)(0[12]\d{3})(?!\d)")  # MA zips, in detail-URL slugs or "Newton, MA 02460"
+
+
+def _clamp(x: float) -> float:
+    return min(1.0, max(0.0, x))
+
+
+def _positive(v) -> Optional[float]:
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return None
+    return v if v > 0 else None
+
+
+def _zip(url: str, card: dict) -> Optional[str]:
+    m = ZIP_RE.search(url) or ZIP_RE.search(str(card.get("address") or ""))
+    return m.group(1) if m else None
+
+
+def _percentiles(values: Dict[str, float]) -> Dict[str, float]:
+    """0..1 rank of each value among the others (ties share the lower rank)."""
+    ordered = sorted(values.values())
+    if len(ordered) < 2:
+        return {k: NEUTRAL for k in values}
+    pos = {}
+    for i, v in enumerate(ordered):
+        pos.setdefault(v, i)
+    return {k: pos[v] / (len(ordered) - 1) for k, v in values.items()}
+
+
+def signals(cards: Dict[str, dict]) -> Dict[str, Dict[str, float]]:
+    """url -> {signal: 0..1} for every card (see module docstring)."""
+    prices = {u: _positive(c.get("price")) for u, c in cards.items()}
+    lot_per_dollar = _percentiles({
+        u: lot / prices[u] for u, c in cards.items()
+        if prices[u] and (lot := _positive(c.get("lot_sqft")))
+    })
+    zips = {u: _zip(u, c) for u, c in cards.items()}
+    by_zip: Dict[Optional[str], List[float]] = {}
+    for u, p in prices.items():
+        if p:
+            by_zip.setdefault(zips[u], []).append(p)
+    overall = median([p for p in prices.values() if p]) if any(prices.values()) else None
+
+    out = {}
+    for u, c in cards.items():
+        s = dict.fromkeys(WEIGHTS, NEUTRAL)
+        s["lot_per_dollar"] = lot_per_dollar.get(u, NEUTRAL)
+        local = by_zip.get(zips[u], [])
+        ref = median(local) if len(local) >= MIN_ZIP_CARDS else overall
+        if prices[u] and ref:
+            s["below_median"] = _clamp(0.5 + 2 * (1 - prices[u] / ref))  # 25% under the median -> 1
+        year = _positive(c.get("year_built"))
+        if year:
+            s["age"] = _clamp((NEW_YEAR - year) / (NEW_YEAR - OLD_YEAR))
+        if c.get("remarks"):
+            hits = {m.group(0).lower() for m in REMARKS_RE.finditer(str(c["remarks"]))}
+            s["remarks"] = _clamp(len(hits) / 2)
+        days = c.get("days_on_market")
+        if isinstance(days, (int, float)) and days >= 0:
+            s["days_on_market"] = _clamp(days / STALE_DAYS)
+        out[u] = s
+    return out
+
+
+def score(sig: Dict[str, float]) -> float:
+    return sum(WEIGHTS[k] * v for k, v in sig.items())
+
+
+def rank(site: str, urls: List[str], cards: Dict[str, dict]) -> List[str]:
+    """
+    `urls` best lead first. Medians and percentiles come from every card in
+    `cards`; URLs without a card score as all-NEUTRAL. Stable for equal scores.
+    """
+    sig = signals({u: c for u, c in cards.items() if c})
+    neutral = score(dict.fromkeys(WEIGHTS, NEUTRAL))
+    scores = {u: score(sig[u]) if u in sig else neutral for u in urls}
+    ordered = sorted(urls, key=lambda u: -scores[u])
+    if ordered:
+        logger.debug("[prioritizer] %s: %d candidates, top %s (%.2f)", site, len(ordered), ordered[0],
+                     scores[ordered[0]])
+    return ordered
@@ -0,0 +1,200 @@
+# app/scraper/rate_limiter.py
+"""
+Adaptive per-host token-bucket limiter.
+
+Each host has a budget (starting rate, floor, ceiling, burst). Healthy fast
+responses nudge the rate up additively; slow responses shave it down and
+429/503 halve it and pause the host (honouring Retry-After). Callers reserve a
+slot with acquire()/acquire_async() instead of sleeping for a fixed delay.
+RetryPolicy is the shared retry/backoff used around browser navigations; every
+attempt goes through the limiter and failures feed back into it.
+"""
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+
+@dataclass
+class HostBudget:
+    rate: float = 1.0            # starting requests / second
+    min_rate: float = 0.2
+    max_rate: float = 4.0        # politeness ceiling for the host
+    burst: int = 2
+    target_latency: float = 2.5  # seconds; slower responses count as pressure
+
+
+DEFAULT_BUDGET = HostBudget()
+
+HOST_BUDGETS: Dict[str, HostBudget] = {
+    "www.redfin.com": HostBudget(rate=1.0, max_rate=3.0),
+    "www.realtor.com": HostBudget(rate=1.0, max_rate=3.0),
+    "www.zillow.com": HostBudget(rate=0.5, max_rate=1.5, burst=1),
+    # Nominatim usage policy: at most one request per second.
+    "nominatim.openstreetmap.org": HostBudget(rate=1.0, min_rate=0.2, max_rate=1.0, burst=1),
+}
+
+INCREASE_STEP = 0.1     # req/s added per healthy response
+SLOW_FACTOR = 0.8
+THROTTLE_FACTOR = 0.5
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _parse_overrides(spec: str) -> Dict[str, float]:
+    """Parse RATE_LIMITS like 'www.redfin.com=2,www.zillow.com=0.5' (max req/s per host)."""
+    out: Dict[str, float] = {}
+    for part in (spec or "").split(","):
+        host, _, value = part.strip().partition("=")
+        try:
+            out[host.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return out
+
+
+class _Bucket:
+    def __init__(self, budget: HostBudget):
+        self.budget = budget
+        self.rate = budget.rate
+        self.tokens = float(budget.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, budgets: Optional[Dict[str, HostBudget]] = None,
+                 default: HostBudget = DEFAULT_BUDGET):
+        self.budgets = dict(HOST_BUDGETS if budgets is None else budgets)
+        self.default = default
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, budget: HostBudget) -> None:
+        with self._lock:
+            self.budgets[host] = budget
+            self._buckets.pop(host, None)
+
+    def _bucket(self, host: str) -> _Bucket:
+        b = self._buckets.get(host)
+        if b is None:
+            b = self._buckets[host] = _Bucket(self.budgets.get(host, self.default))
+        return b
+
+    def _reserve(self, host: str) -> float:
+        """Take one token (possibly borrowing against the future); return seconds to wait."""
+        with self._lock:
+            b = self._bucket(host)
+            now = time.monotonic()
+            b.tokens = min(b.budget.burst, b.tokens + (now - b.updated) * b.rate)
+            b.updated = now
+            b.tokens -= 1.0
+            wait = 0.0 if b.tokens >= 0 else -b.tokens / b.rate
+            return max(wait, b.paused_until - now)
+
+    def acquire(self, host: str) -> None:
+        wait = self._reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, host: str) -> None:
+        wait = self._reserve(host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, host: str, status: int, latency: float,
+               retry_after: Optional[float] = None) -> None:
+        """Feed back one response (status 0 = network error) to adapt the host rate."""
+        with self._lock:
+            b = self._bucket(host)
+            lo, hi = b.budget.min_rate, b.budget.max_rate
+            if status in (429, 503):
+                b.rate = max(lo, b.rate * THROTTLE_FACTOR)
+                b.paused_until = time.monotonic() + (retry_after if retry_after else 1.0 / b.rate)
+                b.tokens = min(b.tokens, 0.0)
+                logger.info("[limiter] %s throttled (%s); rate -> %.2f/s", host, status, b.rate)
+            elif status == 0 or status >= 500 or latency > b.budget.target_latency:
+                b.rate = max(lo, b.rate * SLOW_FACTOR)
+            elif status < 400:
+                b.rate = min(hi, b.rate + INCREASE_STEP)
+
+    def rate(self, host: str) -> float:
+        with self._lock:
+            return self._bucket(host).rate
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {h: round(b.rate, 3) for h, b in self._buckets.items()}
+
+
+def _default_budgets() -> Dict[str, HostBudget]:
+    budgets = dict(HOST_BUDGETS)
+    for host, max_rate in _parse_overrides(SETTINGS.rate_limits).items():
+        base = budgets.get(host, DEFAULT_BUDGET)
+        budgets[host] = replace(base, max_rate=max_rate, rate=min(base.rate, max_rate),
+                                min_rate=min(base.min_rate, max_rate))
+    return budgets
+
+
+# Process-wide limiter shared by the HTTP client, browser harvests and geocoding.
+limiter = AdaptiveRateLimiter(_default_budgets())
+
+
+class BlockedResponse(RuntimeError):
+    """Raised from a retried call when the site answered with a block/throttle status (403/429/503)."""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 2.0     # seconds before the first retry; doubles per attempt
+    max_delay: float = 20.0
+    jitter: float = 0.25        # +/- fraction, so concurrent tabs don't retry in lockstep
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def run_async(self, fn: Callable[[], Awaitable[Any]], host: str, label: str = "",
+                        deadline=None) -> Any:
+        """
+        Await fn() up to `attempts` times, pacing each try through the host limiter.
+        A failure carrying .status (BlockedResponse) is fed to the limiter as that
+        status, so 429/503 throttle the host; any other failure counts as 0.
+        With a Deadline, no retry is started that could not finish inside it.
+        """
+        for attempt in range(1, self.attempts + 1):
+            await limiter.acquire_async(host)
+            started = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as e:
+                limiter.record(host, getattr(e, "status", 0), time.monotonic() - started,
+                               retry_after=getattr(e, "retry_after", None))
+                if attempt == self.attempts:
+                    raise
+                delay = self.backoff(attempt)
+                if deadline is not None and not deadline.allows(f"retry {attempt + 1}", delay + 1.0):
+                    raise
+                logger.info("[retry] %s attempt %d failed (%s); retrying in %.1fs", label or host, attempt, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            limiter.record(host, getattr(result, "status", None) or 200, time.monotonic() - started)
+            return result
+
+
+# Shared by every concurrent browser tab
+BROWSER_RETRY = RetryPolicy()
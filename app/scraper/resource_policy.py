@@ -0,0 +1,128 @@
+# app/scraper/resource_policy.py
+"""
+Per-site request interception for the Playwright contexts.
+
+Listing harvests only need the document, scripts and the search/GraphQL
+payloads. Images, fonts, video, map tiles and analytics beacons are aborted
+before they load; BlockStats keeps a running count of what was skipped.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+TRACKER_HOSTS: Tuple[str, ...] = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "facebook.com/tr", "hotjar.com", "segment.io",
+    "segment.com", "nr-data.net", "newrelic.com", "optimizely.com", "bat.bing.com",
+    "clarity.ms", "adsrvr.org", "quantserve.com", "scorecardresearch.com", "taboola.com",
+    "criteo.com", "amazon-adsystem.com", "branch.io", "tiktok.com", "pinimg.com",
+)
+
+MAP_TILE_HOSTS: Tuple[str, ...] = (
+    "maps.googleapis.com/maps/vt", "maps.gstatic.com", "khms", "api.mapbox.com",
+    "tiles.mapbox.com", "tile.openstreetmap.org", "arcgisonline.com",
+)
+
+# Rough average transfer sizes used to estimate what an aborted request would have cost.
+AVG_BYTES = {
+    "image": 60_000, "media": 600_000, "font": 40_000, "stylesheet": 30_000,
+    "script": 45_000, "tile": 25_000, "other": 4_000,
+}
+
+
+@dataclass(frozen=True)
+class RoutePolicy:
+    blocked_types: FrozenSet[str] = frozenset({"image", "media", "font"})
+    blocked_hosts: Tuple[str, ...] = TRACKER_HOSTS + MAP_TILE_HOSTS
+    never_block: Tuple[str, ...] = ()   # URL substrings that must always load
+
+    def block_reason(self, resource_type: str, url: str) -> Optional[str]:
+        """Return why a request should be aborted, or None to let it through."""
+        url_l = url.lower()
+        if any(k in url_l for k in self.never_block):
+            return None
+        if resource_type in self.blocked_types:
+            return resource_type
+        target = urlsplit(url_l)
+        host_path = target.netloc + target.path
+        for h in self.blocked_hosts:
+            if h in host_path:
+                return "tile" if h in MAP_TILE_HOSTS else "tracker"
+        return None
+
+
+SITE_POLICIES: Dict[str, RoutePolicy] = {
+    # Redfin/Realtor harvests read anchors and payloads only, so CSS can go too.
+    "redfin": RoutePolicy(blocked_types=frozenset({"image", "media", "font", "stylesheet"}),
+                          never_block=("/stingray/api/",)),
+    "realtor": RoutePolicy(blocked_types=frozenset({"image", "media", "font", "stylesheet"})),
+    # Zillow detail extraction checks element visibility, which needs layout CSS.
+    "zillow": RoutePolicy(never_block=("getsearchpagestate", "/graphql")),
+}
+
+
+@dataclass
+class BlockStats:
+    allowed: int = 0
+    blocked: int = 0
+    est_bytes_saved: int = 0
+    by_reason: Dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, reason: Optional[str], resource_type: str) -> None:
+        with self._lock:
+            if reason is None:
+                self.allowed += 1
+                return
+            self.blocked += 1
+            self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+            key = reason if reason in AVG_BYTES else (resource_type if resource_type in AVG_BYTES else "other")
+            self.est_bytes_saved += AVG_BYTES[key]
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {"allowed": self.allowed, "blocked": self.blocked,
+                    "est_mb_saved": round(self.est_bytes_saved / 1_000_000, 1),
+                    "by_reason": dict(self.by_reason)}
+
+
+STATS: Dict[str, BlockStats] = {}
+
+
+def stats_for(site: str) -> BlockStats:
+    if site not in STATS:
+        STATS[site] = BlockStats()
+    return STATS[site]
+
+
+async def install(context, site: str) -> None:
+    """Attach the site's policy to a Playwright (async) BrowserContext."""
+    if not SETTINGS.block_resources:
+        return
+    policy = SITE_POLICIES.get(site, RoutePolicy())
+    stats = stats_for(site)
+
+    async def _route(route):
+        req = route.request
+        reason = policy.block_reason(req.resource_type, req.url)
+        stats.record(reason, req.resource_type)
+        try:
+            if reason:
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+
+    await context.route("**/*", _route)
+
+
+def log_summary() -> None:
+    for site, stats in STATS.items():
+        s = stats.summary()
+        logger.info("[browser] %s: blocked %d / %d requests (~%.1f MB saved) %s",
+                    site, s["blocked"], s["blocked"] + s["allowed"], s["est_mb_saved"], s["by_reason"])
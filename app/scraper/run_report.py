@@ -0,0 +1,51 @@
+# app/scraper/run_report.py
+"""
+Per-run report for the scrapers.
+
+Scraper code appends entries to named sections (e.g. "deadline_hits") while a
+pipeline run is in progress; dev_pipeline resets the report at the start of a
+run and writes it out as JSON at the end.
+"""
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.utils.logger import logger
+
+
+class RunReport:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = datetime.now().isoformat(timespec="seconds")
+            self.sections: Dict[str, List[Dict[str, Any]]] = {}
+
+    def add(self, section: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.sections.setdefault(section, []).append(entry)
+
+    def entries(self, section: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.sections.get(section, []))
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"started_at": self.started_at,
+                    "finished_at": datetime.now().isoformat(timespec="seconds"),
+                    **{k: list(v) for k, v in self.sections.items()}}
+
+    def write(self, path: str) -> None:
+        data = self.to_dict()
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        counts = {k: len(v) for k, v in data.items() if isinstance(v, list)}
+        logger.info("Run report written to %s %s", out, counts)
+
+
+REPORT = RunReport()
@@ -0,0 +1,164 @@
+# app/scraper/seen_index.py
+"""
+Persistent cross-run index of listings already seen, keyed by canonical
+listing ID (url_filters.listing_id), so a home reached through another slug
+or query string is still the same home.
+
+SQLite keeps one row per listing with its first- and last-seen timestamps;
+the whole index is also held in a dict at open, so "new or known?" is a
+constant-time lookup for every stage. A few thousand listings per town keep
+it well under a megabyte.
+
+Delta crawl: each detail fetch also stores the search card's fingerprint
+(card_extractor.card_fingerprint) and the resulting row. delta() then
+reuses the stored row for a listing whose card is unchanged, so only new or
+changed listings cost a detail request. A listing whose last fetch is older
+than FULL_REFRESH_DAYS is fetched again anyway; last fetches differ per
+listing, so this full refresh is spread over runs.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.scraper.card_extractor import card_fingerprint
+from app.scraper.url_filters import listing_id
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+
+class SeenIndex:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                listing_id TEXT PRIMARY KEY,
+                url        TEXT,
+                first_seen REAL,
+                last_seen  REAL,
+                fingerprint TEXT,
+                fetched_at REAL,
+                row        TEXT
+            )
+        """)
+        columns = {c[1] for c in self._db.execute("PRAGMA table_info(listings)")}
+        for column, kind in (("fingerprint", "TEXT"), ("fetched_at", "REAL"), ("row", "TEXT")):
+            if column not in columns:  # index written before delta crawl
+                self._db.execute(f"ALTER TABLE listings ADD COLUMN {column} {kind}")
+        self._db.commit()
+        # listing_id -> (first_seen, last_seen); listing_id -> (card fingerprint, fetched_at) of the last detail fetch
+        self._seen: Dict[str, Tuple[float, float]] = {}
+        self._fetched: Dict[str, Tuple[str, float]] = {}
+        for key, first, last, fingerprint, fetched_at in self._db.execute(
+                "SELECT listing_id, first_seen, last_seen, fingerprint, fetched_at FROM listings"):
+            self._seen[key] = (first, last)
+            if fingerprint and fetched_at is not None:
+                self._fetched[key] = (fingerprint, fetched_at)
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._seen
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """(first_seen, last_seen) for a listing ID, or None if never seen."""
+        return self._seen.get(key)
+
+    def is_new(self, site: str, url: str) -> bool:
+        return listing_id(site, url) not in self._seen
+
+    def mark(self, site: str, urls: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Record the listings as seen now; returns the URLs seen for the first time."""
+        now = time.time() if now is None else now
+        new, rows = [], []
+        with self._lock:
+            for url in urls:
+                key = listing_id(site, url)
+                if key is None:
+                    continue
+                if key not in self._seen:
+                    new.append(url)
+                first = self._seen.get(key, (now, now))[0]
+                self._seen[key] = (first, now)
+                rows.append((key, url, first, now))
+            self._db.executemany(
+                "INSERT INTO listings (listing_id, url, first_seen, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(listing_id) DO UPDATE SET url = excluded.url, last_seen = excluded.last_seen",
+                rows,
+            )
+            self._db.commit()
+        return new
+
+    def record_fetch(self, site: str, url: str, card: Optional[dict], row: dict,
+                     now: Optional[float] = None) -> None:
+        """Remember the card a detail fetch was made for and the row it produced."""
+        key, fingerprint = listing_id(site, url), card_fingerprint(card)
+        if key is None or fingerprint is None:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            first, last = self._seen.get(key, (now, now))
+            self._seen[key] = (first, last)
+            self._fetched[key] = (fingerprint, now)
+            self._db.execute(
+                "INSERT INTO listings (listing_id, url, first_seen, last_seen, fingerprint, fetched_at, row) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(listing_id) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "fetched_at = excluded.fetched_at, row = excluded.row",
+                (key, url, first, last, fingerprint, now, json.dumps(row, default=str)),
+            )
+            self._db.commit()
+
+    def delta(self, site: str, urls: Iterable[str], cards: Dict[str, dict],
+              now: Optional[float] = None) -> Tuple[List[str], List[dict]]:
+        """
+        Split detail URLs into (still to fetch, stored rows reused): a row is
+        reused while the listing's card fingerprint matches the one it was
+        fetched for and that fetch is younger than FULL_REFRESH_DAYS.
+        """
+        urls = list(urls)
+        if not SETTINGS.delta_crawl:
+            return urls, []
+        now = time.time() if now is None else now
+        max_age = SETTINGS.full_refresh_days * 86400
+        fetch, reuse = [], {}
+        for url in urls:
+            key = listing_id(site, url)
+            last = self._fetched.get(key)
+            if last and last[0] == card_fingerprint(cards.get(url)) and now - last[1] < max_age:
+                reuse[key] = url
+            else:
+                fetch.append(url)
+        rows = []
+        if reuse:
+            with self._lock:
+                marks = ",".join("?" * len(reuse))
+                stored = dict(self._db.execute(
+                    f"SELECT listing_id, row FROM listings WHERE listing_id IN ({marks})", list(reuse)))
+            for key, url in reuse.items():
+                if stored.get(key):
+                    rows.append(json.loads(stored[key]))
+                else:
+                    fetch.append(url)
+        return fetch, rows
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_index: Optional[SeenIndex] = None
+
+
+def get_index() -> SeenIndex:
+    """Process-wide seen index at SETTINGS.seen_index_path, opened on first use."""
+    global _index
+    if _index is None:
+        _index = SeenIndex(SETTINGS.seen_index_path)
+        logger.debug("[seen] %d known listings in %s", len(_index), SETTINGS.seen_index_path)
+    return _index
@@ -0,0 +1,99 @@
+# app/scraper/strategy_stats.py
+"""
+Self-tuning order for extraction strategies.
+
+Extractors that try several strategies per field (regexes, embedded JSON
+sources) ask order() which to try first and report each attempt with
+record(). Strategies are grouped into tiers by reliability (embedded JSON
+before labelled markup before loose text); within a tier the historically
+best hit rate goes first, so a markup change re-sorts itself without code
+edits. Strategies that have only ever missed are dropped from the order, and
+every EXPLORE_EVERY-th call per site/field tries everything in the declared
+order so a dropped strategy can come back. Stats persist as JSON between runs.
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+EXPLORE_EVERY = 20   # calls per site/field between full declared-order passes
+MIN_TRIALS = 25      # attempts before a never-hitting strategy is dropped
+
+
+class StrategyStats:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._calls: Dict[str, int] = {}
+        self._delta: Dict[str, Dict[str, List[int]]] = {}  # records since the last drain()
+        self.stats: Dict[str, Dict[str, List[int]]] = self._load()  # "site|field" -> name -> [hits, tries]
+
+    def _load(self) -> Dict:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("[strategies] could not read %s; starting fresh", self.path)
+        return {}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.stats, indent=1), encoding="utf-8")
+            self._dirty = False
+
+    def _score(self, hits: int, tries: int) -> float:
+        return (hits + 1) / (tries + 2)   # Laplace prior: untried strategies start at 0.5
+
+    def order(self, site: str, field: str, tiers: Sequence[Sequence[str]]) -> List[str]:
+        """Strategy names to try, tier by tier, best hit rate first within each tier."""
+        key = f"{site}|{field}"
+        with self._lock:
+            calls = self._calls[key] = self._calls.get(key, 0) + 1
+            if calls % EXPLORE_EVERY == 0:
+                return [name for tier in tiers for name in tier]
+            table = self.stats.get(key, {})
+            out = []
+            for tier in tiers:
+                ranked = []
+                for idx, name in enumerate(tier):
+                    hits, tries = table.get(name, (0, 0))
+                    if tries >= MIN_TRIALS and hits == 0:
+                        continue
+                    ranked.append((-self._score(hits, tries), idx, name))
+                out.extend(name for _, _, name in sorted(ranked))
+            return out
+
+    def record(self, site: str, field: str, name: str, hit: bool) -> None:
+        with self._lock:
+            for table in (self.stats, self._delta):
+                entry = table.setdefault(f"{site}|{field}", {}).setdefault(name, [0, 0])
+                entry[0] += int(hit)
+                entry[1] += 1
+            self._dirty = True
+
+    def drain(self) -> Dict[str, Dict[str, List[int]]]:
+        """Records made since the last drain (parser worker processes ship these back)."""
+        with self._lock:
+            delta, self._delta = self._delta, {}
+            return delta
+
+    def merge(self, delta: Dict[str, Dict[str, List[int]]]) -> None:
+        """Add another process's drained records to these stats."""
+        with self._lock:
+            for key, names in delta.items():
+                for name, (hits, tries) in names.items():
+                    entry = self.stats.setdefault(key, {}).setdefault(name, [0, 0])
+                    entry[0] += hits
+                    entry[1] += tries
+                    self._dirty = True
+
+
+STATS = StrategyStats(SETTINGS.strategy_stats_path)
+
@@ -0,0 +1,221 @@
+# app/scraper/tiered_fetch.py
+"""
+Tiered page fetching: plain HTTP first, the pooled browser only when needed.
+
+Each URL is tried with a cheap GET through the shared http_client. If the
+response is a block/captcha page or lacks the structured data the extractor
+needs, it is escalated to a headless page from the browser pool. The tier that
+last worked is remembered per site and URL pattern (persisted as JSON), so
+patterns that always need a browser skip the doomed GET, with an occasional
+re-probe in case plain HTTP starts working again.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from app.scraper import fetch_archive
+from app.scraper._event_loop import run_sync
+from app.scraper.http_client import FetchResult, afetch_many, aiter_fetch, looks_blocked
+from app.scraper.rate_limiter import BROWSER_RETRY, host_of
+from app.utils.config_loader import SETTINGS
+from app.utils.logger import logger
+
+HTTP, BROWSER = "http", "browser"
+
+MAX_BROWSER_PAGES = 3
+BROWSER_NAV_TIMEOUT_MS = 30000
+REPROBE_EVERY = 10   # browser-tier URLs of a pattern between plain-HTTP re-probes
+
+# Structured data the site extractors read; a page without it needs the browser.
+DATA_MARKERS: Dict[str, Pattern] = {
+    "redfin": re.compile(r'"propertyId"\s*:|application/ld\+json|"listingPrice"'),
+    "realtor": re.compile(r'"list_price"\s*:|"property_id"\s*:'),
+    "zillow": re.compile(r'gdpClientCache|"zpid"\s*:\s*"?\d'),
+}
+
+_SEGMENT_ID = re.compile(r"\d")
+
+
+def url_pattern(url: str) -> str:
+    """Collapse listing-specific path segments: /homedetails/12-Elm-St/111_zpid/ -> /homedetails/*/*/"""
+    parts = urlsplit(url)
+    path = "/".join("*" if _SEGMENT_ID.search(seg) else seg for seg in parts.path.split("/"))
+    return parts.netloc.lower() + path
+
+
+def has_data(site: str, html: str) -> bool:
+    marker = DATA_MARKERS.get(site)
+    return bool(html) and (marker is None or marker.search(html) is not None)
+
+
+class TierMemory:
+    """Which tier last worked, per site + URL pattern."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.tiers = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self.path.exists():
+            try:
+                return json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                logger.warning("[tiers] could not read %s; starting fresh", self.path)
+        return {}
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.tiers, indent=2), encoding="utf-8")
+            self._dirty = False
+
+    def choose(self, site: str, url: str) -> str:
+        key = f"{site}|{url_pattern(url)}"
+        with self._lock:
+            rec = self.tiers.get(key)
+            if rec is None or rec["tier"] == HTTP:
+                return HTTP
+            rec["since_probe"] = rec.get("since_probe", 0) + 1
+            self._dirty = True
+            if rec["since_probe"] >= REPROBE_EVERY:
+                rec["since_probe"] = 0
+                return HTTP
+            return BROWSER
+
+    def record(self, site: str, url: str, tier: str) -> None:
+        key = f"{site}|{url_pattern(url)}"
+        with self._lock:
+            rec = self.tiers.get(key)
+            if rec is None or rec["tier"] != tier:
+                self.tiers[key] = {"tier": tier, "since_probe": 0}
+                self._dirty = True
+
+
+MEMORY = TierMemory(SETTINGS.fetch_tiers_path)
+
+
+def plan(site: str, urls: List[str]) -> Tuple[List[str], List[str]]:
+    """Split URLs into (try plain HTTP first, go straight to the browser)."""
+    http_urls, browser_urls = [], []
+    for u in urls:
+        (browser_urls if MEMORY.choose(site, u) == BROWSER else http_urls).append(u)
+    return http_urls, browser_urls
+
+
+async def atry_http(site: str, urls: List[str],
+                    check: Optional[Callable[[str], bool]] = None) -> Tuple[List[FetchResult], List[str]]:
+    """GET every URL; return (usable results, URLs that need escalating)."""
+    check = check or (lambda html: has_data(site, html))
+    usable, escalate = [], []
+    for res in (await afetch_many(urls) if urls else []):
+        if res.ok and not looks_blocked(res) and check(res.text):
+            MEMORY.record(site, res.url, HTTP)
+            usable.append(res)
+        else:
+            escalate.append(res.url)
+    return usable, escalate
+
+
+def try_http(site: str, urls: List[str],
+             check: Optional[Callable[[str], bool]] = None) -> Tuple[List[FetchResult], List[str]]:
+    return run_sync(atry_http(site, urls, check)) if urls else ([], [])
+
+
+async def _browser_fetch_many(site: str, urls: List[str]) -> List[FetchResult]:
+    from app.scraper.browser_pool import get_pool  # Playwright only loads when a page escalates
+
+    pool = await get_pool(headless=True)
+    gate = asyncio.Semaphore(MAX_BROWSER_PAGES)
+
+    async def _one(u: str) -> FetchResult:
+        async with gate:
+            started = time.monotonic()
+            try:
+                async with pool.page(site) as page:
+                    resp = await BROWSER_RETRY.run_async(
+                        lambda: page.goto(u, wait_until="domcontentloaded", timeout=BROWSER_NAV_TIMEOUT_MS),
+                        host=host_of(u), label=u)
+                    status = resp.status if resp else 200
+                    html = await page.content()
+            except Exception as e:
+                return FetchResult(url=u, error=f"browser: {e}", elapsed=time.monotonic() - started)
+            return FetchResult(url=u, status=status, text=html, elapsed=time.monotonic() - started)
+
+    return list(await asyncio.gather(*(_one(u) for u in urls)))
+
+
+async def afetch_browser(site: str, urls: List[str]) -> List[FetchResult]:
+    """Browser-tier fetch (rendered HTML); archived under 'browser' so replays skip the escalation."""
+    if not urls:
+        return []
+    if fetch_archive.replaying():
+        out = []
+        for u in urls:
+            rec = fetch_archive.active().get("browser", u)
+            out.append(FetchResult(url=u, status=rec["status"], text=rec["text"]) if rec
+                       else FetchResult(url=u, error="not in replay archive"))
+        return out
+    results = await _browser_fetch_many(site, urls)
+    if fetch_archive.recording():
+        for res in results:
+            if res.error is None:
+                fetch_archive.active().put("browser", res.url, {"status": res.status, "text": res.text})
+    return results
+
+
+def fetch_browser(site: str, urls: List[str]) -> List[FetchResult]:
+    return run_sync(afetch_browser(site, urls)) if urls else []
+
+
+async def aiter_pages(urls: List[str], site: str,
+                      check: Optional[Callable[[str], bool]] = None) -> AsyncIterator[FetchResult]:
+    """
+    Fetch detail pages at the cheapest tier that yields usable data, yielding each
+    result as soon as it is final: plain-HTTP pages as they arrive, escalated ones
+    after the browser batch. Failures carry .error like fetch_many.
+    """
+    check = check or (lambda html: has_data(site, html))
+
+    if fetch_archive.replaying():
+        # Replays follow the recording: pages it escalated are archived under 'browser'
+        browser_urls = [u for u in urls if fetch_archive.active().get("browser", u) is not None]
+        http_urls = [u for u in urls if u not in browser_urls]
+    else:
+        http_urls, browser_urls = plan(site, urls)
+
+    escalate = []
+    async for res in aiter_fetch(http_urls):
+        if res.ok and not looks_blocked(res) and check(res.text):
+            MEMORY.record(site, res.url, HTTP)
+            yield res
+        else:
+            escalate.append(res.url)
+    if escalate:
+        logger.info("[tiers] %s: %d/%d pages escalated to the browser", site, len(escalate), len(http_urls))
+
+    for res in await afetch_browser(site, browser_urls + escalate):
+        if res.ok and check(res.text):
+            MEMORY.record(site, res.url, BROWSER)
+        elif res.ok:
+            res.error = "no listing data after browser render"
+        yield res
+    MEMORY.save()
+
+
+def fetch_pages(urls: List[str], site: str,
+                check: Optional[Callable[[str], bool]] = None) -> List[FetchResult]:
+    """aiter_pages() collected; results come back in input order."""
+    async def _collect() -> List[FetchResult]:
+        return [res async for res in aiter_pages(urls, site, check)]
+
+    by_url: Dict[str, FetchResult] = {r.url: r for r in run_sync(_collect())} if urls else {}
+    return [by_url.get(u) or FetchResult(url=u, error="not fetched") for u in urls]
@@ -1,6 +1,7 @@
 # app/scraper/url_filters.py
 import re
-from typing import List
+from typing import List, Optional
+from urllib.parse import urlsplit
 
 # Redfin stays strict — detail pages look like /MA/Newton/.../home/<id>
 REDFIN_NEWTON  = re.compile(r"^https?://(?:www\.)?redfin\.com/MA/Newton/.+/home/\d+/?$", re.IGNORECASE)
@@ -19,6 +20,29 @@ ZILLOW_NEWTON = re.compile(
     re.IGNORECASE,
 )
 
+# Site-stable listing IDs inside detail URLs (slugs and query strings vary, these don't)
+LISTING_ID_RES = {
+    "zillow": re.compile(r"/(\d+)_zpid\b"),
+    "redfin": re.compile(r"/home/(\d+)\b"),
+    "realtor": re.compile(r"_M(\d{5}-\d{5}|\d{6,})\b"),
+}
+
+def listing_id(site: str, url: str) -> Optional[str]:
+    """
+    Canonical "site:id" for a detail URL: Zillow zpid, Redfin /home/<id>,
+    Realtor property id (_M<id>). Falls back to the URL without scheme, query,
+    fragment or trailing slash; None for an empty URL.
+    """
+    url = (url or "").strip()
+    if not url:
+        return None
+    pat = LISTING_ID_RES.get(site)
+    m = pat.search(url) if pat else None
+    if m:
+        return f"{site}:{m.group(1)}"
+    parts = urlsplit(url)
+    return f"{site}:{parts.netloc.lower().removeprefix('www.')}{parts.path.rstrip('/')}"
+
 def filter_newton_urls(site: str, urls: List[str]) -> List[str]:
     if site == "redfin":
         keep = [u for u in urls if REDFIN_NEWTON.match((u or "").strip())]
@@ -30,6 +54,7 @@ def filter_newton_urls(site: str, urls: List[str]) -> List[str]:
         keep = []
     seen, out = set(), []
     for u in keep:
-        if u not in seen:
-            out.append(u); seen.add(u)
+        key = listing_id(site, u)
+        if key not in seen:
+            out.append(u); seen.add(key)
     return out
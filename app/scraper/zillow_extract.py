@@ -0,0 +1,123 @@
+# app/scraper/zillow_extract.py
+"""
+Zillow detail-page extraction in a single round trip.
+
+EXTRACT_JS runs once via page.evaluate and returns every candidate at once:
+the embedded JSON property objects (__NEXT_DATA__ / gdpClientCache, Apollo or
+Redux state, HDPJS, JSON-LD), tagged by source and trimmed to the fields we map, plus the visible
+text of the selector groups the Zillow extractor declares (extractors.py).
+parse_candidates() then picks values in Python through that extractor, so a
+page costs one IPC call instead of dozens of locator/is_visible/inner_text
+calls. from_html() runs the same extractor over server-rendered HTML fetched
+without a browser.
+"""
+from typing import Any, Dict, Optional
+
+from app.scraper.extractors import (MAX_TEXTS_PER_GROUP, ZILLOW, ZILLOW_SOURCES, HtmlDocument,
+                                    PrefetchedDocument)
+
+# Top-level keys the JS side keeps from each JSON source
+JSON_KEYS = ZILLOW.json_keys
+
+EXTRACT_JS = r"""
+([keys, sel, maxTexts]) => {
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const texts = (selectors) => {
+        const out = [];
+        for (const s of selectors) {
+            let els;
+            try { els = document.querySelectorAll(s); } catch (e) { continue; }
+            for (const el of els) {
+                if (!visible(el)) continue;
+                const t = (el.innerText || el.textContent || '').trim();
+                if (t) out.push(t.slice(0, 2000));
+                if (out.length >= maxTexts) return out;
+            }
+        }
+        return out;
+    };
+    const pick = (o) => {
+        if (!o || typeof o !== 'object') return null;
+        const r = {};
+        for (const k of keys) {
+            if (o[k] === undefined || o[k] === null) continue;
+            r[k] = k === 'property' ? pick(o[k]) : o[k];
+        }
+        return r;
+    };
+
+    const json = [];
+    const add = (source, data) => { const d = pick(data); if (d) json.push({source, data: d}); };
+    try {
+        const nd = document.getElementById('__NEXT_DATA__');
+        if (nd) {
+            const props = JSON.parse(nd.textContent)?.props?.pageProps;
+            if (props?.data?.property) add('nextjs', props.data.property);
+            let cache = props?.componentProps?.gdpClientCache;
+            if (typeof cache === 'string') cache = JSON.parse(cache);
+            for (const v of Object.values(cache || {})) if (v && v.property) add('gdp_cache', v.property);
+        }
+    } catch (e) {}
+    try {
+        const st = window.__PRELOADED_STATE__;
+        if (st) {
+            const q = st.apollo?.ROOT_QUERY;
+            const entry = q && Object.entries(q).find(([k]) => k.includes('property('));
+            if (entry) add('apollo', entry[1]);
+            if (st.property) add('redux', st.property);
+        }
+    } catch (e) {}
+    try {
+        const h = window.HDPJS;
+        if (h && (h.property || h.data?.property)) add('hdpjs', h.property || h.data.property);
+    } catch (e) {}
+    for (const s of document.querySelectorAll('script[type="application/ld+json"]')) {
+        try {
+            const d = JSON.parse(s.textContent);
+            if (d['@type'] === 'SingleFamilyResidence' || d['@type'] === 'House') add('jsonld', d);
+        } catch (e) {}
+    }
+
+    const out = {json: json};
+    for (const [group, selectors] of Object.entries(sel)) out[group] = texts(selectors);
+    return out;
+}
+"""
+
+def _to_row(data: dict) -> dict:
+    """Registry row -> this module's shape: lot as "lot_size", missing fields dropped."""
+    data['lot_size'] = data.pop('lot_sqft', None)
+    return {k: v for k, v in data.items() if v is not None}
+
+
+def parse_candidates(raw: Optional[Dict[str, Any]]) -> dict:
+    """
+    Choose field values from EXTRACT_JS output through the Zillow extractor
+    registered in extractors: JSON sources first, then visible text.
+    """
+    raw = raw or {}
+    sources: Dict[str, Any] = {}
+    for entry in raw.get('json') or []:
+        if isinstance(entry, dict) and entry.get('source') in ZILLOW_SOURCES:
+            sources.setdefault(entry['source'], entry.get('data'))
+    texts = {group: raw.get(group) or [] for group in ZILLOW.text_groups}
+    return _to_row(ZILLOW.extract(PrefetchedDocument(sources, texts)))
+
+
+def _evaluate_args() -> list:
+    return [JSON_KEYS, ZILLOW.text_groups, MAX_TEXTS_PER_GROUP]
+
+
+async def extract(page) -> dict:
+    """One page.evaluate on an async Playwright page."""
+    return parse_candidates(await page.evaluate(EXTRACT_JS, _evaluate_args()))
+
+
+def extract_sync(page) -> dict:
+    """Same, for the sync Playwright API."""
+    return parse_candidates(page.evaluate(EXTRACT_JS, _evaluate_args()))
+
+
+def from_html(html: str) -> dict:
+    """Same extractor over server-rendered HTML (plain HTTP tier, no browser)."""
+    return _to_row(ZILLOW.extract(HtmlDocument(html, ZILLOW)))
@@ -1,8 +1,20 @@
-import re
-import json
+import asyncio
+from typing import Optional
+
 import pandas as pd
 import requests
-from playwright.sync_api import sync_playwright, TimeoutError
+from playwright.async_api import TimeoutError
+
+from app.scraper import browser_fetch, browser_service, fetch_archive, prioritizer, strategy_stats, tiered_fetch, zillow_extract, zillow_tiles
+from app.scraper._event_loop import run_sync
+from app.scraper.browser_pool import get_pool
+from app.scraper.card_extractor import fill_missing, missing_fields, partition
+from app.scraper.deadline import Deadline
+from app.scraper.frontier import Pager
+from app.scraper.rate_limiter import BROWSER_RETRY, BlockedResponse, host_of
+from app.scraper.seen_index import get_index
+from app.scraper.url_filters import filter_newton_urls, listing_id
+from app.utils.config_loader import SETTINGS
 
 DEFAULT_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -25,549 +37,195 @@ API_HEADERS = {
     'user-agent': DEFAULT_UA
 }
 
-CITY_PAGES = [
-    "https://www.zillow.com/newton-ma/",
-    "https://www.zillow.com/newton-ma/2_p/",
-    "https://www.zillow.com/newton-ma/3_p/",
-]
+SEARCH_URL = "https://www.zillow.com/newton-ma/"
 
-def _extract_json_data(page) -> dict:
-    """Extract property data from JSON/JavaScript on the page."""
-    try:
-        # Try multiple JavaScript data sources with more specific extraction
-        js_extractions = [
-            # NextJS Data
-            '''() => {
-                try {
-                    const nextData = document.getElementById('__NEXT_DATA__');
-                    if (nextData) {
-                        const data = JSON.parse(nextData.textContent);
-                        const props = data?.props?.pageProps;
-                        if (props?.data?.property) {
-                            return {
-                                property: props.data.property,
-                                source: 'nextjs'
-                            };
-                        }
-                    }
-                } catch (e) {}
-                return null;
-            }''',
-            # Apollo/Redux State
-            '''() => {
-                try {
-                    if (window.__PRELOADED_STATE__) {
-                        const state = window.__PRELOADED_STATE__;
-                        if (state.apollo?.ROOT_QUERY) {
-                            const entries = Object.entries(state.apollo.ROOT_QUERY);
-                            const propEntry = entries.find(([k]) => k.includes('property('));
-                            if (propEntry) return {
-                                property: propEntry[1],
-                                source: 'apollo'
-                            };
-                        }
-                        if (state.property) return {
-                            property: state.property,
-                            source: 'redux'
-                        };
-                    }
-                } catch (e) {}
-                return null;
-            }''',
-            # Zillow's HDPJS variable
-            '''() => {
-                try {
-                    if (window.HDPJS) {
-                        const hdp = window.HDPJS;
-                        if (hdp.property || hdp.data?.property) {
-                            return {
-                                property: hdp.property || hdp.data.property,
-                                source: 'hdpjs'
-                            };
-                        }
-                    }
-                } catch (e) {}
-                return null;
-            }''',
-            # Search for property data in rendered JSON scripts
-            '''() => {
-                try {
-                    const scripts = Array.from(document.querySelectorAll('script[type="application/ld+json"]'));
-                    for (const script of scripts) {
-                        try {
-                            const data = JSON.parse(script.textContent);
-                            if (data['@type'] === 'SingleFamilyResidence' || data['@type'] === 'House') {
-                                return {
-                                    property: data,
-                                    source: 'jsonld'
-                                };
-                            }
-                        } catch (e) {}
-                    }
-                } catch (e) {}
-                return null;
-            }'''
-        ]
-        
-        for js in js_extractions:
-            try:
-                result = page.evaluate(js)
-                if result and isinstance(result, dict) and 'property' in result:
-                    print(f"[zillow] Found property data in {result['source']}")
-                    return result['property']
-            except Exception as e:
-                print(f"[zillow] JS extraction error: {str(e)}")
-                continue
-                
-        # Last resort - try extracting from global window properties
+async def _extract_data(page, deadline: Optional[Deadline] = None) -> dict:
+    """Extract property data with a single in-page evaluate (see zillow_extract)."""
+    deadline = deadline or Deadline(site="zillow", url=page.url)
+    if deadline.allows("h1 wait", 1.0):
         try:
-            props = page.evaluate('''() => {
-                const props = {};
-                if (window.dataLayer) {
-                    const dlData = window.dataLayer.find(d => d.propertyId || d.listingId);
-                    if (dlData) Object.assign(props, dlData);
-                }
-                ['propertyId', 'zpid', 'listingId'].forEach(key => {
-                    if (window[key]) props[key] = window[key];
-                });
-                return props;
-            }''')
-            if props:
-                print("[zillow] Found property IDs in window scope")
-                return props
-        except:
-            pass
-                
-        return {}
-    except Exception as e:
-        print(f"[zillow] Failed to extract JSON data: {str(e)}")
-        return {}
-
-def _extract_data(page) -> dict:
-    """Extract property data from various sources using a multi-layered approach."""
-    data = {}
-    
-    try:
-        # Wait for critical content to load
-        page.wait_for_load_state("domcontentloaded", timeout=15000)
-        page.wait_for_selector('h1', timeout=10000)
-        
-        # Force scroll to trigger lazy loading
-        page.evaluate('window.scrollTo(0, document.body.scrollHeight/2)')
-        page.wait_for_timeout(2000)  # Wait for dynamic content
-            
-            # Inject MutationObserver to detect dynamic content
-            page.evaluate('''() => {
-                window.dynamicElementsFound = false;
-                const observer = new MutationObserver((mutations) => {
-                    for (const mutation of mutations) {
-                        if (mutation.addedNodes.length) {
-                            const added = Array.from(mutation.addedNodes);
-                            if (added.some(node => {
-                                if (node.nodeType === 1) {  // Element node
-                                    return node.querySelector?.('[data-testid], [class*="price"], [class*="address"]');
-                                }
-                                return false;
-                            })) {
-                                window.dynamicElementsFound = true;
-                            }
-                        }
-                    }
-                });
-                observer.observe(document.body, { 
-                    childList: true, 
-                    subtree: true,
-                    attributes: true,
-                    attributeFilter: ['data-testid', 'class']
-                });
-            }''')
-            
-            # Wait for dynamic content
-            try:
-                page.wait_for_function('window.dynamicElementsFound === true', timeout=3000)
-            except:
-                pass  # Continue even if no dynamic content detected
-                
+            await page.wait_for_selector('h1', timeout=deadline.timeout_ms("h1 wait", 10000))
         except TimeoutError:
             print("[zillow] Initial page load timeout, continuing with partial content")
-            
-        # 2. Try getting data from JavaScript first
-        json_data = _extract_json_data(page)
-        if json_data:
-            # Extract from various JSON structures
-            try:
-                if isinstance(json_data, dict):
-                    # Map common property fields from various Zillow data structures
-                    field_mappings = {
-                        'address': ['streetAddress', 'address.streetAddress', 'location.address', 'fullAddress'],
-                        'price': ['price', 'listPrice', 'homePrice', 'unformattedPrice'],
-                        'beds': ['bedrooms', 'numberOfBedrooms', 'beds', 'numBeds'],
-                        'baths': ['bathrooms', 'numberOfBathrooms', 'baths', 'numBaths'],
-                        'lot_size': ['lotSize', 'lotSizeSquareFeet', 'lotAreaValue', 'lotArea']
-                    }
-
-                    def get_nested(obj: dict, path: str):
-                        """Get value from nested dict using dot notation."""
-                        parts = path.split('.')
-                        for part in parts:
-                            if not isinstance(obj, dict):
-                                return None
-                            obj = obj.get(part, {})
-                        return obj if obj != {} else None
-
-                    # Extract values using field mappings
-                    for target_field, possible_fields in field_mappings.items():
-                        if target_field not in data or not data[target_field]:
-                            for field in possible_fields:
-                                value = None
-                                if '.' in field:
-                                    value = get_nested(json_data, field)
-                                else:
-                                    value = json_data.get(field)
-                                    if value is None and isinstance(json_data.get('property'), dict):
-                                        value = json_data['property'].get(field)
-                                if value is not None:
-                                    if target_field in ['price', 'lot_size']:
-                                        value = str(value).replace(',', '').replace('$', '')
-                                    data[target_field] = value
-                                    break
-
-            except Exception as e:
-                print(f"[zillow] Failed to extract from JSON: {str(e)}")
-                
-        # 3. If we're missing any data, try HTML extraction
-        if not all(data.values()):
-            # Scroll and expand content
-            page.evaluate('window.scrollTo(0, document.body.scrollHeight/2)')
-            page.wait_for_timeout(1000)
-
-            # Try to accept any cookie banners that might be in the way
-            try:
-                cookie_selectors = [
-                    'button:has-text("Accept")',
-                    'button:has-text("Accept All")',
-                    'button:has-text("Got it")',
-                    'button[aria-label*="Accept"]',
-                    '#onetrust-accept-btn-handler'
-                ]
-                for selector in cookie_selectors:
-                    try:
-                        page.locator(selector).first.click(timeout=1000)
-                        page.wait_for_timeout(500)
-                    except:
-                        continue
-            except:
-                pass
-
-            # Try expanding content sections
-            expand_selectors = [
-                'button:has-text("Show more")',
-                'button:has-text("See more")',
-                'button:has-text("Expand")',
-                '[aria-label*="expand"]',
-                '[data-testid*="expand"]'
-            ]
-            for selector in expand_selectors:
-                try:
-                    elements = page.locator(selector).all()
-                    for el in elements:
-                        if el.is_visible():
-                            el.click()
-                            page.wait_for_timeout(500)
-                except:
-                    continue
-
-            # Extract missing fields from the DOM
-            try:
-                # Extract address if missing
-                if not data.get('address'):
-                    address_selectors = [
-                        'h1',
-                        '[data-testid="property-address"]',
-                        '[data-testid="address"]',
-                        '[itemprop="streetAddress"]',
-                        '[class*="address"]',
-                        'h1:has-text("Newton")'
-                    ]
-                    for selector in address_selectors:
-                        try:
-                            elements = page.locator(selector).all()
-                            for el in elements:
-                                if el.is_visible():
-                                    text = el.inner_text().strip()
-                                    if ',' in text:
-                                        text = text.split(',')[0].strip()
-                                    if 'Newton' in text and any(x in text.lower() for x in ['street', 'st', 'road', 'rd', 'ave', 'dr', 'ln', 'way']):
-                                        data['address'] = text
-                                        break
-                            if data.get('address'):
-                                break
-                        except:
-                            continue
-
-                # Extract price if missing
-                if not data.get('price'):
-                    price_selectors = [
-                        '[data-testid*="price"]',
-                        'span[class*="price"]',
-                        'div[class*="price"]'
-                    ]
-                    for selector in price_selectors:
-                        try:
-                            elements = page.locator(selector).all()
-                            for el in elements:
-                                if el.is_visible():
-                                    text = el.inner_text()
-                                    price_match = re.search(r'\$?([\d,]+)(?:,\d{3})*', text)
-                                    if price_match:
-                                        data['price'] = price_match.group(1).replace(',', '')
-                                        break
-                            if data.get('price'):
-                                break
-                        except:
-                            continue
-
-                # Extract beds/baths if missing
-                bed_bath_selectors = [
-                    '[data-testid="bed-bath-item"]',
-                    '[data-testid="facts-list"]',
-                    '[class*="home-facts"]',
-                    '[class*="summary-list"]'
-                ]
-                
-                for selector in bed_bath_selectors:
-                    try:
-                        elements = page.locator(selector).all()
-                        for el in elements:
-                            if el.is_visible():
-                                text = el.inner_text().lower()
-                                if not data.get('beds') and 'bed' in text:
-                                    bed_match = re.search(r'(\d+)\s*(?:bed|br)', text)
-                                    if bed_match:
-                                        data['beds'] = int(bed_match.group(1))
-                                if not data.get('baths') and 'bath' in text:
-                                    bath_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:bath|ba)', text)
-                                    if bath_match:
-                                        data['baths'] = float(bath_match.group(1))
-                                
-                                # Break if we found both
-                                if data.get('beds') and data.get('baths'):
-                                    break
-                        if data.get('beds') and data.get('baths'):
-                            break
-                    except:
-                        continue
-
-                # Extract lot size if missing
-                if not data.get('lot_size'):
-                    lot_size_selectors = [
-                        '[data-testid="facts-list"]',
-                        '[class*="fact-group"]',
-                        '[class*="home-facts"]'
-                    ]
-                    for selector in lot_size_selectors:
-                        try:
-                            elements = page.locator(selector).all()
-                            for el in elements:
-                                if el.is_visible():
-                                    text = el.inner_text().lower()
-                                    lot_patterns = [
-                                        r'lot (?:size|area|dimensions?|sq\.?\s*ft\.?):\s*([\d,]+)',
-                                        r'([\d,]+)\s*sq\.?\s*ft\.?\s*lot',
-                                        r'lot.*?([\d,]+)\s*sq\.?\s*ft',
-                                        r'([\d,.]+)\s*acres?'
-                                    ]
-                                    for pattern in lot_patterns:
-                                        match = re.search(pattern, text)
-                                        if match:
-                                            value = match.group(1).replace(',', '')
-                                            if 'acre' in text:
-                                                # Convert acres to square feet
-                                                value = str(int(float(value) * 43560))
-                                            data['lot_size'] = value
-                                            break
-                                    if data.get('lot_size'):
-                                        break
-                            if data.get('lot_size'):
-                                break
-                        except:
-                            continue
-
-            except Exception as e:
-                print(f"[zillow] Failed to extract from HTML: {str(e)}")
-
+    try:
+        return await zillow_extract.extract(page)
     except Exception as e:
         print(f"[zillow] Data extraction failed: {str(e)}")
+        return {}
 
-    # Clean and validate data
-    if data:
-        # Clean address
-        if data.get('address'):
-            data['address'] = data['address'].strip()
-            if ',' in data['address']:
-                data['address'] = data['address'].split(',')[0].strip()
-
-        # Clean numeric fields
-        for field in ['price', 'lot_size']:
-            if data.get(field):
-                data[field] = str(data[field]).replace('$', '').replace(',', '')
-                # Verify it's numeric
-                if not data[field].replace('.', '').isdigit():
-                    data[field] = None
+def _retry_after(headers: dict) -> Optional[float]:
+    try:
+        return float(headers.get("retry-after", ""))
+    except ValueError:
+        return None
 
-        # Convert and validate beds/baths
+async def _collect_listing_urls():
+    """
+    Walk the results pages (see frontier.Pager), collecting detail URLs and search-result cards.
+    Each page is scrolled until saturation and paced through the host limiter (browser_fetch.aharvest_page).
+    """
+    urls, cards, ids = [], {}, set()
+    pager = Pager("zillow", SEARCH_URL)
+    page_url = SEARCH_URL
+    while page_url:
+        print(f"[zillow] Fetching listings from {page_url}")
+        try:
+            links, page_cards, pagination = await browser_fetch.aharvest_page(page_url, "zillow", headless=False)
+        except Exception as e:
+            print(f"[zillow] Error fetching listings from {page_url}: {str(e)}")
+            break
+        for u, card in page_cards.items():
+            cards.setdefault(u, card)
+        new = [u for u in filter_newton_urls("zillow", links) if listing_id("zillow", u) not in ids]
+        ids.update(listing_id("zillow", u) for u in new)
+        urls.extend(new)
+        page_url = pager.advance(len(new), pagination)
+    return urls, cards
+
+async def _fetch_zillow_async(city: str) -> list:
+    replaying = fetch_archive.replaying()
+
+    # Search API tiles first: the whole town in a few JSON calls; scroll the results pages only if that fails
+    cards = {card["url"]: card for card in (await zillow_tiles.asearch()).values()}
+    if cards:
+        raw = list(cards)
+        print(f"[zillow] {len(cards)} listings from the search API")
+    else:
+        raw, cards = await _collect_listing_urls()
+
+    # Filter URLs to ensure they're in Newton
+    urls = filter_newton_urls("zillow", raw)
+    index = get_index()
+    new = index.mark("zillow", urls)
+    print(f"[zillow] {len(urls)} listings, {len(new)} new since last run")
+
+    # Complete search cards and unchanged listings become rows as-is; only the rest need a detail page
+    data, todo = partition(urls, cards)
+    todo, reused = index.delta("zillow", todo, cards)
+    data += reused
+    for row in data:
+        row.update({"city": city, "state": "MA"})
+    print(f"[zillow] {len(data)} rows from search cards ({len(reused)} unchanged), {len(todo)} need detail pages")
+
+    def _row(url: str, page_data: dict) -> dict:
+        # Top up whatever the detail page missed from the search card
+        return fill_missing({
+            "address": page_data.get('address'),
+            "city": city,
+            "state": "MA",
+            "price": page_data.get('price'),
+            "beds": page_data.get('beds'),
+            "baths": page_data.get('baths'),
+            "lot_sqft": page_data.get('lot_size'),
+            "url": url,
+            "source": "zillow"
+        }, cards.get(url))
+
+    # The fetch budget goes to the best-scoring candidates first
+    if SETTINGS.prioritize:
+        todo = prioritizer.rank("zillow", todo, cards)
+
+    # Plain HTTP first: detail pages whose server-rendered JSON is complete never open a tab
+    todo = todo[:SETTINGS.fetch_budget or None]
+    if replaying:
+        # Replays follow the recording: pages it rendered in the browser are archived under 'browser'
+        browser_urls = [u for u in todo if fetch_archive.active().get("browser", u) is not None]
+        http_urls = [u for u in todo if u not in browser_urls]
+    else:
+        http_urls, browser_urls = tiered_fetch.plan("zillow", todo)
+    usable, escalate = await tiered_fetch.atry_http(
+        "zillow", http_urls, check=lambda html: not missing_fields(_row("", zillow_extract.from_html(html))))
+    for res in usable:
+        row = _row(res.url, zillow_extract.from_html(res.text))
+        index.record_fetch("zillow", res.url, cards.get(res.url), row)
+        data.append(row)
+    print(f"[zillow] {len(usable)} detail pages over plain HTTP, {len(browser_urls) + len(escalate)} need the browser")
+
+    async def _detail(url: str):
+        # Each detail page gets its own tab; the pool caps how many are open at once
+        deadline = None
         try:
-            if data.get('beds'):
-                data['beds'] = int(str(data['beds']).strip())
-            if data.get('baths'):
-                data['baths'] = float(str(data['baths']).strip())
-        except:
-            if 'beds' in data: data['beds'] = None
-            if 'baths' in data: data['baths'] = None
-            
+            async with pool.page("zillow") as page:
+                # The page's budget starts once it has a tab, not while it queues for one
+                deadline = Deadline(site="zillow", url=url)
+                page.set_default_navigation_timeout(30000)
+                page.set_default_timeout(30000)
+                print(f"[zillow] Fetching {url}")
+
+                async def _goto():
+                    resp = await page.goto(url, wait_until="domcontentloaded",
+                                           timeout=deadline.timeout_ms("goto", 30000))
+                    if resp is not None and resp.status in (403, 429, 503):
+                        raise BlockedResponse(resp.status, _retry_after(resp.headers))
+                    return resp
+
+                resp = await BROWSER_RETRY.run_async(_goto, host=host_of(url), label=url, deadline=deadline)
+                row = _row(url, await _extract_data(page, deadline))
+                if fetch_archive.recording():
+                    # Rendered HTML, so a replay can extract the page without a browser
+                    fetch_archive.active().put("browser", url, {"status": resp.status if resp else 200,
+                                                                "text": await page.content()})
+        except Exception as e:
+            print(f"[zillow] Failed to process {url}: {str(e)}")
+            return None
+        finally:
+            if deadline is not None:
+                deadline.finish()
+        return _keep(url, row)
+
+    def _replayed(url: str):
+        rec = fetch_archive.active().get("browser", url)
+        if rec is None:
+            print(f"[zillow] Failed to process {url}: not in replay archive")
+            return None
+        return _keep(url, _row(url, zillow_extract.from_html(rec["text"])))
+
+    def _keep(url: str, row: dict):
+        # Only add if we have all required fields
+        missing = missing_fields(row)
+        if missing:
+            print(f"[zillow] Skipping incomplete listing. Missing fields: {', '.join(missing)}")
+            return None
+        tiered_fetch.MEMORY.record("zillow", url, tiered_fetch.BROWSER)
+        print(f"[zillow] Extracted: {row['address']} - ${row['price']} - {row['beds']}bd {row['baths']}ba - {row['lot_sqft']}sqft")
+        return row
+
+    if replaying:
+        rows = [_replayed(u) for u in browser_urls + escalate]
+    elif browser_urls or escalate:
+        # Chromium only starts once a detail page actually needs it (never in replays)
+        pool = await get_pool(headless=False)  # non-headless for better stability
+        rows = await asyncio.gather(*(_detail(u) for u in browser_urls + escalate))
+    else:
+        rows = []
+    for row in filter(None, rows):
+        index.record_fetch("zillow", row["url"], cards.get(row["url"]), row)
+        data.append(row)
+
+    tiered_fetch.MEMORY.save()
+    strategy_stats.STATS.save()
     return data
 
 def fetch_zillow(city: str) -> pd.DataFrame:
     """
-    Fetch property listings from Zillow using Playwright's stealth mode.
+    Fetch property listings from Zillow on the shared (stealth) browser pool.
     Uses multiple data extraction strategies for reliability.
     """
-    data = []
-    
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(
-            headless=False,  # Run in non-headless mode for better stability
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-features=IsolateOrigins,site-per-process',
-                '--disable-web-security',
-            ]
-        )
-        
-        # Create context with stealth mode
-        context = browser.new_context(
-            user_agent=DEFAULT_UA,
-            viewport={"width": 1920, "height": 1080},
-            ignore_https_errors=True,
-            java_script_enabled=True,
-            locale="en-US",
-            timezone_id="America/New_York",
-            geolocation={"latitude": 42.3371, "longitude": -71.2092},  # Newton, MA coordinates
-            permissions=['geolocation'],
-            color_scheme='light',
-            device_scale_factor=1,
-        )
-        
-        # Stealth mode scripts
-        context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            window.chrome = {
-                runtime: {}
-            };
-        """)
-        
-        page = context.new_page()
-        page.set_default_navigation_timeout(30000)
-        page.set_default_timeout(30000)
-        
-        # Collect property URLs using browser
-        urls = []
-        for page_url in CITY_PAGES:
-            try:
-                print(f"[zillow] Fetching listings from {page_url}")
-                page.goto(page_url)
-                page.wait_for_load_state("domcontentloaded", timeout=15000)
-                
-                # Wait for property cards to load
-                page.wait_for_selector('a[href*="/homedetails/"]', timeout=10000)
-                
-                # Scroll to load more content
-                for _ in range(3):
-                    page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-                    page.wait_for_timeout(2000)
-                
-                # Extract property URLs
-                elements = page.locator('a[href*="/homedetails/"]').all()
-                for el in elements:
-                    try:
-                        url = el.get_attribute('href')
-                        if url and url.startswith('/'):
-                            url = f"https://www.zillow.com{url}"
-                        if url:
-                            urls.append(url)
-                    except:
-                        continue
-                        
-                page.wait_for_timeout(2000)  # Pause between pages
-                
-            except Exception as e:
-                print(f"[zillow] Error fetching listings from {page_url}: {str(e)}")
-                continue
-        
-        # Filter URLs to ensure they're in Newton
-        from app.scraper.url_filters import filter_newton_urls
-        urls = list(set(filter_newton_urls("zillow", urls)))
-
-        # Process each property
-        for url in urls[:20]:
-            try:
-                print(f"\n[zillow] Fetching {url}")
-                
-                # Navigate with retry logic
-                max_retries = 3
-                for attempt in range(max_retries):
-                    try:
-                        page.goto(url)
-                        page.wait_for_load_state("domcontentloaded", timeout=10000)
-                        break
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            raise
-                        print(f"[zillow] Retry {attempt + 1} for {url}: {str(e)}")
-                        page.wait_for_timeout(2000 * (attempt + 1))
-
-                # Extract property data
-                page_data = _extract_data(page)
-                
-                # Only add if we have all required fields
-                if all(page_data.get(field) for field in ['address', 'price', 'beds', 'baths', 'lot_size']):
-                    row = {
-                        "address": page_data['address'],
-                        "city": city,
-                        "state": "MA",
-                        "price": page_data['price'],
-                        "beds": page_data['beds'],
-                        "baths": page_data['baths'],
-                        "lot_sqft": page_data['lot_size'],
-                        "url": url,
-                        "source": "zillow"
-                    }
-                    
-                    print(f"[zillow] Extracted: {row['address']} - ${row['price']} - {row['beds']}bd {row['baths']}ba - {row['lot_sqft']}sqft")
-                    data.append(row)
-                else:
-                    missing = [field for field in ['address', 'price', 'beds', 'baths', 'lot_size'] if not page_data.get(field)]
-                    print(f"[zillow] Skipping incomplete listing. Missing fields: {', '.join(missing)}")
-                
-            except Exception as e:
-                print(f"[zillow] Failed to process {url}: {str(e)}")
-                continue  # Skip this property and continue with the next
-
-            # Short pause between properties
-            page.wait_for_timeout(1000)
-
-        # Clean up
-        page.close()
-        context.close()
-        browser.close()
+    data = None
+    # Record/replay runs stay in-process: the archive lives here, not in the service
+    if browser_service.enabled() and fetch_archive.active() is None:
+        try:
+            data = browser_service.submit({"op": "zillow", "city": city})
+        except Exception as e:
+            print(f"[zillow] Browser service unavailable, using a local browser: {str(e)}")
+    if data is None:
+        data = run_sync(_fetch_zillow_async(city))
 
     # Create DataFrame and clean up data
     df = pd.DataFrame(data)
+    if df.empty:
+        print("[zillow] Scraped 0 complete properties")
+        return df
     
     # Convert numeric columns
     for col in ['price', 'beds', 'baths', 'lot_sqft']:
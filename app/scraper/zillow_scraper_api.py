@@ -1,9 +1,13 @@
-import re
 import json
+from typing import Optional
+
 import pandas as pd
 import requests
 from playwright.sync_api import sync_playwright, TimeoutError
 
+from app.scraper.deadline import Deadline
+from app.scraper.zillow_extract import extract_sync
+
 DEFAULT_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -25,190 +29,21 @@ API_HEADERS = {
     'user-agent': DEFAULT_UA
 }
 
-def _extract_data(page) -> dict:
-    """Extract property data from various sources using a multi-layered approach."""
-    data = {}
-    
+def _extract_data(page, deadline: Optional[Deadline] = None) -> dict:
+    """Extract property data with a single in-page evaluate (see zillow_extract)."""
+    deadline = deadline or Deadline(site="zillow", url=page.url)
     try:
-        # Wait for critical content to load
-        page.wait_for_load_state("domcontentloaded", timeout=15000)
-        page.wait_for_selector('h1', timeout=10000)
-        
-        # Scroll to trigger lazy loading
-        page.evaluate('window.scrollTo(0, document.body.scrollHeight/2)')
-        page.wait_for_timeout(2000)
-        
-        # 1. Extract address - multiple attempts with different selectors
-        address_selectors = [
-            'h1[class*="address"]',
-            '[data-testid="property-address"]',
-            '[data-testid="address"]',
-            '[class*="Address"]',
-            'h1'
-        ]
-        
-        for selector in address_selectors:
-            try:
-                element = page.locator(selector).first
-                if element and element.is_visible():
-                    text = element.inner_text().strip()
-                    if text and ('Newton' in text or any(x in text.lower() for x in ['st', 'rd', 'ave', 'dr', 'ln'])):
-                        if ',' in text:
-                            text = text.split(',')[0].strip()
-                        data['address'] = text
-                        break
-            except:
-                continue
-                
-        # 2. Extract price - multiple patterns
-        price_selectors = [
-            '[data-testid="price"]',
-            '[class*="Price"]',
-            'span[class*="price"]',
-            'div[class*="price"]'
-        ]
-        
-        for selector in price_selectors:
-            try:
-                elements = page.locator(selector).all()
-                for el in elements:
-                    if el.is_visible():
-                        text = el.inner_text()
-                        price_match = re.search(r'\$?([\d,]+)(?:,\d{3})*', text)
-                        if price_match:
-                            data['price'] = price_match.group(1).replace(',', '')
-                            break
-                if data.get('price'):
-                    break
-            except:
-                continue
-
-        # 3. Extract beds/baths
-        summary_selectors = [
-            '[data-testid="bed-bath-living-area-container"]',
-            '[data-testid="bed-bath-item"]',
-            '[class*="bed-bath-summary"]',
-            '[class*="summary-container"]'
-        ]
-
-        for selector in summary_selectors:
-            try:
-                summary = page.locator(selector).first
-                if summary and summary.is_visible():
-                    text = summary.inner_text().lower()
-                    
-                    # Extract beds
-                    bed_match = re.search(r'(\d+)\s*(?:bed|br)', text)
-                    if bed_match:
-                        data['beds'] = int(bed_match.group(1))
-                    
-                    # Extract baths
-                    bath_match = re.search(r'(\d+(?:\.\d+)?)\s*(?:bath|ba)', text)
-                    if bath_match:
-                        data['baths'] = float(bath_match.group(1))
-                        
-                    if data.get('beds') and data.get('baths'):
-                        break
-            except:
-                continue
-
-        # 4. Extract lot size
-        facts_selectors = [
-            '[data-testid="facts-container"]',
-            '[class*="facts-container"]',
-            '[class*="fact-group"]',
-            '[class*="home-facts"]'
-        ]
-        
-        for selector in facts_selectors:
-            try:
-                facts = page.locator(selector).first
-                if facts and facts.is_visible():
-                    text = facts.inner_text().lower()
-                    
-                    # Try different lot size patterns
-                    lot_patterns = [
-                        r'lot (?:size|area):\s*([\d,]+)\s*(?:square\s*feet|sq\s*ft|sf)',
-                        r'lot.*?([\d,]+)\s*(?:square\s*feet|sq\s*ft|sf)',
-                        r'([\d,.]+)\s*acres?'
-                    ]
-                    
-                    for pattern in lot_patterns:
-                        match = re.search(pattern, text)
-                        if match:
-                            value = match.group(1).replace(',', '')
-                            if 'acre' in text:
-                                # Convert acres to square feet
-                                value = str(int(float(value) * 43560))
-                            data['lot_size'] = value
-                            break
-                            
-                    if data.get('lot_size'):
-                        break
-            except:
-                continue
-                
-        # 5. Fallback to script data if needed
-        if not all(key in data for key in ['address', 'price', 'beds', 'baths', 'lot_size']):
-            try:
-                script_data = page.evaluate('''() => {
-                    const scripts = Array.from(document.querySelectorAll('script[type="application/ld+json"]'));
-                    for (const script of scripts) {
-                        try {
-                            const data = JSON.parse(script.textContent);
-                            if (data['@type'] === 'SingleFamilyResidence' || data['@type'] === 'House') {
-                                return data;
-                            }
-                        } catch {}
-                    }
-                    return null;
-                }''')
-                
-                if script_data:
-                    if not data.get('address') and script_data.get('address'):
-                        data['address'] = script_data['address'].get('streetAddress')
-                    if not data.get('price') and script_data.get('price'):
-                        data['price'] = str(script_data['price']).replace('$', '').replace(',', '')
-                    if not data.get('beds') and script_data.get('numberOfBedrooms'):
-                        data['beds'] = int(script_data['numberOfBedrooms'])
-                    if not data.get('baths') and script_data.get('numberOfBathrooms'):
-                        data['baths'] = float(script_data['numberOfBathrooms'])
-                    if not data.get('lot_size') and script_data.get('lotSize'):
-                        lot_size = script_data['lotSize']
-                        if isinstance(lot_size, dict) and lot_size.get('value'):
-                            data['lot_size'] = str(lot_size['value'])
-            except:
-                pass
-
+        if deadline.allows("load wait", 1.0):
+            page.wait_for_load_state("domcontentloaded", timeout=deadline.timeout_ms("load wait", 15000))
+        if deadline.allows("h1 wait", 1.0):
+            page.wait_for_selector('h1', timeout=deadline.timeout_ms("h1 wait", 10000))
+    except TimeoutError:
+        print("[zillow] Initial page load timeout, continuing with partial content")
+    try:
+        return extract_sync(page)
     except Exception as e:
         print(f"[zillow] Data extraction failed: {str(e)}")
-
-    # Clean and validate data
-    if data:
-        # Clean address
-        if data.get('address'):
-            data['address'] = data['address'].strip()
-            if ',' in data['address']:
-                data['address'] = data['address'].split(',')[0].strip()
-
-        # Clean numeric fields
-        for field in ['price', 'lot_size']:
-            if data.get(field):
-                data[field] = str(data[field]).replace('$', '').replace(',', '')
-                if not data[field].replace('.', '').isdigit():
-                    data[field] = None
-
-        # Validate beds/baths
-        try:
-            if data.get('beds'):
-                data['beds'] = int(str(data['beds']).strip())
-            if data.get('baths'):
-                data['baths'] = float(str(data['baths']).strip())
-        except:
-            if 'beds' in data: data['beds'] = None
-            if 'baths' in data: data['baths'] = None
-            
-    return data
+        return {}
 
 def fetch_zillow(city: str) -> pd.DataFrame:
     """
@@ -308,21 +143,24 @@ def fetch_zillow(city: str) -> pd.DataFrame:
                             
                         print(f"\n[zillow] Fetching {url}")
                         
-                        # Navigate with retry logic
+                        # Navigate with retry logic, all inside the page's deadline
+                        deadline = Deadline(site="zillow", url=url)
                         max_retries = 3
                         for attempt in range(max_retries):
                             try:
-                                page.goto(url)
-                                page.wait_for_load_state("domcontentloaded", timeout=10000)
+                                page.goto(url, timeout=deadline.timeout_ms("goto", 30000))
+                                page.wait_for_load_state("domcontentloaded", timeout=deadline.timeout_ms("load wait", 10000))
                                 break
                             except Exception as e:
-                                if attempt == max_retries - 1:
+                                if attempt == max_retries - 1 or not deadline.allows(f"retry {attempt + 2}", 2 * (attempt + 1) + 1.0):
+                                    deadline.finish()
                                     raise
                                 print(f"[zillow] Retry {attempt + 1} for {url}: {str(e)}")
                                 page.wait_for_timeout(2000 * (attempt + 1))
 
                         # Extract property data
-                        page_data = _extract_data(page)
+                        page_data = _extract_data(page, deadline)
+                        deadline.finish()
                         
                         # Only add if we have all required fields
                         if all(page_data.get(field) for field in ['address', 'price', 'beds', 'baths', 'lot_size']):
@@ -1,8 +1,7 @@
-import re
-import json
 import time
 import pandas as pd
 from playwright.sync_api import sync_playwright
+from app.scraper.zillow_extract import from_html
 
 DEFAULT_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -31,101 +30,9 @@ HEADERS = {
 }
 
 def _extract_data(html_or_page) -> dict:
-    """Extract property data from HTML using regex patterns."""
-    data = {}
-    
-    # Handle either HTML string or Playwright page
+    """Extract property data from HTML (or a Playwright page) with the registered Zillow extractor."""
     html = html_or_page if isinstance(html_or_page, str) else html_or_page.content()
-    
-    try:
-        # Extract address
-        address_patterns = [
-            r'"streetAddress":\s*"([^"]+)"',
-            r'"address":\s*{\s*"streetAddress":\s*"([^"]+)"',
-            r'<h1[^>]*>([^,<]+),\s*Newton',
-            r'<title>([^,|]+),\s*Newton'
-        ]
-        
-        for pattern in address_patterns:
-            match = re.search(pattern, html)
-            if match:
-                data['address'] = match.group(1).strip()
-                break
-                
-        # Extract price
-        price_patterns = [
-            r'"price":\s*"?\$?([\d,]+)"?',
-            r'"price":\s*(\d+)',
-            r'<span[^>]*>[$]?([\d,]+,\d{3})</span>'
-        ]
-        
-        for pattern in price_patterns:
-            match = re.search(pattern, html)
-            if match:
-                price = match.group(1).replace(',', '')
-                if price.isdigit():
-                    data['price'] = price
-                    break
-                
-        # Extract beds
-        bed_patterns = [
-            r'"bedrooms":\s*"?(\d+)"?',
-            r'"numberOfBedrooms":\s*"?(\d+)"?',
-            r'(\d+)\s*bed',
-            r'(\d+)\s*(?:beds|bedrooms)'
-        ]
-        
-        for pattern in bed_patterns:
-            match = re.search(pattern, html)
-            if match:
-                beds = match.group(1)
-                if beds.isdigit():
-                    data['beds'] = int(beds)
-                    break
-                
-        # Extract baths
-        bath_patterns = [
-            r'"bathrooms":\s*"?([\d.]+)"?',
-            r'"numberOfBathrooms":\s*"?([\d.]+)"?',
-            r'([\d.]+)\s*bath',
-            r'([\d.]+)\s*(?:baths|bathrooms)'
-        ]
-        
-        for pattern in bath_patterns:
-            match = re.search(pattern, html)
-            if match:
-                baths = match.group(1)
-                try:
-                    data['baths'] = float(baths)
-                except ValueError:
-                    continue
-                break
-                
-        # Extract lot size
-        lot_patterns = [
-            r'"lotSize":\s*{\s*"value":\s*"?(\d+)"?',
-            r'"lotSizeValue":\s*"?(\d+)"?',
-            r'Lot:\s*([\d,]+)\s*sqft',
-            r'([\d,.]+)\s*acres?'
-        ]
-        
-        for pattern in lot_patterns:
-            match = re.search(pattern, html)
-            if match:
-                value = match.group(1).replace(',', '')
-                try:
-                    if 'acre' in pattern:
-                        # Convert acres to square feet
-                        value = str(int(float(value) * 43560))
-                    data['lot_size'] = value
-                except ValueError:
-                    continue
-                break
-                
-    except Exception as e:
-        print(f"[zillow] Data extraction error: {str(e)}")
-        
-    return data
+    return from_html(html)
 
 def fetch_zillow(city: str) -> pd.DataFrame:
     """
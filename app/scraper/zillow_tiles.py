@@ -0,0 +1,122 @@
+# app/scraper/zillow_tiles.py
+"""
+Zillow search-API coverage by map tiles.
+
+GetSearchPageState.htm answers a mapBounds box with at most a few hundred
+map results, however many listings the box holds. Tiling asks for the whole
+region first; any tile whose reported totalResultCount exceeds what came back
+is split into four quadrants and asked again, level by level. Each level is
+fetched concurrently through the shared HTTP client (per-host cap + adaptive
+limiter), and listings are merged by zpid, so overlapping answers from parent
+and child tiles count once.
+"""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+from app.scraper.card_extractor import CARD_PARSERS, fill_missing
+from app.scraper.http_client import afetch_many
+from app.utils.logger import logger
+
+SEARCH_API = "https://www.zillow.com/search/GetSearchPageState.htm"
+MAX_TILE_DEPTH = 4  # 4**4 = 256 leaf tiles at most
+
+API_HEADERS = {
+    'accept': '*/*',
+    'accept-language': 'en-US,en;q=0.9',
+    'referer': 'https://www.zillow.com/newton-ma/',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-origin',
+    'user-agent': (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/123.0.0.0 Safari/537.36"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Tile:
+    west: float
+    east: float
+    south: float
+    north: float
+    depth: int = 0
+
+    def split(self) -> List["Tile"]:
+        mid_lon, mid_lat = (self.west + self.east) / 2, (self.south + self.north) / 2
+        d = self.depth + 1
+        return [
+            Tile(self.west, mid_lon, mid_lat, self.north, d), Tile(mid_lon, self.east, mid_lat, self.north, d),
+            Tile(self.west, mid_lon, self.south, mid_lat, d), Tile(mid_lon, self.east, self.south, mid_lat, d),
+        ]
+
+
+# Newton, MA (Zillow region 11619, type 6 = city)
+NEWTON = Tile(west=-71.2692, east=-71.1492, south=42.2870, north=42.3870)
+NEWTON_REGION = {"regionId": 11619, "regionType": 6}
+
+
+def search_url(tile: Tile, region: dict = NEWTON_REGION, term: str = "Newton, MA") -> str:
+    state = {
+        "pagination": {},
+        "usersSearchTerm": term,
+        "mapBounds": {"west": tile.west, "east": tile.east, "south": tile.south, "north": tile.north},
+        "regionSelection": [region],
+        "isMapVisible": True,
+        "filterState": {"sort": {"value": "globalrelevanceex"}, "ah": {"value": True}},
+        "isListVisible": True,
+        "mapZoom": 12 + tile.depth,
+    }
+    wants = {"cat1": ["listResults", "mapResults"], "cat2": ["total"]}
+    return f"{SEARCH_API}?" + urlencode({
+        "searchQueryState": json.dumps(state, separators=(",", ":")),
+        "wants": json.dumps(wants, separators=(",", ":")),
+        "requestId": tile.depth + 1,
+    })
+
+
+def read_tile(body: str) -> Tuple[int, Dict[str, dict]]:
+    """(totalResultCount the API reports, zpid -> card for the results it returned)."""
+    try:
+        cat1 = (json.loads(body) or {}).get("cat1") or {}
+    except ValueError:
+        return 0, {}
+    results = cat1.get("searchResults") or {}
+    parse = CARD_PARSERS["zillow"]
+    found: Dict[str, dict] = {}
+    for d in (results.get("listResults") or []) + (results.get("mapResults") or []):
+        row = parse(d) if isinstance(d, dict) else None
+        if row is None:
+            continue
+        row["source"] = "zillow"
+        fill_missing(found.setdefault(str(d["zpid"]), {}), row)
+    total = (cat1.get("searchList") or {}).get("totalResultCount") or 0
+    return int(total), found
+
+
+async def asearch(region: Tile = NEWTON, max_depth: int = MAX_TILE_DEPTH) -> Dict[str, dict]:
+    """zpid -> search card for every listing in `region`, splitting tiles the API truncates."""
+    cards: Dict[str, dict] = {}
+    level, calls = [region], 0
+    while level:
+        results = await afetch_many([search_url(t) for t in level], headers=API_HEADERS)
+        calls += len(level)
+        deeper: List[Tile] = []
+        for tile, res in zip(level, results):
+            if not res.ok:
+                logger.warning("[zillow-tiles] tile %s failed: %s", tile, res.error or res.status)
+                continue
+            total, found = read_tile(res.text)
+            for zpid, card in found.items():
+                fill_missing(cards.setdefault(zpid, {}), card)
+            if total > len(found):
+                if tile.depth < max_depth:
+                    deeper.extend(tile.split())
+                else:
+                    logger.warning("[zillow-tiles] tile %s still truncated (%d of %d)", tile, len(found), total)
+        level = deeper
+    logger.info("[zillow-tiles] %d listings from %d search calls", len(cards), calls)
+    return cards
@@ -19,6 +19,24 @@ class Settings:
     email_password: str = os.getenv("EMAIL_PASSWORD", "")
     target_city: str = os.getenv("TARGET_CITY", "Newton, MA")
     database_path: str = os.getenv("DATABASE_PATH", "./data/development_leads.db")
+    rate_limits: str = os.getenv("RATE_LIMITS", "")  # e.g. "www.redfin.com=2,www.zillow.com=0.5"
+    http_cache_dir: str = os.getenv("HTTP_CACHE_DIR", "./data/cache/http")
+    http_cache_ttl: float = float(os.getenv("HTTP_CACHE_TTL", "3600"))  # seconds; 0 disables the cache
+    http_cache_max_age: float = float(os.getenv("HTTP_CACHE_MAX_AGE", str(7 * 86400)))  # purge entries older than this on open
+    fetch_mode: str = os.getenv("FETCH_MODE", "live")  # live | record | replay
+    fetch_archive: str = os.getenv("FETCH_ARCHIVE", "./data/archives/last_run.zip")
+    fetch_tiers_path: str = os.getenv("FETCH_TIERS_PATH", "./data/cache/fetch_tiers.json")  # last working tier per URL pattern
+    strategy_stats_path: str = os.getenv("STRATEGY_STATS_PATH", "./data/cache/strategy_stats.json")  # extractor hit rates
+    seen_index_path: str = os.getenv("SEEN_INDEX_PATH", "./data/cache/seen_listings.sqlite")  # first/last seen per listing ID
+    delta_crawl: bool = os.getenv("DELTA_CRAWL", "1") != "0"  # skip detail fetches for listings whose search card is unchanged
+    full_refresh_days: float = float(os.getenv("FULL_REFRESH_DAYS", "7"))  # refetch unchanged listings after this long
+    html_parser: str = os.getenv("HTML_PARSER", "auto")  # auto | selectolax | lxml | html.parser
+    fetch_budget: int = int(os.getenv("FETCH_BUDGET", "60"))  # detail-page fetches per site per run; 0 = no limit
+    prioritize: bool = os.getenv("PRIORITIZE", "1") != "0"  # rank candidates by card signals before spending the fetch budget
+    parse_workers: int = int(os.getenv("PARSE_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))  # 0 = parse in-process
+    browser_service_addr: str = os.getenv("BROWSER_SERVICE_ADDR", "")  # e.g. 127.0.0.1:8777; empty = in-process browser
+    browser_service_authkey: str = os.getenv("BROWSER_SERVICE_AUTHKEY", "")  # required for the service; no default key
+    block_resources: bool = os.getenv("BLOCK_RESOURCES", "1") != "0"  # abort images/fonts/trackers in Playwright
 
     def validate(self) -> None:
         missing = []
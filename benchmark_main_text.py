@@ -0,0 +1,118 @@
+"""
+Benchmark main-text extraction: the old nested get_text() scan vs ParsedDocument.main_text.
+
+Usage:
+    python benchmark_main_text.py [PATH ...]
+
+PATH may be an .html file, a directory of them, or a fetch archive (.zip written
+with FETCH_MODE=record). With no PATH it reads SETTINGS.fetch_archive and
+data/logs/browser_html; if neither holds pages it falls back to generated
+listing-like pages of growing size.
+"""
+import re
+import sys
+import time
+import json
+import zipfile
+from pathlib import Path
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from app.scraper.parsed_document import ParsedDocument
+from app.utils.config_loader import SETTINGS
+
+LEGACY_SELECTORS = [
+    "[data-rf-test-id='abp-description']", ".ds-overview-section", "section#property-details",
+    "main", "article", "section", "div",
+]
+REPEATS = 3
+
+
+def legacy_main_text(html: str) -> str:
+    """The pre-ParsedDocument scan: get_text() on every candidate node, keep the longest."""
+    soup = BeautifulSoup(html, "html.parser")
+    candidates = []
+    for sel in LEGACY_SELECTORS:
+        for n in soup.select(sel):
+            t = n.get_text(" ", strip=True)
+            if t and len(t) > 120:
+                candidates.append(t)
+    t = max(candidates, key=len) if candidates else soup.get_text(" ", strip=True)
+    return re.sub(r"\s+", " ", t or "").strip()
+
+
+def parse_only(html: str) -> str:
+    BeautifulSoup(html, "html.parser")
+    return ""
+
+
+def new_main_text(html: str, backend: str) -> str:
+    return ParsedDocument(html, backend=backend).main_text()
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str]]:
+    pages = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            pages.extend((str(p), p.read_text(encoding="utf-8", errors="ignore")) for p in sorted(path.glob("*.html")))
+        elif path.suffix == ".zip" and path.exists():
+            with zipfile.ZipFile(path) as zf:
+                for name in zf.namelist():
+                    if name.startswith(("http/", "browser/")):
+                        rec = json.loads(zf.read(name))
+                        if "<html" in (rec.get("text") or "")[:2000].lower():
+                            pages.append((rec.get("key", name), rec["text"]))
+        elif path.is_file():
+            pages.append((str(path), path.read_text(encoding="utf-8", errors="ignore")))
+    return pages
+
+
+def synthetic_pages() -> List[Tuple[str, str]]:
+    """Listing-like pages: nav, deeply nested layout divs, remarks, facts table, footer links."""
+    pages = []
+    for size in (50, 200, 800):
+        nav = "".join(f'<li><a href="/home/{i}">Nearby {i} Elm St</a></li>' for i in range(size))
+        facts = "".join(f"<div class='row'><div class='k'>Fact {i}</div><div class='v'>{i}</div></div>"
+                        for i in range(size))
+        body = "<div>" * 30 + "<article><p>" + "Builder special, sold as-is. " * size + "</p></article>" + "</div>" * 30
+        html = (f"<html><head><title>{size} Walnut St, Newton, MA</title></head><body>"
+                f"<nav><ul>{nav}</ul></nav><main><div class='layout'>{body}<section>{facts}</section>"
+                f"</div></main><footer>{nav}</footer></body></html>")
+        pages.append((f"synthetic-{size}", html))
+    return pages
+
+
+def timed(fn, *args) -> Tuple[float, str]:
+    best, out = float("inf"), ""
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, out
+
+
+def main(argv: List[str]) -> None:
+    pages = load_pages(argv or [SETTINGS.fetch_archive, "./data/logs/browser_html"])
+    if not pages:
+        print("No recorded pages found; using generated listing-like pages.")
+        pages = synthetic_pages()
+    columns = ["parse only", "legacy", "new html.parser", "new lxml"]
+    print(f"{'page':<32} {'KB':>5} " + " ".join(f"{c + ' ms':>18}" for c in columns))
+    totals = [0.0] * len(columns)
+    for name, html in pages:
+        row = [
+            timed(parse_only, html)[0],
+            timed(legacy_main_text, html)[0],
+            timed(new_main_text, html, "html.parser")[0],
+            timed(new_main_text, html, "lxml")[0],
+        ]
+        totals = [a + b for a, b in zip(totals, row)]
+        print(f"{name[-32:]:<32} {len(html) / 1024:>5.0f} " + " ".join(f"{t * 1000:>18.1f}" for t in row))
+    print(f"{'total':<32} {'':>5} " + " ".join(f"{t * 1000:>18.1f}" for t in totals))
+    print("(legacy and new include parsing; subtract 'parse only' for the extraction cost)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
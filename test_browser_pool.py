@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+from app.scraper.browser_pool import BrowserPool
+
+class FakeFrame:
+    def __init__(self, parent=None):
+        self.parent_frame = parent
+
+class FakePage:
+    def __init__(self):
+        self.handlers, self.closed = [], False
+        self.main_frame = FakeFrame()
+
+    def on(self, event, handler):
+        if event == "framenavigated":
+            self.handlers.append(handler)
+
+    def set_default_timeout(self, ms):
+        pass
+
+    def is_closed(self):
+        return self.closed
+
+    async def goto(self, url):
+        for handler in self.handlers:
+            handler(self.main_frame)
+            handler(FakeFrame(parent=self.main_frame))  # iframes don't count
+
+    async def close(self):
+        self.closed = True
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+class TestBrowserPool(unittest.TestCase):
+    def test_pages_recycle_after_navigations_not_checkouts(self):
+        pool = BrowserPool(recycle_after=3)
+        ctx = FakeContext()
+        pool._contexts["zillow"] = ctx
+
+        async def walk(navigations):
+            async with pool.page("zillow") as page:
+                for n in range(navigations):
+                    await page.goto(f"https://www.zillow.com/newton-ma/{n}_p/")
+            return page
+
+        async def run():
+            first = await walk(2)
+            self.assertIs(await walk(0), first)  # a checkout without navigating costs nothing
+            await walk(1)
+            self.assertTrue(first.closed)
+            self.assertIsNot(await walk(1), first)
+
+        asyncio.run(run())
+        self.assertEqual(len(ctx.pages), 2)
+
+if __name__ == "__main__":
+    unittest.main()
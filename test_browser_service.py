@@ -0,0 +1,24 @@
+import unittest
+from unittest import mock
+from app.scraper import browser_service
+
+SETTINGS = "app.scraper.browser_service.SETTINGS"
+
+class TestBrowserServiceAuth(unittest.TestCase):
+    def test_without_authkey_the_service_is_unavailable(self):
+        with mock.patch.multiple(SETTINGS, browser_service_addr="127.0.0.1:8777", browser_service_authkey=""):
+            self.assertFalse(browser_service.enabled())
+            self.assertFalse(browser_service.available())
+            self.assertFalse(browser_service.ensure_running())
+            with self.assertRaises(RuntimeError):
+                browser_service.submit({"op": "ping"})
+            with self.assertRaises(SystemExit):
+                browser_service.serve()
+
+    def test_enabled_with_address_and_authkey(self):
+        with mock.patch.multiple(SETTINGS, browser_service_addr="127.0.0.1:8777", browser_service_authkey="s3cret"):
+            self.assertTrue(browser_service.enabled())
+            self.assertEqual(browser_service._authkey(), b"s3cret")
+
+if __name__ == "__main__":
+    unittest.main()
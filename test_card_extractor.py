@@ -0,0 +1,74 @@
+import json
+import unittest
+from app.scraper.card_extractor import cards_from_payloads, fill_missing, is_complete, partition, result_pages
+
+ZILLOW_PAYLOAD = json.dumps({"cat1": {"searchResults": {
+    "listResults": [
+        {"zpid": "111", "detailUrl": "/homedetails/12-Walnut-St-Newton-MA-02460/111_zpid/",
+         "unformattedPrice": 1250000, "beds": 4, "baths": 2.5, "addressStreet": "12 Walnut St",
+         "latLong": {"latitude": 42.35, "longitude": -71.2}, "statusType": "FOR_SALE",
+         "hdpData": {"homeInfo": {"lotAreaValue": 0.25, "lotAreaUnit": "acres"}}},
+        {"zpid": "222", "detailUrl": "https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/",
+         "unformattedPrice": 899000, "addressStreet": "9 Elm Rd", "hdpData": {"homeInfo": {}}},
+    ],
+    "mapResults": [
+        {"zpid": "222", "detailUrl": "/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/",
+         "hdpData": {"homeInfo": {"bedrooms": 3, "bathrooms": 2}}},
+    ],
+}}})
+
+REDFIN_PAYLOAD = "{}&&" + json.dumps({"payload": {"homes": [
+    {"mlsId": {"value": "7301"}, "url": "/MA/Newton/5-Oak-Ave-02465/home/123",
+     "price": {"value": 975000}, "beds": 3, "baths": 1.5, "lotSize": {"value": 8200},
+     "streetLine": {"value": "5 Oak Ave"}, "latLong": {"value": {"latitude": 42.33, "longitude": -71.25}},
+     "mlsStatus": "Active", "yearBuilt": {"value": 1925}, "dom": {"value": 40}, "listingRemarks": "Builder special"},
+]}})
+
+REALTOR_PAYLOAD = json.dumps({"data": {"home_search": {"results": [
+    {"property_id": "9", "permalink": "3-Pine-St_Newton_MA_02458_M1", "list_price": 1100000, "status": "for_sale",
+     "description": {"beds": 3, "baths_consolidated": "2.5", "lot_sqft": 6000},
+     "location": {"address": {"line": "3 Pine St", "coordinate": {"lat": 42.36, "lon": -71.19}}}},
+]}}})
+
+
+class TestCardExtractor(unittest.TestCase):
+    def test_zillow_cards_merge_list_and_map_results(self):
+        cards = cards_from_payloads("zillow", [ZILLOW_PAYLOAD])
+        full = cards["https://www.zillow.com/homedetails/12-Walnut-St-Newton-MA-02460/111_zpid/"]
+        self.assertEqual(full["price"], 1250000)
+        self.assertEqual(full["lot_sqft"], 10890)
+        self.assertEqual(full["lat"], 42.35)
+        self.assertTrue(is_complete(full))
+        partial = cards["https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/"]
+        self.assertEqual((partial["beds"], partial["baths"]), (3, 2.0))
+        self.assertFalse(is_complete(partial))  # no lot size on the card
+
+    def test_redfin_and_realtor_cards(self):
+        redfin = cards_from_payloads("redfin", [REDFIN_PAYLOAD])
+        row = redfin["https://www.redfin.com/MA/Newton/5-Oak-Ave-02465/home/123"]
+        self.assertEqual((row["address"], row["price"], row["lot_sqft"]), ("5 Oak Ave", 975000, 8200))
+        self.assertEqual((row["year_built"], row["days_on_market"], row["remarks"]), (1925, 40, "Builder special"))
+        realtor = cards_from_payloads("realtor", [REALTOR_PAYLOAD, "not json"])
+        row = realtor["https://www.realtor.com/realestateandhomes-detail/3-Pine-St_Newton_MA_02458_M1"]
+        self.assertEqual((row["baths"], row["lon"], row["source"]), (2.5, -71.19, "realtor"))
+
+    def test_partition_only_leaves_incomplete_cards_for_detail_fetch(self):
+        cards = cards_from_payloads("zillow", [ZILLOW_PAYLOAD])
+        urls = list(cards) + ["https://www.zillow.com/homedetails/no-card/333_zpid/"]
+        rows, todo = partition(urls, cards)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(len(todo), 2)
+        detail = fill_missing({"address": None, "lot_sqft": 5000}, cards[todo[0]])
+        self.assertEqual(detail["address"], "9 Elm Rd")
+        self.assertEqual(detail["lot_sqft"], 5000)
+
+    def test_result_pages_from_search_metadata(self):
+        zillow = json.dumps({"cat1": {"searchList": {"totalPages": 4, "totalResultCount": 150}}})
+        realtor = json.dumps({"data": {"home_search": {"total": 95, "count": 42, "results": []}}})
+        self.assertEqual(result_pages("zillow", [ZILLOW_PAYLOAD, zillow]), 4)
+        self.assertEqual(result_pages("realtor", [realtor]), 3)
+        self.assertIsNone(result_pages("redfin", [REDFIN_PAYLOAD]))
+
+
+if __name__ == "__main__":
+    unittest.main()
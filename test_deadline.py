@@ -0,0 +1,64 @@
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from app.scraper.deadline import Deadline
+from app.scraper.rate_limiter import HostBudget, RetryPolicy, limiter
+from app.scraper.run_report import REPORT
+
+class TestDeadline(unittest.TestCase):
+    def setUp(self):
+        REPORT.reset()
+
+    def test_roomy_budget_is_not_reported(self):
+        d = Deadline(budget_s=60, site="zillow", url="u1")
+        self.assertEqual(d.timeout_ms("h1 wait", 10000), 10000)
+        self.assertTrue(d.allows("h1 wait"))
+        d.finish()
+        self.assertEqual(REPORT.entries("deadline_hits"), [])
+
+    def test_timeout_longer_than_the_budget_is_clamped_not_reported(self):
+        d = Deadline(site="zillow", url="u0")
+        time.sleep(0.05)  # e.g. queued for the limiter: the clock has not started yet
+        self.assertLessEqual(d.timeout_ms("goto", 30000), 25000)
+        d.finish()
+        self.assertEqual(REPORT.entries("deadline_hits"), [])
+
+    def test_low_budget_shortens_and_skips_then_reports(self):
+        d = Deadline(budget_s=1.0, site="zillow", url="u2")
+        self.assertLessEqual(d.timeout_ms("goto", 30000), 1000)  # clamped, not counted
+        time.sleep(0.5)
+        self.assertLess(d.timeout_ms("h1 wait", 900), 600)      # cut by time already spent
+        time.sleep(0.51)
+        self.assertEqual(d.timeout_ms("h1 wait", 10000), 1)  # never 0 (= no timeout in Playwright)
+        self.assertFalse(d.allows("h1 wait", 1.0))
+        d.finish()
+        hit, = REPORT.entries("deadline_hits")
+        self.assertEqual(hit["url"], "u2")
+        self.assertEqual(hit["skipped"], ["h1 wait"])
+        self.assertEqual(hit["shortened"], ["h1 wait", "h1 wait"])
+
+    def test_retry_policy_stops_at_deadline(self):
+        limiter.configure("deadline.example.com", HostBudget(rate=100, min_rate=50, max_rate=100, burst=10))
+        calls = []
+        async def broken():
+            calls.append(1)
+            raise RuntimeError("timeout")
+        policy = RetryPolicy(attempts=5, base_delay=5, jitter=0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(policy.run_async(broken, host="deadline.example.com", deadline=Deadline(budget_s=2)))
+        self.assertEqual(len(calls), 1)
+
+    def test_report_written_as_json(self):
+        REPORT.add("deadline_hits", {"url": "u3"})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "logs" / "run_report.json"
+            REPORT.write(str(path))
+            data = json.loads(path.read_text())
+        self.assertEqual(data["deadline_hits"], [{"url": "u3"}])
+        self.assertIn("started_at", data)
+
+if __name__ == "__main__":
+    unittest.main()
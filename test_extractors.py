@@ -0,0 +1,65 @@
+import json
+import time
+import unittest
+from app.scraper.extractors import Json, Regex, Field, Site, extract, integer, object_after
+
+ABOVE_THE_FOLD = {"payload": {"addressSectionInfo": {
+    "streetAddress": {"assembledAddress": "12 Walnut St"}, "priceInfo": {"amount": 1250000},
+    "beds": 4, "baths": 2.5}}}
+PUBLIC_RECORDS = {"basicInfo": {"beds": 4, "baths": 2.5, "lotSqFt": 10890}}
+NOISE = "<script>var x = '$5 off';" + "a" * 300_000 + "</script>"
+
+def page(body: str) -> str:
+    return f"<html><head><title>Redfin</title></head><body>{NOISE}{body}</body></html>"
+
+def parse(html: str) -> dict:
+    return extract("redfin", html)
+
+class TestExtractors(unittest.TestCase):
+    def test_react_server_state_escaped_payload(self):
+        text = "{}&&" + json.dumps(ABOVE_THE_FOLD)
+        state = json.dumps({"ReactServerAgent": {"cache": {"dataCache": {"/aboveTheFold": {"res": {"text": text}}}}},
+                            "publicRecordsInfo": PUBLIC_RECORDS})
+        html = page(f"<script>root.__reactServerState.InitialContext = {state};</script>")
+        self.assertEqual(parse(html), {"address": "12 Walnut St", "price": "1250000",
+                                       "beds": 4, "baths": 2.5, "lot_sqft": 10890})
+
+    def test_json_ld_listing(self):
+        ld = {"@type": ["Product", "RealEstateListing"], "offers": {"price": 899000},
+              "mainEntity": {"@type": "SingleFamilyResidence", "address": {"streetAddress": "9 Elm Rd"},
+                             "numberOfRooms": 3, "numberOfBathroomsTotal": 2}}
+        html = page(f'<script type="application/ld+json">{json.dumps(ld)}</script>')
+        row = parse(html)
+        self.assertEqual((row["address"], row["price"], row["beds"], row["baths"]), ("9 Elm Rd", "899000", 3, 2.0))
+        self.assertIsNone(row["lot_sqft"])
+
+    def test_fallback_regexes_stay_in_their_windows(self):
+        html = page('<div class="statsValue">$1,100,000</div><span>3 Beds</span><span>2 Baths</span>'
+                    '<div>Lot Size: 8,000</div>')
+        row = parse(html)
+        self.assertEqual(row["price"], "1100000")  # not the "$5" in the script
+        self.assertEqual((row["beds"], row["baths"], row["lot_sqft"]), (3, 2.0, 8000))
+
+    def test_parse_time_does_not_scan_whole_page_per_field(self):
+        html = page("") * 5
+        started = time.perf_counter()
+        parse(html)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertIsNone(object_after(html, "addressSectionInfo"))
+
+    def test_realtor_next_data(self):
+        details = {"location": {"address": {"line": "5 Oak Ave"}}, "list_price": 975000,
+                   "description": {"beds": 3, "baths_consolidated": "2.5", "lot_sqft": 6000}}
+        blob = json.dumps({"props": {"pageProps": {"initialReduxState": {"propertyDetails": details}}}})
+        html = page(f'<script id="__NEXT_DATA__" type="application/json">{blob}</script>')
+        self.assertEqual(extract("realtor", html), {"address": "5 Oak Ave", "price": "975000",
+                                                    "beds": 3, "baths": 2.5, "lot_sqft": 6000})
+
+    def test_site_rejects_duplicate_strategy_names(self):
+        with self.assertRaises(ValueError):
+            Site(name="dup", fields={"beds": Field(integer, [[Regex(r"(\d+) bd")], [Regex(r"(\d+) bd")]])})
+        site = Site(name="ok", fields={"beds": Field(integer, [[Json("a", "beds", "property.beds")]])})
+        self.assertEqual(site.json_keys, ["beds", "property"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app.scraper import fetch_archive
+from app.scraper.http_client import fetch_many
+
+URL = "https://www.realtor.com/realestateandhomes-detail/1-Test-St_Newton_MA_02458_M123"
+
+class TestFetchArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "run.zip"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_then_replay(self):
+        with fetch_archive.session("record", self.path) as archive:
+            archive.put("http", URL, {"status": 200, "text": "first"})
+            archive.put("http", URL, {"status": 200, "text": "second"})  # first record wins
+            archive.put("harvest", "realtor|page", {"payloads": ["{}"], "dom_urls": []})
+        self.assertIsNone(fetch_archive.active())
+
+        with fetch_archive.session("replay", self.path) as archive:
+            self.assertEqual(archive.get("http", URL)["text"], "first")
+            self.assertEqual(archive.get("harvest", "realtor|page")["payloads"], ["{}"])
+            self.assertIsNone(archive.get("http", URL + "?other"))
+            self.assertEqual(archive.misses, 1)
+
+    def test_http_client_serves_replay_without_network(self):
+        with fetch_archive.session("record", self.path) as archive:
+            archive.put("http", URL, {"status": 200, "text": "<html>recorded</html>"})
+        with fetch_archive.session("replay", self.path):
+            hit, miss = fetch_many([URL, URL + "/missing"])
+        self.assertTrue(hit.ok)
+        self.assertEqual(hit.text, "<html>recorded</html>")
+        self.assertFalse(miss.ok)
+
+    def test_live_mode_is_noop_and_unknown_mode_rejected(self):
+        with fetch_archive.session("live") as archive:
+            self.assertIsNone(archive)
+        with self.assertRaises(ValueError):
+            with fetch_archive.session("offline", self.path):
+                pass
+
+if __name__ == '__main__':
+    unittest.main(verbose=True)
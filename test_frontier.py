@@ -0,0 +1,102 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app.scraper.frontier import Frontier, Pager
+from app.scraper.seen_index import SeenIndex
+
+FIRST = "https://www.realtor.com/realestateandhomes-search/Newton_MA"
+
+def detail(n: int) -> str:
+    return f"https://www.realtor.com/realestateandhomes-detail/{n}-Pine-St_Newton-MA-02458"
+
+def complete_card(n: int) -> dict:
+    return {"address": f"{n} Pine St", "price": 900000, "beds": 3, "baths": 2, "lot_sqft": 6000, "url": detail(n)}
+
+class FakeSite:
+    """Results pages of 3 listings each; only the first listing on every page has a complete card."""
+    def __init__(self, pages: int, last_page=None):
+        self.pages, self.last_page, self.harvested = pages, last_page, []
+
+    def __call__(self, url, site, **kw):
+        self.harvested.append(url)
+        n = 1 if url == FIRST else int(url.rsplit("pg-", 1)[1])
+        if n > self.pages:
+            return [], {}, {}
+        ids = [n * 10 + i for i in range(3)]
+        cards = {detail(i): {"price": 800000 + i, "url": detail(i)} for i in ids[1:]}  # no lot size
+        cards[detail(ids[0])] = complete_card(ids[0])
+        return [detail(i) for i in ids], cards, {"last_page": self.last_page}
+
+class TestFrontier(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.seen = SeenIndex(str(Path(self.tmp.name) / "seen.sqlite"))
+
+    def tearDown(self):
+        self.seen.close()
+        self.tmp.cleanup()
+
+    def test_walks_until_a_page_brings_nothing_new(self):
+        site = FakeSite(pages=4)
+        frontier = Frontier("realtor", FIRST, budget=0, harvest=site, seen=self.seen)
+        urls = list(frontier)
+        self.assertEqual(len(urls), 8)            # 2 per page need a detail fetch
+        self.assertEqual(len(frontier.rows), 4)   # 1 per page complete from its card
+        self.assertEqual(site.harvested[-1], FIRST + "/pg-5")  # one empty page ends the walk
+        self.assertIn(detail(10), frontier.cards)
+        self.assertEqual(len(frontier.new), 12)
+        again = Frontier("realtor", FIRST, budget=0, harvest=FakeSite(pages=5), seen=self.seen)
+        list(again)
+        self.assertEqual(again.new, [detail(50), detail(51), detail(52)])  # only page 5 is new this run
+
+    def test_reported_last_page_avoids_the_empty_probe(self):
+        site = FakeSite(pages=2, last_page=2)
+        list(Frontier("realtor", FIRST, budget=0, harvest=site, seen=self.seen))
+        self.assertEqual(site.harvested, [FIRST, FIRST + "/pg-2"])
+
+    def test_budget_and_lazy_harvesting(self):
+        site = FakeSite(pages=10)
+        frontier = Frontier("realtor", FIRST, budget=3, harvest=site, seen=self.seen, prioritize=False)
+        it = iter(frontier)
+        self.assertEqual([next(it), next(it)], [detail(11), detail(12)])
+        self.assertEqual(len(site.harvested), 1)  # page 2 only once page 1 is used up
+        self.assertEqual(list(it), [detail(21)])
+        self.assertEqual(len(site.harvested), 2)
+
+    def test_budget_spent_at_a_page_boundary_harvests_no_further_page(self):
+        site = FakeSite(pages=10)
+        frontier = Frontier("realtor", FIRST, budget=2, harvest=site, seen=self.seen, prioritize=False)
+        self.assertEqual(list(frontier), [detail(11), detail(12)])
+        self.assertEqual(site.harvested, [FIRST])
+
+    def test_prioritized_budget_goes_to_the_best_candidates(self):
+        site = FakeSite(pages=10)
+        frontier = Frontier("realtor", FIRST, budget=2, harvest=site, seen=self.seen, prioritize=True)
+        self.assertEqual(list(frontier), [detail(11), detail(12)])  # cheapest asking prices, from page 1
+        self.assertEqual(len(site.harvested), 3)  # walked up front only until 3 candidates per budgeted fetch
+
+    def test_prioritizing_without_a_budget_stays_lazy(self):
+        site = FakeSite(pages=10)
+        it = iter(Frontier("realtor", FIRST, budget=0, harvest=site, seen=self.seen, prioritize=True))
+        next(it)
+        self.assertEqual(len(site.harvested), 1)
+
+    def test_delta_crawl_skips_unchanged_listings(self):
+        first = Frontier("realtor", FIRST, budget=0, harvest=FakeSite(pages=2), seen=self.seen)
+        for u in first:
+            first.fetched(u, {"url": u, "lot_sqft": 5000})
+        again = Frontier("realtor", FIRST, budget=0, harvest=FakeSite(pages=3), seen=self.seen)
+        self.assertEqual(list(again), [detail(31), detail(32)])  # only the new page needs detail fetches
+        self.assertEqual(again.unchanged, 4)
+        self.assertIn({"url": detail(11), "lot_sqft": 5000}, again.rows)
+
+    def test_pager_stops_on_loops_and_cap(self):
+        pager = Pager("zillow", "https://www.zillow.com/newton-ma/", max_pages=3)
+        self.assertEqual(pager.advance(5), "https://www.zillow.com/newton-ma/2_p/")
+        self.assertIsNone(pager.advance(5, {"next_url": "https://www.zillow.com/newton-ma/2_p/"}))
+        pager = Pager("zillow", "https://www.zillow.com/newton-ma/", max_pages=2)
+        pager.advance(5)
+        self.assertIsNone(pager.advance(5))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+import httpx
+from app.scraper import http_cache, http_client
+from app.scraper.http_cache import ResponseCache
+
+URL = "https://www.redfin.com/MA/Newton/1-Test-St-02458/home/123"
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(Path(self.tmp.name), ttl=60)
+
+    def tearDown(self):
+        self.cache._db.close()
+        self.tmp.cleanup()
+
+    def test_store_and_lookup_roundtrip(self):
+        self.cache.store(URL, 200, {"etag": '"abc"', "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, "<html>hi</html>")
+        entry = self.cache.lookup(URL)
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry.text(), "<html>hi</html>")
+        self.assertTrue(self.cache.is_fresh(entry))
+        self.assertEqual(entry.validators(), {"If-None-Match": '"abc"',
+                                              "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    def test_identical_bodies_share_one_blob(self):
+        self.cache.store(URL, 200, {}, "same body")
+        self.cache.store(URL + "?utm=x", 200, {}, "same body")
+        self.assertEqual(len(list(self.cache.blob_dir.glob("*/*.gz"))), 1)
+
+    def test_refresh_restarts_ttl(self):
+        entry = self.cache.store(URL, 200, {"etag": '"v1"'}, "body")
+        entry.stored_at = time.time() - 120
+        self.assertFalse(self.cache.is_fresh(entry))
+        self.cache.refresh(entry, {"etag": '"v2"'})
+        again = self.cache.lookup(URL)
+        self.assertTrue(self.cache.is_fresh(again))
+        self.assertEqual(again.etag, '"v2"')
+
+    def test_purge_drops_old_entries_and_blobs(self):
+        self.cache.store(URL, 200, {}, "old body")
+        self.assertEqual(self.cache.purge(max_age=-1), 1)
+        self.assertIsNone(self.cache.lookup(URL))
+        self.assertEqual(list(self.cache.blob_dir.glob("*/*.gz")), [])
+
+    def test_client_does_not_cache_block_pages_served_with_200(self):
+        bodies = {URL: "<html>listing</html>", URL + "/blocked": "<div id='px-captcha'></div>"}
+        transport = httpx.MockTransport(lambda req: httpx.Response(200, text=bodies[str(req.url)]))
+
+        async def fetch(url):
+            async with httpx.AsyncClient(transport=transport) as client:
+                with mock.patch.object(http_client, "_get_client", return_value=client):
+                    return await http_client.afetch(url)
+
+        with mock.patch.object(http_client, "get_cache", return_value=self.cache):
+            ok, blocked = asyncio.run(fetch(URL)), asyncio.run(fetch(URL + "/blocked"))
+        self.assertTrue(ok.ok and blocked.ok)
+        self.assertIsNotNone(self.cache.lookup(URL))
+        self.assertIsNone(self.cache.lookup(URL + "/blocked"))
+
+    def test_get_cache_purges_stale_entries_on_open(self):
+        self.cache.store(URL, 200, {}, "old body")
+        self.cache._db.execute("UPDATE responses SET stored_at = 0")
+        self.cache._db.commit()
+        with mock.patch.multiple(http_cache.SETTINGS, http_cache_dir=self.tmp.name, http_cache_ttl=60,
+                                 http_cache_max_age=3600), \
+                mock.patch.object(http_cache, "_cache", None):
+            opened = http_cache.get_cache()
+            self.assertIsNone(opened.lookup(URL))
+            opened._db.close()
+
+if __name__ == '__main__':
+    unittest.main(verbose=True)
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import unittest
+from app.scraper.http_client import FetchResult
+from app.scraper.parse_pipeline import PARSERS_PER_WORKER, _in_order, arun, extract_row, summarize_page
+from app.scraper.strategy_stats import STATS
+
+REDFIN_PAGE = ('<html><script>window.__reactServerState = {"addressSectionInfo":'
+               '{"streetAddress": {"assembledAddress": "%d Walnut St"}, "priceInfo": {"amount": 900000},'
+               ' "beds": 3, "baths": 2}};</script></html>')
+
+async def pages(results, pulled=None):
+    for res in results:
+        if pulled is not None:
+            pulled.append(res.url)
+        yield res
+        await asyncio.sleep(0)
+
+def tries(key: str) -> int:
+    return sum(t for _, t in STATS.stats.get(key, {}).values())
+
+class TestParsePipeline(unittest.TestCase):
+    def test_process_pool_parses_and_ships_strategy_stats_back(self):
+        results = [FetchResult(url=f"u{i}", status=200, text=REDFIN_PAGE % i) for i in range(4)]
+        results.append(FetchResult(url="gone", status=404, text=""))
+        before = tries("redfin|beds")
+        parsed = {p.url: p for p in asyncio.run(arun(pages(results), extract_row, "redfin", workers=2))}
+
+        self.assertEqual(parsed["u3"].data["address"], "3 Walnut St")
+        self.assertEqual(parsed["u3"].data["price"], "900000")
+        self.assertFalse(parsed["gone"].ok)
+        self.assertEqual(parsed["gone"].error, "HTTP 404")
+        self.assertGreaterEqual(tries("redfin|beds") - before, 4)  # recorded in the workers, merged here
+
+    def test_bounded_queue_holds_back_the_fetch_stage(self):
+        pulled, release = [], threading.Event()
+
+        def blocked_parse(html, min_len):
+            release.wait(5)
+            return summarize_page(html, min_len)
+
+        async def run():
+            results = [FetchResult(url=f"u{i}", status=200, text=f"<title>{i} Elm St</title>") for i in range(20)]
+            task = asyncio.create_task(arun(pages(results, pulled), blocked_parse, 10, workers=0, queue_size=2))
+            await asyncio.sleep(0.3)  # parsers stuck: the queue fills and the fetch stage stalls
+            stalled = len(pulled)
+            release.set()
+            return stalled, await task
+
+        stalled, parsed = asyncio.run(run())
+        parsers = PARSERS_PER_WORKER  # workers=0 still runs one worker's worth of parser tasks
+        # 2 queued + one held by each parser, plus the page the fetch stage is waiting to enqueue
+        self.assertGreaterEqual(stalled, 2 + parsers)
+        self.assertLessEqual(stalled, 2 + parsers + 1)
+        self.assertEqual(len(parsed), 20)
+        ordered = _in_order(["u5", "missing"], parsed)
+        self.assertEqual(ordered[0].data["address"], "5 Elm St")
+        self.assertEqual(ordered[1].error, "not fetched")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+import bs4
+from app.scraper.parsed_document import ParsedDocument
+
+DESCRIPTION = "Builder special: tear down or renovate this colonial on a large lot in Newton, MA 02459. " * 3
+HTML = f"""<html><head><title>Listing | 12 Walnut St, Newton, MA 02460 | Redfin</title>
+<meta property="og:title" content="Sold: 12 Walnut Street, Newton">
+<meta name="description" content="A home"><script>var junk = "{'x' * 500}";</script></head>
+<body><nav><a href="/home/1">one</a><a href="https://www.redfin.com/home/2">two</a></nav>
+<div><div data-rf-test-id="abp-description"><p>{DESCRIPTION}</p></div><footer>Contact us</footer></div>
+</body></html>"""
+
+class TestParsedDocument(unittest.TestCase):
+    def test_backends_agree(self):
+        for backend in ("html.parser", "lxml"):
+            with self.subTest(backend=backend):
+                doc = ParsedDocument(HTML, backend=backend)
+                self.assertEqual(doc.title, "Listing | 12 Walnut St, Newton, MA 02460 | Redfin")
+                self.assertEqual(doc.meta["description"], "A home")
+                self.assertEqual(doc.display_title, "Sold: 12 Walnut Street, Newton")
+                self.assertEqual(doc.address_candidates, ["12 Walnut Street", "12 Walnut St"])
+                self.assertEqual(doc.address(), "12 Walnut Street")
+                self.assertEqual(doc.links, ["/home/1", "https://www.redfin.com/home/2"])
+                self.assertIn("tear down", doc.main_text())
+                self.assertNotIn("junk", doc.main_text())
+
+    def test_main_text_prefers_dense_block_over_link_lists(self):
+        links = "".join(f'<a href="/home/{i}">Nearby home number {i}</a>' for i in range(40))
+        remarks = "Contractor special on a 10,000 sq ft lot, sold as-is. " * 5
+        html = (f"<html><body><div id='page'><div class='nav'>{links}</div>"
+                f"<div class='wrap'><div class='inner'><article><p>{remarks}</p><p>Listed by Agent</p></article>"
+                f"</div></div><div class='footer'>Terms</div></div></body></html>")
+        for backend in ("html.parser", "lxml"):
+            with self.subTest(backend=backend):
+                text = ParsedDocument(html, backend=backend).main_text()
+                self.assertTrue(text.startswith("Contractor special"))
+                self.assertTrue(text.endswith("Listed by Agent"))
+
+    def test_parses_once(self):
+        init = bs4.BeautifulSoup.__init__
+        calls = []
+        def counting_init(soup, *args, **kwargs):
+            calls.append(1)
+            init(soup, *args, **kwargs)
+        with mock.patch.object(bs4.BeautifulSoup, "__init__", counting_init):
+            doc = ParsedDocument(HTML, backend="html.parser")
+            doc.main_text(), doc.main_text(min_len=80), doc.title, doc.address(), doc.links
+        self.assertEqual(len(calls), 1)
+
+    def test_no_address_falls_back(self):
+        doc = ParsedDocument("<html><head><title>Newton homes</title></head></html>", backend="html.parser")
+        self.assertEqual(doc.address(), "Newton homes")
+        self.assertEqual(doc.address(default="n/a"), "n/a")
+        self.assertEqual(ParsedDocument("", backend="html.parser").main_text(), "")
+
+if __name__ == "__main__":
+    unittest.main()
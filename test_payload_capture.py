@@ -0,0 +1,71 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from app.scraper.payload_capture import PayloadCapture, SnapshotWriter
+
+class _FakeResponse:
+    def __init__(self, url, content_type, body, length=None):
+        self.url = url
+        self.headers = {"content-type": content_type}
+        if length is not None:
+            self.headers["content-length"] = str(length)
+        self._body = body.encode("utf-8")
+
+    async def body(self):
+        return self._body
+
+class _BlockingPath:
+    """Stands in for a Path whose write hangs until released, keeping the writer thread busy."""
+    def __init__(self):
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def write_text(self, text, **kw):
+        self.started.set()
+        self.release.wait(5)
+
+class TestPayloadCapture(unittest.TestCase):
+    def test_wants_only_search_endpoints_with_json(self):
+        cap = PayloadCapture("zillow")
+        self.assertTrue(cap.wants("https://www.zillow.com/search/GetSearchPageState.htm?q=1", "application/json", 1000))
+        self.assertFalse(cap.wants("https://www.zillow.com/static/js/app.bundle.js", "application/javascript", 900000))
+        self.assertFalse(cap.wants("https://www.zillow.com/search/GetSearchPageState.htm", "text/javascript", 1000))
+        self.assertFalse(cap.wants("https://www.zillow.com/search/GetSearchPageState.htm", "application/json", 50_000_000))
+        self.assertEqual(cap.stats["skipped_size"], 1)
+
+    def test_bodies_are_read_in_background_and_drained(self):
+        async def run():
+            cap = PayloadCapture("redfin")
+            cap.on_response(_FakeResponse("https://www.redfin.com/stingray/api/gis?al=1", "text/plain", "{}&&" + "x" * 1000))
+            cap.on_response(_FakeResponse("https://www.redfin.com/stingray/api/gis?al=2", "text/plain", "tiny"))
+            cap.on_response(_FakeResponse("https://www.redfin.com/main.js", "application/javascript", "y" * 5000))
+            return cap, await cap.drain()
+        cap, texts = asyncio.run(run())
+        self.assertEqual(len(texts), 1)
+        self.assertEqual(cap.stats["seen"], 3)
+        self.assertEqual(cap.stats["captured"], 1)
+
+    def test_snapshot_writer_writes_and_drops_when_full(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = SnapshotWriter(maxsize=4)
+            for i in range(3):
+                writer.submit(Path(tmp) / f"{i}.json", "{}")
+            writer.flush()
+            self.assertEqual(len(list(Path(tmp).glob("*.json"))), 3)
+            self.assertEqual(writer.dropped, 0)
+
+            busy = _BlockingPath()
+            writer = SnapshotWriter(maxsize=1)
+            writer.submit(busy, "{}")
+            self.assertTrue(busy.started.wait(5))             # the writer thread is stuck on this one
+            writer.submit(Path(tmp) / "queued.json", "{}")    # fills the queue
+            writer.submit(Path(tmp) / "dropped.json", "{}")   # no room: dropped, submit doesn't block
+            self.assertEqual(writer.dropped, 1)
+            busy.release.set()
+            writer.flush()
+            self.assertTrue((Path(tmp) / "queued.json").exists())
+            self.assertFalse((Path(tmp) / "dropped.json").exists())
+
+if __name__ == '__main__':
+    unittest.main(verbose=True)
@@ -0,0 +1,38 @@
+import unittest
+from app.scraper.prioritizer import NEUTRAL, rank, signals
+
+def url(n: int, zip_code: str = "02459") -> str:
+    return f"https://www.zillow.com/homedetails/{n}-Elm-Rd-Newton-MA-{zip_code}/{n}_zpid/"
+
+BASE = {"price": 1_000_000, "lot_sqft": 8000, "year_built": 1990, "days_on_market": 10, "remarks": "Sunny colonial"}
+
+class TestPrioritizer(unittest.TestCase):
+    def test_each_signal_lifts_a_candidate(self):
+        cards = {url(i): dict(BASE) for i in range(1, 6)}
+        cards[url(1)].update(lot_sqft=20000)                          # big lot for the money
+        cards[url(2)].update(price=700_000)                           # well under the zip median
+        cards[url(3)].update(remarks="Builder special, tear-down or renovate")
+        cards[url(4)].update(year_built=1925, days_on_market=200)     # old and stale
+        order = rank("zillow", list(cards), cards)
+        self.assertEqual(order[-1], url(5))
+        sig = signals(cards)
+        self.assertEqual(sig[url(3)]["remarks"], 1.0)
+        self.assertEqual(sig[url(5)]["remarks"], 0.0)
+        self.assertEqual(sig[url(4)]["days_on_market"], 1.0)
+        self.assertGreater(sig[url(2)]["below_median"], sig[url(1)]["below_median"])
+
+    def test_median_is_per_zip_when_the_zip_has_enough_cards(self):
+        cards = {url(i, "02468"): dict(BASE, price=2_000_000) for i in range(3)}
+        cards.update({url(i, "02458"): dict(BASE, price=800_000) for i in range(10, 13)})
+        cards[url(20, "02468")] = dict(BASE, price=1_500_000)  # cheap for 02468, dear for the town
+        self.assertGreater(signals(cards)[url(20, "02468")]["below_median"], 0.5)
+
+    def test_missing_signals_are_neutral_and_order_is_stable(self):
+        cards = {url(1): {"price": 900_000}, url(2): {"price": 900_000}}
+        sig = signals(cards)[url(1)]
+        self.assertEqual((sig["age"], sig["remarks"], sig["lot_per_dollar"]), (NEUTRAL, NEUTRAL, NEUTRAL))
+        no_card = url(3)
+        self.assertEqual(rank("zillow", [url(2), url(1), no_card], cards), [url(2), url(1), no_card])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import unittest
+from app.scraper.rate_limiter import AdaptiveRateLimiter, BlockedResponse, HostBudget, RetryPolicy, _parse_overrides, limiter
+
+HOST = "www.example.com"
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter({HOST: HostBudget(rate=1.0, min_rate=0.25, max_rate=2.0, burst=2)})
+
+    def test_burst_then_wait(self):
+        """Burst tokens are free; the next reservation has to wait ~1/rate."""
+        self.assertEqual(self.limiter._reserve(HOST), 0.0)
+        self.assertEqual(self.limiter._reserve(HOST), 0.0)
+        self.assertAlmostEqual(self.limiter._reserve(HOST), 1.0, places=1)
+
+    def test_healthy_responses_speed_up_to_ceiling(self):
+        for _ in range(50):
+            self.limiter.record(HOST, 200, 0.2)
+        self.assertEqual(self.limiter.rate(HOST), 2.0)
+
+    def test_throttle_backs_off_and_pauses(self):
+        self.limiter.record(HOST, 429, 0.2, retry_after=5)
+        self.assertEqual(self.limiter.rate(HOST), 0.5)
+        self.assertGreater(self.limiter._reserve(HOST), 4.0)
+
+    def test_slow_and_failed_responses_reduce_rate(self):
+        self.limiter.record(HOST, 200, 10.0)
+        self.assertAlmostEqual(self.limiter.rate(HOST), 0.8)
+        for _ in range(20):
+            self.limiter.record(HOST, 0, 0.1)
+        self.assertEqual(self.limiter.rate(HOST), 0.25)
+
+    def test_parse_overrides(self):
+        self.assertEqual(_parse_overrides("www.redfin.com=2, bad, www.zillow.com=0.5"),
+                         {"www.redfin.com": 2.0, "www.zillow.com": 0.5})
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        limiter.configure("retry.example.com", HostBudget(rate=100, min_rate=50, max_rate=100, burst=10))
+
+    def test_retries_then_succeeds(self):
+        calls = []
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RuntimeError("nav timeout")
+            return "ok"
+        policy = RetryPolicy(attempts=3, base_delay=0.01, jitter=0)
+        self.assertEqual(asyncio.run(policy.run_async(flaky, host="retry.example.com")), "ok")
+        self.assertEqual(len(calls), 3)
+
+    def test_gives_up_and_backoff_is_capped(self):
+        async def broken():
+            raise RuntimeError("blocked")
+        policy = RetryPolicy(attempts=2, base_delay=0.01, jitter=0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(policy.run_async(broken, host="retry.example.com"))
+        self.assertEqual(RetryPolicy(base_delay=2, max_delay=5, jitter=0).backoff(4), 5)
+
+    def test_blocked_status_throttles_the_host(self):
+        limiter.configure("throttled.example.com", HostBudget(rate=100, min_rate=1, max_rate=100, burst=10))
+        async def throttled():
+            raise BlockedResponse(429, retry_after=30)
+        with self.assertRaises(BlockedResponse):
+            asyncio.run(RetryPolicy(attempts=1).run_async(throttled, host="throttled.example.com"))
+        self.assertEqual(limiter.rate("throttled.example.com"), 50)
+        self.assertGreater(limiter._reserve("throttled.example.com"), 25)
+
+if __name__ == '__main__':
+    unittest.main(verbose=True)
@@ -0,0 +1,34 @@
+import unittest
+from app.scraper.resource_policy import RoutePolicy, SITE_POLICIES, BlockStats
+
+class TestRoutePolicy(unittest.TestCase):
+    def test_blocks_heavy_resource_types(self):
+        policy = SITE_POLICIES["redfin"]
+        self.assertEqual(policy.block_reason("image", "https://ssl.cdn-redfin.com/photo/1.jpg"), "image")
+        self.assertEqual(policy.block_reason("stylesheet", "https://www.redfin.com/a.css"), "stylesheet")
+        self.assertIsNone(policy.block_reason("document", "https://www.redfin.com/city/11619/MA/Newton"))
+
+    def test_blocks_trackers_and_map_tiles(self):
+        policy = RoutePolicy()
+        self.assertEqual(policy.block_reason("script", "https://www.googletagmanager.com/gtm.js?id=X"), "tracker")
+        self.assertEqual(policy.block_reason("xhr", "https://api.mapbox.com/v4/tiles/1/2/3.png"), "tile")
+
+    def test_never_block_wins(self):
+        policy = SITE_POLICIES["redfin"]
+        self.assertIsNone(policy.block_reason("xhr", "https://www.redfin.com/stingray/api/gis?al=1"))
+
+    def test_zillow_keeps_stylesheets(self):
+        self.assertIsNone(SITE_POLICIES["zillow"].block_reason("stylesheet", "https://www.zillow.com/a.css"))
+
+    def test_stats_estimate_savings(self):
+        stats = BlockStats()
+        stats.record("image", "image")
+        stats.record("tracker", "script")
+        stats.record(None, "document")
+        s = stats.summary()
+        self.assertEqual((s["blocked"], s["allowed"]), (2, 1))
+        self.assertEqual(s["by_reason"], {"image": 1, "tracker": 1})
+        self.assertGreater(s["est_mb_saved"], 0)
+
+if __name__ == '__main__':
+    unittest.main(verbose=True)
@@ -0,0 +1,95 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.scraper.card_extractor import card_fingerprint
+from app.scraper.seen_index import SeenIndex
+from app.scraper.url_filters import filter_newton_urls, listing_id
+
+ZPID_URL = "https://www.zillow.com/homedetails/12-Walnut-St-Newton-MA-02460/111_zpid/"
+
+class TestListingIds(unittest.TestCase):
+    def test_canonical_ids_ignore_slug_and_query(self):
+        self.assertEqual(listing_id("zillow", ZPID_URL), "zillow:111")
+        self.assertEqual(listing_id("zillow", "https://www.zillow.com/homedetails/12-Walnut-Street/111_zpid/?utm=x"),
+                         "zillow:111")
+        self.assertEqual(listing_id("redfin", "https://www.redfin.com/MA/Newton/5-Oak-Ave-02465/home/123"), "redfin:123")
+        self.assertEqual(listing_id("realtor", "https://www.realtor.com/realestateandhomes-detail/"
+                                               "3-Pine-St_Newton_MA_02458_M38417-25187?from=srp"), "realtor:38417-25187")
+        self.assertEqual(listing_id("realtor", "https://realtor.com/realestateandhomes-detail/3-Pine_Newton-MA/#x"),
+                         "realtor:realtor.com/realestateandhomes-detail/3-Pine_Newton-MA")
+        self.assertIsNone(listing_id("zillow", ""))
+
+    def test_filter_dedupes_on_listing_id(self):
+        first = "https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/"
+        urls = [first, first + "?searchQueryState=abc",
+                "https://www.zillow.com/homedetails/9-Elm-Road-Newton-MA-02459/222_zpid/"]
+        self.assertEqual(filter_newton_urls("zillow", urls), [first])
+
+class TestSeenIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "seen.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_first_and_last_seen_persist_across_runs(self):
+        index = SeenIndex(self.path)
+        self.assertEqual(index.mark("zillow", [ZPID_URL, ZPID_URL + "?x=1"], now=100.0), [ZPID_URL])
+        index.close()
+
+        index = SeenIndex(self.path)  # next run
+        self.assertFalse(index.is_new("zillow", ZPID_URL + "?from=map"))
+        other = "https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/"
+        self.assertTrue(index.is_new("zillow", other))
+        self.assertEqual(index.mark("zillow", [ZPID_URL, other], now=200.0), [other])
+        self.assertEqual(index.get("zillow:111"), (100.0, 200.0))
+        self.assertEqual(index.get("zillow:222"), (200.0, 200.0))
+        self.assertIn("zillow:222", index)
+        self.assertEqual(len(index), 2)
+        index.close()
+
+    def test_delta_reuses_rows_until_card_changes_or_refresh_is_due(self):
+        other = "https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/"
+        card = {"price": 900000, "beds": 3, "baths": 2.0, "status": "FOR_SALE"}
+        row = {"address": "12 Walnut St", "price": 900000, "lot_sqft": 9000, "url": ZPID_URL}
+        index = SeenIndex(self.path)
+        index.mark("zillow", [ZPID_URL, other], now=0.0)
+        index.record_fetch("zillow", ZPID_URL, card, row, now=0.0)
+        index.close()
+
+        index = SeenIndex(self.path)  # next run, a day later
+        day = 86400.0
+        fetch, reused = index.delta("zillow", [ZPID_URL, other], {ZPID_URL: dict(card)}, now=day)
+        self.assertEqual((fetch, reused), ([other], [row]))
+        cheaper = {ZPID_URL: dict(card, price=850000)}
+        self.assertEqual(index.delta("zillow", [ZPID_URL], cheaper, now=day), ([ZPID_URL], []))
+        with mock.patch("app.scraper.seen_index.SETTINGS.full_refresh_days", 0.5):
+            self.assertEqual(index.delta("zillow", [ZPID_URL], {ZPID_URL: card}, now=day), ([ZPID_URL], []))
+        with mock.patch("app.scraper.seen_index.SETTINGS.delta_crawl", False):
+            self.assertEqual(index.delta("zillow", [ZPID_URL], {ZPID_URL: card}, now=day), ([ZPID_URL], []))
+        index.close()
+
+    def test_fingerprint_ignores_formatting_and_address(self):
+        card = {"price": 900000, "beds": 3, "baths": 2, "lot_sqft": 9000, "status": "For Sale"}
+        same = {"price": "$900,000", "beds": "3", "baths": 2.0, "lot_sqft": 9000, "status": "for sale ", "address": "x"}
+        self.assertEqual(card_fingerprint(card), card_fingerprint(same))
+        self.assertNotEqual(card_fingerprint(card), card_fingerprint(dict(card, status="Pending")))
+        self.assertIsNone(card_fingerprint(None))
+
+    def test_upgrades_an_index_without_fetch_columns(self):
+        db = sqlite3.connect(self.path)
+        db.execute("CREATE TABLE listings (listing_id TEXT PRIMARY KEY, url TEXT, first_seen REAL, last_seen REAL)")
+        db.execute("INSERT INTO listings VALUES ('zillow:111', ?, 1.0, 2.0)", (ZPID_URL,))
+        db.commit()
+        db.close()
+        index = SeenIndex(self.path)
+        self.assertEqual(index.get("zillow:111"), (1.0, 2.0))
+        index.record_fetch("zillow", ZPID_URL, {"price": 1}, {"price": 1}, now=3.0)
+        self.assertEqual(index.delta("zillow", [ZPID_URL], {ZPID_URL: {"price": 1}}, now=4.0), ([], [{"price": 1}]))
+        index.close()
+
+if __name__ == "__main__":
+    unittest.main()
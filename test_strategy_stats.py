@@ -0,0 +1,36 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app.scraper.strategy_stats import EXPLORE_EVERY, MIN_TRIALS, StrategyStats
+
+TIERS = [["json_a", "json_b"], ["loose"]]
+
+class TestStrategyStats(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "stats.json"
+        self.stats = StrategyStats(str(self.path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_winner_moves_up_within_its_tier_only(self):
+        self.assertEqual(self.stats.order("redfin", "price", TIERS), ["json_a", "json_b", "loose"])
+        for _ in range(10):
+            self.stats.record("redfin", "price", "json_a", False)
+            self.stats.record("redfin", "price", "json_b", True)
+            self.stats.record("redfin", "price", "loose", True)
+        self.assertEqual(self.stats.order("redfin", "price", TIERS), ["json_b", "json_a", "loose"])
+
+    def test_dead_strategies_dropped_but_explored_and_persisted(self):
+        for _ in range(MIN_TRIALS):
+            self.stats.record("zillow", "beds", "json_a", False)
+        self.stats.save()
+
+        stats = StrategyStats(str(self.path))  # reloaded from disk
+        orders = [stats.order("zillow", "beds", TIERS) for _ in range(EXPLORE_EVERY)]
+        self.assertNotIn("json_a", orders[0])
+        self.assertEqual(orders[-1], ["json_a", "json_b", "loose"])  # exploration pass
+
+if __name__ == "__main__":
+    unittest.main()
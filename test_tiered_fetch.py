@@ -0,0 +1,38 @@
+import tempfile
+import unittest
+from pathlib import Path
+from app.scraper.http_client import FetchResult
+from app.scraper.tiered_fetch import BROWSER, HTTP, REPROBE_EVERY, TierMemory, has_data, looks_blocked, url_pattern
+
+class TestTieredFetch(unittest.TestCase):
+    def test_url_pattern_collapses_listing_segments(self):
+        a = url_pattern("https://www.zillow.com/homedetails/12-Walnut-St-Newton-MA-02460/111_zpid/")
+        b = url_pattern("https://www.zillow.com/homedetails/9-Elm-Rd-Newton-MA-02459/222_zpid/")
+        self.assertEqual(a, b)
+        self.assertEqual(a, "www.zillow.com/homedetails/*/*/")
+        self.assertNotEqual(a, url_pattern("https://www.zillow.com/newton-ma/"))
+
+    def test_block_and_data_detection(self):
+        self.assertTrue(looks_blocked(FetchResult(url="u", status=403, text="")))
+        self.assertTrue(looks_blocked(FetchResult(url="u", status=200, text="<div id='px-captcha'></div>")))
+        self.assertFalse(looks_blocked(FetchResult(url="u", status=200, text="<html>ok</html>")))
+        self.assertTrue(has_data("zillow", '<script id="__NEXT_DATA__">{"gdpClientCache": "{}"}</script>'))
+        self.assertFalse(has_data("zillow", "<html><body>Loading...</body></html>"))
+
+    def test_memory_remembers_tier_and_reprobes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "tiers.json"
+            mem = TierMemory(str(path))
+            url = "https://www.zillow.com/homedetails/1-A-St/1_zpid/"
+            self.assertEqual(mem.choose("zillow", url), HTTP)
+            mem.record("zillow", url, BROWSER)
+            mem.save()
+
+            mem = TierMemory(str(path))  # persisted across runs
+            other = "https://www.zillow.com/homedetails/2-B-St/2_zpid/"
+            tiers = [mem.choose("zillow", other) for _ in range(REPROBE_EVERY)]
+            self.assertEqual(tiers.count(BROWSER), REPROBE_EVERY - 1)
+            self.assertEqual(tiers[-1], HTTP)
+
+if __name__ == "__main__":
+    unittest.main()
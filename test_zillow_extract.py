@@ -0,0 +1,33 @@
+import json
+import unittest
+from app.scraper.zillow_extract import from_html, parse_candidates
+
+PROPERTY = {"streetAddress": "12 Walnut St", "price": 1250000, "bedrooms": 4, "bathrooms": 2.5, "lotSize": 10890}
+
+class TestZillowExtract(unittest.TestCase):
+    def test_json_sources_win(self):
+        raw = {"json": [{"source": "gdp_cache", "data": PROPERTY}], "address": ["Something else, Newton, MA"], "price": ["$1"], "facts": []}
+        self.assertEqual(parse_candidates(raw), {"address": "12 Walnut St", "price": "1250000",
+                                                 "beds": 4, "baths": 2.5, "lot_size": "10890"})
+
+    def test_visible_text_fallback(self):
+        raw = {"json": [{"source": "jsonld", "data": {"@type": "House", "numberOfBathrooms": None,
+                                                        "lotSize": {"value": None}}}],
+               "address": ["Zillow Home", "9 Elm Rd, Newton, MA 02459"],
+               "price": ["Est. payment", "$899,000"],
+               "facts": ["3 bd | 2 ba | 1,800 sqft", "Lot: 0.25 acres"]}
+        data = parse_candidates(raw)
+        self.assertEqual(data["address"], "9 Elm Rd")
+        self.assertEqual(data["price"], "899000")
+        self.assertEqual((data["beds"], data["baths"]), (3, 2.0))
+        self.assertEqual(data["lot_size"], "10890")
+
+    def test_from_html_reads_gdp_client_cache(self):
+        cache = json.dumps({"ForSale{...}": {"property": PROPERTY}})
+        blob = json.dumps({"props": {"pageProps": {"componentProps": {"gdpClientCache": cache}}}})
+        html = f'<html><script id="__NEXT_DATA__" type="application/json">{blob}</script></html>'
+        self.assertEqual(from_html(html)["lot_size"], "10890")
+        self.assertEqual(from_html("<html></html>"), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from app.scraper import fetch_archive, tiered_fetch, zillow_scraper
+from app.scraper.seen_index import SeenIndex
+from app.scraper.zillow_tiles import NEWTON, search_url
+
+def detail(n: int) -> str:
+    return f"https://www.zillow.com/homedetails/{n}-Elm-St-Newton-MA-02459/{n}_zpid/"
+
+class TestZillowResultsWalk(unittest.TestCase):
+    def test_walk_harvests_pages_until_nothing_new(self):
+        pages = {
+            zillow_scraper.SEARCH_URL: ([detail(1), detail(2)], {detail(1): {"price": 1}}, {"last_page": None}),
+            zillow_scraper.SEARCH_URL + "2_p/": ([detail(2), detail(3)], {}, {}),
+            zillow_scraper.SEARCH_URL + "3_p/": ([detail(3)], {}, {}),
+        }
+        harvested = []
+
+        async def harvest(url, site, **kw):
+            harvested.append(url)
+            return pages[url]
+
+        with mock.patch("app.scraper.zillow_scraper.browser_fetch.aharvest_page", side_effect=harvest):
+            urls, cards = asyncio.run(zillow_scraper._collect_listing_urls())
+        self.assertEqual(urls, [detail(1), detail(2), detail(3)])
+        self.assertEqual(cards, {detail(1): {"price": 1}})
+        self.assertEqual(harvested, list(pages))  # page 3 brought nothing new: the walk ends there
+
+def detail_html(n: int) -> str:
+    prop = {"streetAddress": f"{n} Elm St", "price": 900000 + n, "bedrooms": 3, "bathrooms": 2, "lotSize": 9000 + n}
+    cache = json.dumps({"ForSale{...}": {"property": prop}})
+    blob = json.dumps({"props": {"pageProps": {"componentProps": {"gdpClientCache": cache}}}})
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{blob}</script></html>'
+
+class TestZillowReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archive = Path(self.tmp.name) / "run.zip"
+        self.seen = SeenIndex(str(Path(self.tmp.name) / "seen.sqlite"))
+
+    def tearDown(self):
+        self.seen.close()
+        self.tmp.cleanup()
+
+    def test_replay_serves_the_zillow_stage_without_a_browser(self):
+        # Cards lack lot size, so both listings need their detail page: one was
+        # served over plain HTTP when recorded, the other rendered in the browser
+        results = [{"zpid": str(n), "detailUrl": f"/homedetails/{n}-Elm-St-Newton-MA-02459/{n}_zpid/",
+                    "unformattedPrice": 900000 + n} for n in (1, 2)]
+        tile = {"cat1": {"searchList": {"totalResultCount": 2}, "searchResults": {"listResults": results}}}
+        with fetch_archive.session("record", str(self.archive)) as archive:
+            archive.put("http", search_url(NEWTON), {"status": 200, "text": json.dumps(tile)})
+            archive.put("http", detail(1), {"status": 200, "text": detail_html(1)})
+            archive.put("browser", detail(2), {"status": 200, "text": detail_html(2)})
+
+        with fetch_archive.session("replay", str(self.archive)), \
+                mock.patch("app.scraper.zillow_scraper.get_pool", side_effect=AssertionError("browser launched")), \
+                mock.patch("app.scraper.zillow_scraper.browser_service.enabled", return_value=True), \
+                mock.patch("app.scraper.zillow_scraper.browser_service.submit") as submit, \
+                mock.patch("app.scraper.zillow_scraper.get_index", return_value=self.seen), \
+                mock.patch.object(tiered_fetch, "MEMORY", tiered_fetch.TierMemory(str(Path(self.tmp.name) / "t.json"))), \
+                mock.patch("app.scraper.zillow_scraper.strategy_stats.STATS.save"):
+            df = zillow_scraper.fetch_zillow("Newton")
+        submit.assert_not_called()
+        self.assertEqual(sorted(df["address"]), ["1 Elm St", "2 Elm St"])
+        self.assertEqual(sorted(df["lot_sqft"]), [9001, 9002])
+
+class TestZillowBrowserIsLazy(unittest.TestCase):
+    def test_no_browser_when_the_tile_cards_are_complete(self):
+        card = {"address": "1 Elm St", "price": 900000, "beds": 3, "baths": 2, "lot_sqft": 9000, "url": detail(1)}
+
+        async def tiles():
+            return {"1": card}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            seen = SeenIndex(str(Path(tmp) / "seen.sqlite"))
+            with mock.patch("app.scraper.zillow_scraper.zillow_tiles.asearch", side_effect=tiles), \
+                    mock.patch("app.scraper.zillow_scraper.get_pool") as get_pool, \
+                    mock.patch("app.scraper.zillow_scraper.get_index", return_value=seen), \
+                    mock.patch.object(tiered_fetch, "MEMORY", tiered_fetch.TierMemory(str(Path(tmp) / "t.json"))), \
+                    mock.patch("app.scraper.zillow_scraper.strategy_stats.STATS.save"):
+                rows = asyncio.run(zillow_scraper._fetch_zillow_async("Newton"))
+            seen.close()
+        get_pool.assert_not_called()
+        self.assertEqual([r["address"] for r in rows], ["1 Elm St"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+from app.scraper.http_client import FetchResult
+from app.scraper.zillow_tiles import NEWTON, read_tile, asearch
+
+API_CAP = 10  # results the fake API returns per request
+
+def listing(i: int) -> dict:
+    lon = NEWTON.west + (NEWTON.east - NEWTON.west) * ((i * 37) % 100 + 0.5) / 100
+    lat = NEWTON.south + (NEWTON.north - NEWTON.south) * ((i * 61) % 100 + 0.5) / 100
+    return {"zpid": str(1000 + i), "detailUrl": f"/homedetails/{i}-Elm-St-Newton-MA-02459/{1000 + i}_zpid/",
+            "unformattedPrice": 800000 + i, "latLong": {"latitude": lat, "longitude": lon}}
+
+LISTINGS = [listing(i) for i in range(45)]
+
+async def fake_api(urls, headers=None):
+    out = []
+    for url in urls:
+        box = json.loads(parse_qs(urlsplit(url).query)["searchQueryState"][0])["mapBounds"]
+        inside = [d for d in LISTINGS if box["west"] <= d["latLong"]["longitude"] < box["east"]
+                  and box["south"] <= d["latLong"]["latitude"] < box["north"]]
+        body = {"cat1": {"searchList": {"totalResultCount": len(inside)},
+                         "searchResults": {"mapResults": inside[:API_CAP], "listResults": inside[:3]}}}
+        out.append(FetchResult(url=url, status=200, text=json.dumps(body)))
+    return out
+
+class TestZillowTiles(unittest.TestCase):
+    def test_splits_truncated_tiles_until_every_listing_is_found(self):
+        with mock.patch("app.scraper.zillow_tiles.afetch_many", side_effect=fake_api) as api:
+            cards = asyncio.run(asearch())
+        self.assertEqual(set(cards), {d["zpid"] for d in LISTINGS})
+        self.assertEqual(cards["1007"]["price"], 800007)
+        self.assertGreater(api.call_count, 1)
+
+    def test_depth_limit_keeps_what_was_returned(self):
+        with mock.patch("app.scraper.zillow_tiles.afetch_many", side_effect=fake_api) as api:
+            cards = asyncio.run(asearch(max_depth=0))
+        self.assertEqual(len(cards), API_CAP)
+        self.assertEqual(api.call_count, 1)
+
+    def test_read_tile_dedupes_list_and_map_results(self):
+        total, found = read_tile(json.dumps({"cat1": {"searchList": {"totalResultCount": 2},
+                                                      "searchResults": {"listResults": LISTINGS[:2],
+                                                                        "mapResults": LISTINGS[:2]}}}))
+        self.assertEqual((total, sorted(found)), (2, ["1000", "1001"]))
+        self.assertEqual(read_tile("<html>captcha</html>"), (0, {}))
+
+if __name__ == "__main__":
+    unittest.main()